@@ -16,7 +16,9 @@ import pathlib
 import asyncio
 from dotenv import load_dotenv
 from assistants.interview_assistant import InterviewAssistant
-from core.utils import load_config, create_crew
+from core.utils import load_config, create_crew, resume_crew
+from core.workspace import Workspace
+from core.accounting import UsageLedger
 
 # Set up base directory and file paths
 BASE_DIR = pathlib.Path(__file__).parent.absolute()
@@ -50,13 +52,35 @@ async def main():
                 BASE_DIR / 'config' / 'tasks.yaml'
             )
             crew = await create_crew(agents_config, tasks_config, interview_data, openai_api_key)
+            print(f"Execução {crew.run_id} (retome com: python main.py --resume {crew.run_id})")
+            print(f"Documentos em: {Workspace(crew.run_id).path}")
             result = crew.kickoff()
             
             print("\nCrew execution completed!")
             print("Results:", result)
+            print("\nTempos por task:")
+            print(crew.timing_report())
+            print("\nConsumo por task:")
+            print(UsageLedger.for_runs([crew.run_id]).report())
             break
     
     print("\nProcesso finalizado com sucesso!\n")
 
+async def resume(run_id):
+    """Retoma uma execução interrompida da crew a partir do checkpoint"""
+    load_dotenv()
+    crew = await resume_crew(run_id, os.environ.get("OPENAI_API_KEY"))
+    result = crew.kickoff()
+    
+    print("\nCrew execution completed!")
+    print("Results:", result)
+    print("\nTempos por task:")
+    print(crew.timing_report())
+    print("\nConsumo por task:")
+    print(UsageLedger.for_runs([crew.run_id]).report())
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    if len(sys.argv) == 3 and sys.argv[1] == "--resume":
+        asyncio.run(resume(sys.argv[2]))
+    else:
+        asyncio.run(main())
@@ -0,0 +1,163 @@
+import asyncio
+import time
+from openai import OpenAI, OpenAIError
+from src.assistants.run_engine import RunError, get_async_client, hold_client, stream_run_text, wait_for_run
+from src.core.accounting import record_assistant_run
+from src.assistants.context import get_pdi_digest
+from src.assistants.memory import DEFAULT_WINDOW_TURNS, ConversationMemory, OpenAISummarizer
+from src.assistants.transcript import Transcript
+
+class BaseAssistant:
+    """Comportamento comum aos assistentes baseados na Assistants API"""
+
+    fallback_response = "Não foi possível gerar uma resposta."
+    context_prompt = None  # pedido enviado junto com o contexto do PDI
+    memory_turns = DEFAULT_WINDOW_TURNS  # trocas mantidas literalmente no contexto do modelo
+
+    def __init__(self, openai_api_key, session_id=None):
+        self.openai_api_key = openai_api_key
+        self.session_id = session_id
+        self.client = OpenAI(api_key=openai_api_key)
+        self.assistant = None
+        self.thread = None
+        self.output_dir = None
+        self.context_message = None
+        self._transcript = None
+        self.memory = ConversationMemory(OpenAISummarizer(self.client, session_id=session_id), self.memory_turns)
+
+    @property
+    def async_client(self):
+        """Cliente assíncrono compartilhado com as outras sessões do mesmo event loop"""
+        return get_async_client(self.openai_api_key)
+
+    @property
+    def transcript(self):
+        """Transcrição local da thread atual, atualizada a cada run"""
+        if self._transcript is None or self._transcript.thread_id != self.thread.id:
+            self._transcript = Transcript(self.thread.id)
+        return self._transcript
+
+    def create_thread(self):
+        """Cria um novo thread se ainda não existir"""
+        if self.thread is None:
+            self.thread = self.client.beta.threads.create()
+        return self.thread
+
+    def upload_pdi_documents(self, output_dir):
+        """Cria a thread com o digest dos documentos do PDI, compartilhado entre os assistentes"""
+        self.output_dir = output_dir
+        content = "Aqui está o contexto dos documentos PDI:\n\n" + get_pdi_digest(output_dir)
+        if self.context_prompt:
+            content += "\n\n" + self.context_prompt
+        self.context_message = content
+        self.thread = self.client.beta.threads.create(
+            messages=[{"role": "user", "content": content}]
+        )
+        return self.thread
+
+    def _usage_recorder(self, started_at):
+        """Callback que registra tokens, latência e custo do run concluído"""
+        def record(run):
+            name = self.assistant.name if self.assistant is not None else type(self).__name__
+            record_assistant_run(run, name, time.time() - started_at, self.session_id)
+        return record
+
+    async def get_response(self, user_message):
+        """Obtém resposta do assistente para a mensagem do usuário"""
+        # O cliente fica reservado até o fim do turno, mesmo se sair do LRU
+        async with hold_client(self.async_client) as client:
+            # Adiciona a mensagem do usuário ao thread
+            question = self.transcript.record(await client.beta.threads.messages.create(
+                thread_id=self.thread.id,
+                role="user",
+                content=user_message
+            ))
+
+            # Cria um run e aguarda a conclusão com backoff
+            started_at = time.time()
+            run = await client.beta.threads.runs.create(
+                thread_id=self.thread.id,
+                assistant_id=self.assistant.id,
+                **await asyncio.to_thread(self._run_options, user_message)
+            )
+            try:
+                run = await wait_for_run(client, run)
+                self._usage_recorder(started_at)(run)
+            except RunError as e:
+                response = f"{self.fallback_response} ({e})"
+                if not await self._discard_turn(client, question):
+                    await asyncio.to_thread(self.memory.add_turn, user_message, response)
+                return self._on_response(response)
+
+            # Obtém só as mensagens criadas pelo run
+            response = await self.transcript.fetch_run(client, run.id) or self.fallback_response
+            await asyncio.to_thread(self.memory.add_turn, user_message, response)
+            return self._on_response(response)
+
+    async def stream_response(self, user_message):
+        """Obtém a resposta do assistente token a token via streaming de eventos"""
+        async with hold_client(self.async_client) as client:
+            question = self.transcript.record(await client.beta.threads.messages.create(
+                thread_id=self.thread.id,
+                role="user",
+                content=user_message
+            ))
+
+            parts = []
+            failed = False
+            try:
+                on_complete = self._usage_recorder(time.time())
+                # Busca de trechos e resumo da conversa rodam fora do loop compartilhado
+                run_options = await asyncio.to_thread(self._run_options, user_message)
+                async for text in stream_run_text(client, self.thread.id, self.assistant.id, on_complete=on_complete,
+                                                  on_message=self.transcript.record, **run_options):
+                    parts.append(text)
+                    yield text
+            except RunError as e:
+                failed = True
+                error = f"{self.fallback_response} ({e})"
+                parts.append(error)
+                yield error
+            finally:
+                response = "".join(parts)
+                if not (failed and await self._discard_turn(client, question)):
+                    await asyncio.to_thread(self.memory.add_turn, user_message, response)
+                self._on_response(response)
+
+    async def _discard_turn(self, client, question):
+        """Apaga da thread a pergunta cujo run falhou e as mensagens criadas depois dela
+
+        Turnos que falharam não entram na memória; sem a pergunta na thread, a
+        janela `last_messages` dos próximos runs continua alinhada com as
+        trocas registradas. Retorna False se a thread não pôde ser limpa.
+        """
+        try:
+            page = await client.beta.threads.messages.list(thread_id=self.thread.id, order='asc',
+                                                           after=question.id, limit=100)
+            discarded = [message.id for message in page.data] + [question.id]
+            for message_id in discarded:
+                await client.beta.threads.messages.delete(message_id=message_id, thread_id=self.thread.id)
+        except OpenAIError:
+            return False
+        self.transcript.discard(discarded)
+        return True
+
+    @staticmethod
+    def _add_instructions(options, text):
+        """Acrescenta `text` às additional_instructions do run"""
+        if text:
+            current = options.get('additional_instructions')
+            options['additional_instructions'] = f"{current}\n\n{text}" if current else text
+        return options
+
+    def _run_options(self, user_message):
+        """Parâmetros extras do run de cada turno: janela da memória e resumo da conversa"""
+        options = self.memory.run_options()
+        if self.memory.truncated:
+            # A mensagem com o contexto do PDI ficou fora da janela enviada ao modelo
+            self._add_instructions(options, self.context_message)
+        return self._add_instructions(options, self.memory.instructions())
+
+    def _on_response(self, response):
+        """Ponto de extensão chamado com a resposta completa de cada turno"""
+        return response
@@ -0,0 +1,156 @@
+"""
+Contexto do PDI compartilhado pelos assistentes de chat.
+
+Em vez de cada assistente enviar o texto integral de `analise_perfil.md`,
+`pdi.md` e `aggregated_research.md` para a sua thread, os documentos são
+condensados uma única vez em um digest com orçamento de tokens: cada seção
+mantém o título e o primeiro parágrafo, parágrafos repetidos entre os
+documentos entram uma vez só e o restante é incluído enquanto houver
+orçamento. O digest fica em cache pelo hash do conteúdo dos documentos.
+"""
+import hashlib
+import os
+import re
+import threading
+from pathlib import Path
+from src.core.accounting import count_tokens
+from src.core.sections import parse_sections
+from src.core.sqlite_cache import SQLiteCache
+from src.core.text_search import tokenize
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+CACHE_FILE = Path(os.getenv("PDI_CONTEXT_CACHE", PROJECT_ROOT / ".cache" / "context_digests.sqlite"))
+DEFAULT_BUDGET = int(os.getenv("PDI_CONTEXT_BUDGET", "6000"))
+DIGEST_VERSION = 2
+
+# Documentos em ordem de prioridade e a fração do orçamento de cada um
+CONTEXT_FILES = {
+    'analise_perfil.md': 0.25,
+    'pdi.md': 0.45,
+    'aggregated_research.md': 0.30,
+}
+
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+
+_lock = threading.Lock()
+_cache = None
+
+
+def _get_cache():
+    global _cache
+    with _lock:
+        if _cache is None:
+            _cache = SQLiteCache(CACHE_FILE, ttl=30 * 24 * 3600, max_entries=200)
+        return _cache
+
+
+def _allocate(sizes, budget):
+    """Divide o orçamento pelos pesos; o que um documento pequeno não usa vai para os outros"""
+    allocation = {}
+    remaining = dict(sizes)
+    left = budget
+    while remaining:
+        total_weight = sum(CONTEXT_FILES[name] for name in remaining)
+        shares = {name: left * CONTEXT_FILES[name] / total_weight for name in remaining}
+        fits = [name for name in remaining if remaining[name] <= shares[name]]
+        if not fits:
+            allocation.update({name: int(share) for name, share in shares.items()})
+            break
+        for name in fits:
+            allocation[name] = remaining.pop(name)
+            left -= allocation[name]
+    return allocation
+
+
+def _split_section(section):
+    lines = section.content.splitlines()
+    if section.level == 0:
+        return None, "\n".join(lines)
+    return lines[0], "\n".join(lines[1:])
+
+
+def pack_document(markdown, budget, seen=None):
+    """Seções do documento dentro do orçamento de tokens
+
+    `seen` guarda as impressões dos parágrafos já incluídos (em outros
+    documentos), que não são repetidos.
+    """
+    seen = set() if seen is None else seen
+    found = set()
+    sections = []
+    for section in parse_sections(markdown, max_level=3):
+        heading, body = _split_section(section)
+        paragraphs = []
+        for paragraph in _PARAGRAPH_BREAK.split(body):
+            paragraph = paragraph.strip()
+            fingerprint = ' '.join(tokenize(paragraph))
+            if not fingerprint or fingerprint in seen or fingerprint in found:
+                continue
+            found.add(fingerprint)
+            paragraphs.append((paragraph, count_tokens(paragraph), fingerprint))
+        sections.append((heading, count_tokens(heading) if heading else 0, paragraphs))
+
+    used = 0
+    chosen = [[] for _ in sections]
+    # Primeiro o parágrafo de abertura de cada seção, depois o restante em ordem;
+    # o título só conta no orçamento junto com o primeiro parágrafo incluído
+    for first_pass in (True, False):
+        for index, (_, heading_tokens, paragraphs) in enumerate(sections):
+            for paragraph, tokens, fingerprint in (paragraphs[:1] if first_pass else paragraphs[1:]):
+                cost = tokens if chosen[index] else tokens + heading_tokens
+                if used + cost > budget:
+                    break
+                chosen[index].append(paragraph)
+                seen.add(fingerprint)
+                used += cost
+
+    blocks = []
+    for (heading, _, _), paragraphs in zip(sections, chosen):
+        if paragraphs:
+            blocks.extend([heading] if heading else [])
+            blocks.extend(paragraphs)
+    return "\n\n".join(blocks)
+
+
+def _read_documents(output_dir):
+    documents = {}
+    for filename in CONTEXT_FILES:
+        file_path = Path(output_dir) / filename
+        if file_path.exists():
+            documents[filename] = file_path.read_text(encoding='utf-8')
+    return documents
+
+
+def build_digest(documents, budget=DEFAULT_BUDGET):
+    """Digest dos documentos ({nome: markdown}) com até `budget` tokens"""
+    sizes = {name: count_tokens(content) for name, content in documents.items()}
+    allocation = _allocate(sizes, budget)
+    seen = set()
+    parts = []
+    for name in CONTEXT_FILES:
+        if name in documents:
+            packed = pack_document(documents[name], allocation[name], seen)
+            parts.append(f"Conteúdo de {name}:\n\n{packed}\n\n")
+    return "\n".join(parts)
+
+
+def digest_key(documents, budget):
+    payload = hashlib.sha256(f"{DIGEST_VERSION}:{budget}".encode('utf-8'))
+    for name in sorted(documents):
+        payload.update(name.encode('utf-8') + b'\0' + documents[name].encode('utf-8') + b'\0')
+    return payload.hexdigest()
+
+
+def get_pdi_digest(output_dir, budget=DEFAULT_BUDGET):
+    """Digest dos documentos do PDI da execução, calculado uma vez por versão dos documentos"""
+    documents = _read_documents(output_dir)
+    if not documents:
+        raise ValueError("Nenhum documento PDI encontrado no diretório especificado")
+
+    cache = _get_cache()
+    key = digest_key(documents, budget)
+    digest = cache.get(key)
+    if digest is None:
+        digest = build_digest(documents, budget)
+        cache.set(key, digest)
+    return digest
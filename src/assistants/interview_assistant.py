@@ -1,22 +1,25 @@
-from openai import OpenAI
-from src.core.utils import load_config, create_crew
+from src.assistants.base import BaseAssistant
+from src.assistants.registry import get_or_create_assistant
+from src.core.routing import get_router
+from src.core.jobs import get_job_queue
+from src.core.workspace import Workspace
 from pathlib import Path
-import asyncio
 import streamlit as st
 
-class InterviewAssistant:
-    def __init__(self, openai_api_key):
+class InterviewAssistant(BaseAssistant):
+    memory_turns = 30  # o resumo final da entrevista depende das respostas detalhadas
+
+    def __init__(self, openai_api_key, session_id=None):
         """
         Inicializa o assistente de entrevista.
         """
-        self.client = OpenAI(api_key=openai_api_key)
-        self.assistant = None
-        self.thread = None
+        super().__init__(openai_api_key, session_id)
         self.messages = []
         
     def initialize_assistant(self):
         """Inicializa o assistente com instruções para conduzir a entrevista"""
-        self.assistant = self.client.beta.assistants.create(
+        self.assistant = get_or_create_assistant(
+            self.client,
             name="PDI Interviewer",
             instructions="""Você é um consultor profissional especializado em desenvolvimento de carreira e aprendizagem.
             Seu objetivo é conduzir uma entrevista natural e empática para coletar informações sobre um colaborador.
@@ -61,7 +64,7 @@ class InterviewAssistant:
             O resumo deve ser em formato de texto, organizado pelos tópicos acima, incluindo citações 
             relevantes das respostas do entrevistado e destacando pontos importantes para a 
             criação de um plano de desenvolvimento personalizado.""",
-            model="gpt-4o"
+            model=get_router().assistant_model("PDI Interviewer")
         )
         
         # Criar thread inicial
@@ -77,59 +80,25 @@ Faremos uma entrevista com duração de alguns minutos e na sequência vou prepa
 Primeiro, poderia me contar qual o seu nome e empresa que você trabalha?'''
         }]
         
-    async def get_response(self, user_message):
-        """Obtém resposta do assistente para a mensagem do usuário"""
-        # Adiciona a mensagem do usuário ao thread
-        message = self.client.beta.threads.messages.create(
-            thread_id=self.thread.id,
-            role="user",
-            content=user_message
-        )
-        
-        # Cria um run
-        run = self.client.beta.threads.runs.create(
-            thread_id=self.thread.id,
-            assistant_id=self.assistant.id
-        )
-        
-        # Aguarda a conclusão do run
-        while True:
-            run = self.client.beta.threads.runs.retrieve(
-                thread_id=self.thread.id,
-                run_id=run.id
-            )
-            if run.status == 'completed':
-                break
-        
-        # Obtém a resposta do assistente
-        messages = self.client.beta.threads.messages.list(
-            thread_id=self.thread.id
-        )
-        
-        # Retorna a última mensagem do assistente
-        for msg in messages.data:
-            if msg.role == "assistant":
-                response = msg.content[0].text.value
-                self.messages.append({"role": "assistant", "content": response})
-                return response
-                
-        return "Não foi possível gerar uma resposta."
+    def _on_response(self, response):
+        """Registra a resposta do assistente no histórico da entrevista"""
+        self.messages.append({"role": "assistant", "content": response})
+        return response
 
     def process_interview_completion(self, response, session_state):
-        """Processa a conclusão da entrevista e inicia a crew"""
+        """Processa a conclusão da entrevista e enfileira a geração do PDI"""
         if isinstance(response, str) and "[INTERVIEW_COMPLETE]" in response:
             session_state.interview_complete = True
             session_state.interview_data = response.split("[INTERVIEW_COMPLETE]")[1].strip()
             
-            # Inicializa e executa a crew
-            with st.spinner("🚀 Iniciando a criação do seu PDI personalizado... \n\n" + 
-                          "Este processo envolve várias etapas de análise e pode levar alguns minutos. " +
-                          "Estamos trabalhando para criar um plano detalhado e sob medida para você! 😊"):
-                agents_config = str(Path(__file__).parent.parent.parent / 'config' / 'agents.yaml')
-                tasks_config = str(Path(__file__).parent.parent.parent / 'config' / 'tasks.yaml')
-                agents_config, tasks_config = load_config(agents_config, tasks_config)
-                crew = asyncio.run(create_crew(agents_config, tasks_config, session_state.interview_data, openai_api_key=session_state.openai_api_key))
-                result = crew.kickoff()
+            # Enfileira a geração do PDI; a interface acompanha o progresso pelo id do job
+            job_queue = get_job_queue()
+            job_id = job_queue.submit(session_state.interview_data, session_state.openai_api_key)
+            job = job_queue.get(job_id)
+            session_state.job_id = job_id
+            session_state.crew_run_id = job.run_id
+            session_state.workspace = Workspace(job.run_id)
+            st.query_params["job"] = job_id
             
             session_state.current_page = 'main'
             session_state.current_file = str(Path(__file__).parent / 'docs' / 'pdi_guide.md')
@@ -1,16 +1,20 @@
-from openai import OpenAI
-import os
-from pathlib import Path
+import asyncio
+import time
+from src.assistants.base import BaseAssistant
+from src.assistants.registry import get_or_create_assistant
+from src.core.routing import get_router
+from src.assistants.run_engine import RunError, hold_client, stream_run_text, wait_for_run_sync
+
+class LinkedInAssistant(BaseAssistant):
+    context_prompt = (
+        "Por favor, crie um post do LinkedIn celebrando o início desta jornada de desenvolvimento profissional. "
+        "Você deve falar como o colaborador, em primeira pessoa."
+    )
 
-class LinkedInAssistant:
-    def __init__(self, openai_api_key):
-        self.client = OpenAI(api_key=openai_api_key)
-        self.assistant = None
-        self.thread = None
-        
     def initialize_assistant(self):
         """Inicializa o assistente com instruções para criar posts do LinkedIn"""
-        self.assistant = self.client.beta.assistants.create(
+        self.assistant = get_or_create_assistant(
+            self.client,
             name="LinkedIn Post Creator",
             instructions="""Você é um especialista em criar posts engajantes para o LinkedIn, focado em desenvolvimento profissional.
             
@@ -25,107 +29,52 @@ class LinkedInAssistant:
             
             Ao receber o contexto do PDI, crie imediatamente um post personalizado sem necessidade de solicitação adicional.
             Adapte o conteúdo baseado nas informações do colaborador e seus objetivos de desenvolvimento.""",
-            model="gpt-4o"
+            model=get_router().assistant_model("LinkedIn Post Creator")
         )
         
-    def upload_pdi_documents(self, output_dir):
-        """Lê o conteúdo dos documentos PDI e cria uma mensagem com o contexto"""
-        files_to_read = [
-            'aggregated_research.md',
-            'analise_perfil.md',
-            'pdi.md'
-        ]
-        
-        context = []
-        for filename in files_to_read:
-            file_path = Path(output_dir) / filename
-            if file_path.exists():
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    context.append(f"Conteúdo de {filename}:\n\n{content}\n\n")
-        
-        if context:
-            # Criar thread com o contexto
-            self.thread = self.client.beta.threads.create(
-                messages=[{
-                    "role": "user",
-                    "content": "Aqui está o contexto dos documentos PDI:\n\n" + "\n".join(context) + 
-                    "\n\nPor favor, crie um post do LinkedIn celebrando o início desta jornada de desenvolvimento profissional. Você deve falar como o colaborador, em primeira pessoa."
-                }]
-            )
-            
-            # Gerar o post automaticamente
+    def upload_pdi_documents(self, output_dir, generate_post=True):
+        """Cria a thread com o contexto do PDI e, opcionalmente, gera o post inicial"""
+        super().upload_pdi_documents(output_dir)
+        if generate_post:
             return self.generate_initial_post()
-        else:
-            raise ValueError("Nenhum documento PDI encontrado no diretório especificado")
-            
+
     def generate_initial_post(self):
         """Gera o post inicial do LinkedIn automaticamente"""
-        # Cria um run
-        run = self.client.beta.threads.runs.create(
-            thread_id=self.thread.id,
-            assistant_id=self.assistant.id
-        )
-        
-        # Aguarda a conclusão do run
-        while True:
-            run = self.client.beta.threads.runs.retrieve(
-                thread_id=self.thread.id,
-                run_id=run.id
-            )
-            if run.status == 'completed':
-                break
-        
-        # Obtém a resposta do assistente
-        messages = self.client.beta.threads.messages.list(
-            thread_id=self.thread.id
-        )
-        
-        # Retorna a última mensagem do assistente
-        for msg in messages.data:
-            if msg.role == "assistant":
-                return msg.content[0].text.value
-                
-        return "Não foi possível gerar o post do LinkedIn."
-        
-    def create_thread(self):
-        """Cria um novo thread se ainda não existir"""
-        if self.thread is None:
-            self.thread = self.client.beta.threads.create()
-        return self.thread
-        
-    async def get_response(self, user_message):
-        """Obtém resposta do assistente para a mensagem do usuário"""
-        # Adiciona a mensagem do usuário ao thread
-        message = self.client.beta.threads.messages.create(
-            thread_id=self.thread.id,
-            role="user",
-            content=user_message
-        )
-        
-        # Cria um run
+        # Cria um run e aguarda a conclusão com backoff
+        started_at = time.time()
         run = self.client.beta.threads.runs.create(
             thread_id=self.thread.id,
             assistant_id=self.assistant.id
         )
+        try:
+            run = wait_for_run_sync(self.client, run)
+            self._usage_recorder(started_at)(run)
+        except RunError as e:
+            return f"Não foi possível gerar o post do LinkedIn. ({e})"
         
-        # Aguarda a conclusão do run
-        while True:
-            run = self.client.beta.threads.runs.retrieve(
-                thread_id=self.thread.id,
-                run_id=run.id
-            )
-            if run.status == 'completed':
-                break
-        
-        # Obtém a resposta do assistente
-        messages = self.client.beta.threads.messages.list(
-            thread_id=self.thread.id
-        )
-        
-        # Retorna a última mensagem do assistente
-        for msg in messages.data:
-            if msg.role == "assistant":
-                return msg.content[0].text.value
-                
-        return "Não foi possível gerar uma resposta."
+        # Obtém só as mensagens criadas pelo run
+        post = self.transcript.fetch_run_sync(self.client, run.id) or "Não foi possível gerar o post do LinkedIn."
+        self.memory.add_turn(self.context_prompt, post)
+        return post
+
+    async def stream_initial_post(self):
+        """Gera o post inicial do LinkedIn entregando o texto via streaming"""
+        async with hold_client(self.async_client) as client:
+            parts = []
+            failed = False
+            try:
+                on_complete = self._usage_recorder(time.time())
+                async for text in stream_run_text(client, self.thread.id, self.assistant.id, on_complete=on_complete,
+                                                  on_message=self.transcript.record):
+                    parts.append(text)
+                    yield text
+            except RunError as e:
+                failed = True
+                error = f"Não foi possível gerar o post do LinkedIn. ({e})"
+                parts.append(error)
+                yield error
+            finally:
+                # O post inicial conta como a primeira troca da conversa (como em generate_initial_post,
+                # um run que falhou não entra na memória)
+                if not failed:
+                    await asyncio.to_thread(self.memory.add_turn, self.context_prompt, "".join(parts))
@@ -0,0 +1,101 @@
+"""
+Memória de conversa com janela deslizante e resumo incremental.
+
+Os assistentes mantêm as últimas trocas literalmente e resumem as mais
+antigas em um resumo acumulado. No servidor, o run usa
+`truncation_strategy` para enviar ao modelo só as mensagens recentes da
+thread, e o resumo vai em `additional_instructions`; assim os tokens por
+turno param de crescer com o tamanho da conversa. O resumo é refeito a cada
+`window_turns` trocas, e não a cada turno.
+"""
+import os
+import time
+from collections import deque
+from src.core.accounting import record_completion
+from src.core.routing import get_router
+
+DEFAULT_WINDOW_TURNS = int(os.getenv("PDI_MEMORY_TURNS", "8"))
+SUMMARY_MAX_TOKENS = 600
+MAX_LOCAL_MESSAGES = int(os.getenv("PDI_MAX_CHAT_MESSAGES", "100"))
+
+SUMMARY_PROMPT = """Você mantém o resumo de uma conversa entre um usuário e um assistente.
+Atualize o resumo existente com as novas trocas, preservando nomes, fatos, decisões,
+preferências e pendências. Responda apenas com o resumo atualizado, em português,
+com no máximo {max_tokens} tokens."""
+
+
+class OpenAISummarizer:
+    """Resume as trocas antigas com uma chamada de chat completion
+
+    O consumo de cada resumo vai para o mesmo registro dos runs dos
+    assistentes, com `source='summarizer'`.
+    """
+
+    name = "Conversation Summary"
+
+    def __init__(self, client, model=None, max_tokens=SUMMARY_MAX_TOKENS, session_id=None):
+        self.client = client
+        self.model = model or get_router().assistant_model(self.name)
+        self.max_tokens = max_tokens
+        self.session_id = session_id
+
+    def __call__(self, summary, turns):
+        transcript = "\n\n".join(f"Usuário: {user}\nAssistente: {assistant}" for user, assistant in turns)
+        started_at = time.time()
+        response = self.client.chat.completions.create(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            temperature=0,
+            messages=[
+                {"role": "system", "content": SUMMARY_PROMPT.format(max_tokens=self.max_tokens)},
+                {"role": "user", "content": f"Resumo atual:\n{summary or '(vazio)'}\n\nNovas trocas:\n{transcript}"}
+            ]
+        )
+        record_completion(response, self.name, time.time() - started_at, self.session_id)
+        return response.choices[0].message.content.strip()
+
+
+class ConversationMemory:
+    """Últimas trocas literais e resumo acumulado das anteriores"""
+
+    def __init__(self, summarizer, window_turns=DEFAULT_WINDOW_TURNS):
+        self.summarizer = summarizer
+        self.window_turns = max(1, window_turns)
+        self.turns = deque()
+        self.summary = ""
+        self.total_turns = 0
+
+    def add_turn(self, user_message, response):
+        """Registra a troca; ao acumular o dobro da janela, resume a metade mais antiga"""
+        self.turns.append((user_message, response))
+        self.total_turns += 1
+        if len(self.turns) >= 2 * self.window_turns:
+            evicted = [self.turns.popleft() for _ in range(len(self.turns) - self.window_turns)]
+            try:
+                self.summary = self.summarizer(self.summary, evicted)
+            except Exception:
+                # Sem resumo novo, as trocas voltam para a janela e o resumo é tentado no próximo turno
+                self.turns.extendleft(reversed(evicted))
+
+    @property
+    def truncated(self):
+        """Se a thread no servidor já tem mais mensagens do que as enviadas ao modelo"""
+        return self.total_turns > len(self.turns)
+
+    def run_options(self):
+        """truncation_strategy do próximo run (trocas da janela + a nova pergunta)"""
+        if not self.truncated:
+            return {}
+        return {'truncation_strategy': {'type': 'last_messages', 'last_messages': 2 * len(self.turns) + 1}}
+
+    def instructions(self):
+        if not self.summary:
+            return None
+        return f"Resumo da conversa até aqui (as mensagens mais antigas não estão mais visíveis):\n{self.summary}"
+
+
+def trim_history(messages, limit=MAX_LOCAL_MESSAGES):
+    """Mantém na lista (em memória da sessão) apenas as `limit` mensagens mais recentes"""
+    if len(messages) > limit:
+        del messages[:len(messages) - limit]
+    return messages
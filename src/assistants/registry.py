@@ -0,0 +1,95 @@
+"""
+Registro de definições de assistentes compartilhado entre sessões.
+
+Cada definição (nome + instruções + modelo) é identificada por um hash. O
+assistente correspondente é buscado ou criado uma única vez por processo e o
+id fica salvo em um cache local em disco, de modo que novas sessões só
+precisam criar uma thread.
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from openai import NotFoundError
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+CACHE_FILE = Path(os.getenv("PDI_ASSISTANT_CACHE", PROJECT_ROOT / ".cache" / "assistants.json"))
+
+_lock = threading.Lock()
+_assistants = {}
+
+
+def definition_hash(name, instructions, model):
+    """Calcula o hash que identifica uma definição de assistente"""
+    payload = json.dumps([name, instructions, model], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _cache_key(client, digest):
+    # Assistentes pertencem à conta da chave, então a chave entra na identidade
+    key_hash = hashlib.sha256(client.api_key.encode('utf-8')).hexdigest()[:16]
+    return f"{key_hash}:{digest}"
+
+
+def _read_cache():
+    if not CACHE_FILE.exists():
+        return {}
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _write_cache(cache):
+    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = CACHE_FILE.with_suffix('.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_file, CACHE_FILE)
+
+
+def _retrieve(client, assistant_id):
+    try:
+        return client.beta.assistants.retrieve(assistant_id)
+    except NotFoundError:
+        return None
+
+
+def _find_remote(client, digest):
+    """Procura na conta um assistente já criado com a mesma definição"""
+    for assistant in client.beta.assistants.list(limit=100).data:
+        if (assistant.metadata or {}).get('definition_hash') == digest:
+            return assistant
+    return None
+
+
+def get_or_create_assistant(client, name, instructions, model):
+    """Retorna o assistente da definição informada, criando-o apenas se necessário"""
+    digest = definition_hash(name, instructions, model)
+    key = _cache_key(client, digest)
+
+    with _lock:
+        if key in _assistants:
+            return _assistants[key]
+
+        cache = _read_cache()
+        assistant = None
+        if key in cache:
+            assistant = _retrieve(client, cache[key])
+        if assistant is None:
+            assistant = _find_remote(client, digest)
+        if assistant is None:
+            assistant = client.beta.assistants.create(
+                name=name,
+                instructions=instructions,
+                model=model,
+                metadata={'definition_hash': digest}
+            )
+
+        _assistants[key] = assistant
+        if cache.get(key) != assistant.id:
+            cache[key] = assistant.id
+            _write_cache(cache)
+        return assistant
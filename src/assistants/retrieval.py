@@ -0,0 +1,180 @@
+"""
+Recuperação de trechos dos documentos de uma execução para o chat do PDI.
+
+Os arquivos `.md` do workspace são divididos em trechos de até
+`CHUNK_TOKENS` tokens, respeitando as seções, e indexados com BM25 (e com
+embeddings, quando há um modelo configurado em PDI_EMBEDDING_MODEL). O índice
+é atualizado de forma incremental: a cada consulta só os arquivos novos ou
+alterados desde a última são lidos, então documentos gravados pelas tasks
+ainda em execução entram no índice assim que aparecem. Cada pergunta recebe
+apenas os `top_k` trechos mais relevantes.
+"""
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+import numpy as np
+from src.core.accounting import count_tokens
+from src.core.sections import parse_sections
+from src.core.text_search import BM25Index
+from src.tools.semantic_catalog import EMBEDDING_MODEL, get_embedder
+
+CHUNK_TOKENS = int(os.getenv("PDI_CHUNK_TOKENS", "400"))
+DEFAULT_TOP_K = int(os.getenv("PDI_RETRIEVAL_TOP_K", "4"))
+RRF_K = 60  # constante da fusão por posição (reciprocal rank fusion)
+# Índices mantidos em memória; os de workspaces consultados há mais tempo saem primeiro
+MAX_INDEXES = int(os.getenv("PDI_MAX_DOCUMENT_INDEXES", "16"))
+
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """Trecho de um documento, identificado pelo arquivo e pela seção"""
+    source: str
+    section: str
+    text: str
+
+    @property
+    def digest(self):
+        return hashlib.sha1(f"{self.source}\0{self.section}\0{self.text}".encode('utf-8')).hexdigest()
+
+    def __str__(self):
+        return f"[{self.source} › {self.section}]\n{self.text}"
+
+
+def chunk_document(name, markdown, max_tokens=CHUNK_TOKENS):
+    """Trechos do documento: parágrafos de uma mesma seção agrupados até `max_tokens`"""
+    chunks = []
+    for section in parse_sections(markdown, max_level=3):
+        # O título já identifica o trecho (Chunk.section); fica fora do texto
+        lines = section.content.splitlines()
+        body = "\n".join(lines[1:] if section.level else lines)
+        current, size = [], 0
+        for paragraph in _PARAGRAPH_BREAK.split(body):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            tokens = count_tokens(paragraph)
+            if current and size + tokens > max_tokens:
+                chunks.append(Chunk(name, section.title, "\n\n".join(current)))
+                current, size = [], 0
+            current.append(paragraph)
+            size += tokens
+        if current:
+            chunks.append(Chunk(name, section.title, "\n\n".join(current)))
+    return chunks
+
+
+class DocumentIndex:
+    """Índice BM25 (e opcionalmente vetorial) dos documentos markdown de um diretório"""
+
+    def __init__(self, directory, embedder=None, pattern="*.md"):
+        self.directory = Path(directory)
+        self.embedder = embedder
+        self.pattern = pattern
+        self.chunks = []
+        self.text_index = BM25Index()
+        self._signatures = {}
+        self._vectors = {}  # digest do trecho -> embedding
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Indexa os arquivos novos ou alterados; retorna quantos foram lidos"""
+        with self._lock:
+            current = {
+                path.name: (path.stat().st_mtime_ns, path.stat().st_size)
+                for path in sorted(self.directory.glob(self.pattern))
+            }
+            changed = [name for name, signature in current.items() if self._signatures.get(name) != signature]
+            removed = [name for name in self._signatures if name not in current]
+            if not changed and not removed:
+                return 0
+
+            new_chunks = [
+                chunk
+                for name in changed
+                for chunk in chunk_document(name, (self.directory / name).read_text(encoding='utf-8'))
+            ]
+            if removed or any(name in self._signatures for name in changed):
+                # O BM25Index só aceita inclusões: arquivos reescritos reconstroem o índice
+                kept = [chunk for chunk in self.chunks if chunk.source not in changed and chunk.source not in removed]
+                self.chunks = []
+                self.text_index = BM25Index()
+                new_chunks = kept + new_chunks
+
+            for chunk in new_chunks:
+                self.text_index.add(f"{chunk.section}\n{chunk.text}")
+                self.chunks.append(chunk)
+            self._embed_missing()
+            self._signatures = current
+            return len(changed)
+
+    def _embed_missing(self):
+        if self.embedder is None:
+            return
+        # Descarta os embeddings de trechos que saíram do índice
+        digests = {chunk.digest for chunk in self.chunks}
+        self._vectors = {digest: vector for digest, vector in self._vectors.items() if digest in digests}
+        missing = [chunk for chunk in self.chunks if chunk.digest not in self._vectors]
+        if missing:
+            vectors = self.embedder.embed([f"{chunk.section}\n{chunk.text}" for chunk in missing])
+            for chunk, vector in zip(missing, vectors):
+                self._vectors[chunk.digest] = vector
+
+    def _vector_ranking(self, query, top_k):
+        if self.embedder is None or not self.chunks:
+            return []
+        matrix = np.vstack([self._vectors[chunk.digest] for chunk in self.chunks])
+        scores = matrix @ self.embedder.embed([query])[0]
+        return [int(i) for i in np.argsort(-scores)[:top_k]]
+
+    def search(self, query, top_k=DEFAULT_TOP_K):
+        """Trechos mais relevantes para a pergunta, combinando BM25 e embeddings por posição"""
+        self.refresh()
+        with self._lock:
+            if not self.chunks or not query.strip():
+                return []
+            candidates = top_k * 4
+            rankings = [[doc_id for doc_id, _ in self.text_index.search(query, candidates)]]
+            rankings.append(self._vector_ranking(query, candidates))
+            scores = {}
+            for ranking in rankings:
+                for position, doc_id in enumerate(ranking):
+                    scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (RRF_K + position + 1)
+            best = sorted(scores, key=scores.get, reverse=True)[:top_k]
+            return [self.chunks[doc_id] for doc_id in best]
+
+
+_lock = threading.Lock()
+_indexes = OrderedDict()
+
+
+def get_document_index(directory):
+    """Índice compartilhado dos documentos do diretório (um por workspace)
+
+    Os índices de workspaces já removidos são descartados e, acima de
+    MAX_INDEXES, saem os consultados há mais tempo.
+    """
+    directory = Path(directory).resolve()
+    with _lock:
+        for stale in [path for path in _indexes if path != directory and not path.is_dir()]:
+            del _indexes[stale]
+        index = _indexes.pop(directory, None)
+        if index is None:
+            index = DocumentIndex(directory, get_embedder() if EMBEDDING_MODEL else None)
+        _indexes[directory] = index
+        while len(_indexes) > MAX_INDEXES:
+            _indexes.popitem(last=False)
+        return index
+
+
+def retrieve_context(directory, query, top_k=DEFAULT_TOP_K):
+    """Texto com os trechos relevantes, pronto para ser enviado junto com a pergunta"""
+    chunks = get_document_index(directory).search(query, top_k)
+    if not chunks:
+        return None
+    return "Trechos dos documentos do PDI relevantes para a pergunta:\n\n" + "\n\n".join(str(chunk) for chunk in chunks)
@@ -0,0 +1,213 @@
+"""
+Motor compartilhado para executar runs da Assistants API.
+
+Em vez de consultar o status do run em um laço sem pausa, as funções deste
+módulo fazem polling com backoff exponencial e jitter, respeitam um prazo
+máximo e tratam os estados terminais do run. Também expõe o modo streaming,
+que entrega o texto da resposta à medida que os eventos chegam.
+"""
+import asyncio
+import os
+import random
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from openai import AsyncOpenAI, OpenAIError
+
+# Estados em que o run ainda está sendo processado pelo servidor
+PENDING_STATUSES = {'queued', 'in_progress', 'cancelling'}
+
+# Estados em que o run terminou e a resposta pode ser lida da thread
+SUCCESS_STATUSES = {'completed', 'incomplete'}
+
+# Eventos de streaming que encerram o run sem resposta
+FAILED_RUN_EVENTS = {'thread.run.failed', 'thread.run.expired', 'thread.run.cancelled'}
+
+DEFAULT_TIMEOUT = 120.0
+INITIAL_DELAY = 0.25
+MAX_DELAY = 4.0
+
+# Clientes assíncronos compartilhados por event loop e chave de API, com no
+# máximo MAX_ASYNC_CLIENTS chaves por loop (os menos usados recentemente saem)
+MAX_ASYNC_CLIENTS = int(os.getenv("PDI_MAX_ASYNC_CLIENTS", "32"))
+_async_clients = weakref.WeakKeyDictionary()
+_closing_clients = set()
+# Clientes reservados por turnos em andamento: id -> [cliente, reservas]
+_held_clients = {}
+# Clientes já descartados que serão fechados quando a última reserva terminar
+_evicted_clients = set()
+
+
+class RunError(RuntimeError):
+    """Erro levantado quando um run termina sem produzir uma resposta"""
+
+    def __init__(self, run, message=None):
+        self.run = run
+        self.status = getattr(run, 'status', None)
+        if message is None:
+            message = f"Run {run.id} terminou com status '{self.status}'"
+            last_error = getattr(run, 'last_error', None)
+            if last_error is not None:
+                message += f": {last_error.message}"
+        super().__init__(message)
+
+
+class RunTimeoutError(RunError):
+    """Erro levantado quando o run não termina dentro do prazo"""
+
+
+def get_async_client(api_key):
+    """Retorna um AsyncOpenAI compartilhado para o event loop atual
+
+    O pool de conexões do cliente fica preso ao loop em que foi criado, então
+    mantemos um cliente por loop e por chave de API. Acima de
+    MAX_ASYNC_CLIENTS chaves, o cliente usado há mais tempo é descartado e
+    fechado assim que nenhum turno o estiver usando (veja `hold_client`).
+    """
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.setdefault(loop, OrderedDict())
+    client = clients.pop(api_key, None) or AsyncOpenAI(api_key=api_key)
+    clients[api_key] = client
+    while len(clients) > MAX_ASYNC_CLIENTS:
+        _, evicted = clients.popitem(last=False)
+        if id(evicted) in _held_clients:
+            _evicted_clients.add(id(evicted))
+        else:
+            task = loop.create_task(evicted.close())
+            _closing_clients.add(task)
+            task.add_done_callback(_closing_clients.discard)
+    return client
+
+
+@asynccontextmanager
+async def hold_client(client):
+    """Reserva o cliente durante um turno, para que o descarte não o feche no meio de um run ou stream"""
+    held = _held_clients.setdefault(id(client), [client, 0])
+    held[1] += 1
+    try:
+        yield client
+    finally:
+        held[1] -= 1
+        if held[1] == 0:
+            del _held_clients[id(client)]
+            if id(client) in _evicted_clients:
+                _evicted_clients.discard(id(client))
+                await client.close()
+
+
+def backoff_delays(initial=INITIAL_DELAY, maximum=MAX_DELAY, factor=2.0):
+    """Gera intervalos de espera com backoff exponencial e jitter"""
+    delay = initial
+    while True:
+        # Jitter proporcional evita que várias sessões consultem em sincronia
+        yield random.uniform(delay / 2, delay)
+        delay = min(delay * factor, maximum)
+
+
+def _check_run(run):
+    """Retorna True se o run terminou com sucesso, False se ainda está pendente"""
+    if run.status in SUCCESS_STATUSES:
+        return True
+    if run.status in PENDING_STATUSES:
+        return False
+    # failed, expired, cancelled e requires_action (nenhum assistente usa tools)
+    raise RunError(run)
+
+
+async def _cancel_run(client, run):
+    """Cancela o run ignorando erros caso ele já tenha terminado"""
+    try:
+        await client.beta.threads.runs.cancel(thread_id=run.thread_id, run_id=run.id)
+    except OpenAIError:
+        pass
+
+
+def _cancel_run_sync(client, run):
+    """Versão síncrona de _cancel_run"""
+    try:
+        client.beta.threads.runs.cancel(thread_id=run.thread_id, run_id=run.id)
+    except OpenAIError:
+        pass
+
+
+async def wait_for_run(client, run, timeout=DEFAULT_TIMEOUT):
+    """Aguarda a conclusão de um run usando o cliente assíncrono da OpenAI"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    delays = backoff_delays()
+
+    while True:
+        try:
+            if _check_run(run):
+                return run
+        except RunError:
+            if run.status == 'requires_action':
+                # Libera a thread para as próximas mensagens
+                await _cancel_run(client, run)
+            raise
+
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            await _cancel_run(client, run)
+            raise RunTimeoutError(run, f"Run {run.id} não terminou em {timeout:.0f}s")
+
+        await asyncio.sleep(min(next(delays), remaining))
+        run = await client.beta.threads.runs.retrieve(thread_id=run.thread_id, run_id=run.id)
+
+
+def wait_for_run_sync(client, run, timeout=DEFAULT_TIMEOUT):
+    """Versão síncrona de wait_for_run para fluxos que não rodam em um event loop"""
+    deadline = time.monotonic() + timeout
+    delays = backoff_delays()
+
+    while True:
+        try:
+            if _check_run(run):
+                return run
+        except RunError:
+            if run.status == 'requires_action':
+                _cancel_run_sync(client, run)
+            raise
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            _cancel_run_sync(client, run)
+            raise RunTimeoutError(run, f"Run {run.id} não terminou em {timeout:.0f}s")
+
+        time.sleep(min(next(delays), remaining))
+        run = client.beta.threads.runs.retrieve(thread_id=run.thread_id, run_id=run.id)
+
+
+async def stream_run_text(client, thread_id, assistant_id, on_complete=None, on_message=None, **run_params):
+    """Cria um run em modo streaming e produz os trechos de texto à medida que chegam
+
+    `on_complete`, se informado, recebe o run concluído (com `run.usage`), e
+    `on_message` cada mensagem concluída pelo run.
+    """
+    stream = await client.beta.threads.runs.create(
+        thread_id=thread_id,
+        assistant_id=assistant_id,
+        stream=True,
+        **run_params
+    )
+    async with stream:
+        async for event in stream:
+            if event.event == 'thread.message.delta':
+                for block in event.data.delta.content or []:
+                    if block.type == 'text' and block.text and block.text.value:
+                        yield block.text.value
+            elif event.event == 'thread.message.completed':
+                if on_message is not None:
+                    on_message(event.data)
+            elif event.event in ('thread.run.completed', 'thread.run.incomplete'):
+                if on_complete is not None:
+                    on_complete(event.data)
+            elif event.event == 'thread.run.requires_action':
+                await _cancel_run(client, event.data)
+                raise RunError(event.data)
+            elif event.event in FAILED_RUN_EVENTS:
+                raise RunError(event.data)
+            elif event.event == 'error':
+                raise RunError(None, f"Erro no streaming do run: {event.data.message}")
+
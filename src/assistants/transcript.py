@@ -0,0 +1,94 @@
+"""
+Leitura incremental das mensagens de uma thread da Assistants API.
+
+Depois de cada run, em vez de listar a thread inteira e procurar a primeira
+mensagem do assistente, buscamos apenas as mensagens criadas por aquele run
+(`run_id`), em ordem cronológica e a partir da última mensagem já vista
+(`after`). Cada mensagem lida entra em uma transcrição local da thread, de
+modo que o volume transferido por turno não cresce com o histórico. A
+transcrição guarda só as mensagens mais recentes (o bastante para o cursor
+`after`) e as do run atual, então também não cresce em memória.
+"""
+from collections import deque
+from dataclasses import dataclass
+
+PAGE_SIZE = 20
+MAX_MESSAGES = 20
+
+
+@dataclass(frozen=True)
+class TranscriptMessage:
+    id: str
+    role: str
+    text: str
+    run_id: str = None
+
+
+def message_text(message):
+    """Texto da mensagem (os blocos de texto concatenados)"""
+    return "".join(block.text.value for block in message.content if block.type == 'text')
+
+
+class Transcript:
+    """Mensagens mais recentes de uma thread, na ordem em que foram criadas, e a resposta do run atual"""
+
+    def __init__(self, thread_id, max_messages=MAX_MESSAGES):
+        self.thread_id = thread_id
+        self.messages = deque(maxlen=max_messages)
+        self._run_id = None
+        self._run_messages = []
+
+    @property
+    def last_message_id(self):
+        return self.messages[-1].id if self.messages else None
+
+    def record(self, message):
+        """Acrescenta a mensagem da API à transcrição, ignorando as repetidas"""
+        if any(seen.id == message.id for seen in self.messages):
+            return message
+        entry = TranscriptMessage(message.id, message.role, message_text(message), getattr(message, 'run_id', None))
+        self.messages.append(entry)
+        if entry.run_id is not None and entry.role == 'assistant':
+            if entry.run_id != self._run_id:
+                self._run_id, self._run_messages = entry.run_id, []
+            self._run_messages.append(entry)
+        return message
+
+    def discard(self, message_ids):
+        """Esquece mensagens apagadas da thread; a próxima busca parte da última que restou"""
+        message_ids = set(message_ids)
+        self.messages = deque((m for m in self.messages if m.id not in message_ids), maxlen=self.messages.maxlen)
+        self._run_messages = [m for m in self._run_messages if m.id not in message_ids]
+
+    def _list_params(self, run_id, after):
+        params = {'thread_id': self.thread_id, 'run_id': run_id, 'order': 'asc', 'limit': PAGE_SIZE}
+        if after is not None:
+            params['after'] = after
+        return params
+
+    def _run_response(self, run_id):
+        if run_id != self._run_id:
+            return None
+        return "\n\n".join(m.text for m in self._run_messages if m.text) or None
+
+    async def fetch_run(self, client, run_id):
+        """Busca as mensagens novas do run e retorna o texto da resposta do assistente"""
+        after = self.last_message_id
+        while True:
+            page = await client.beta.threads.messages.list(**self._list_params(run_id, after))
+            for message in page.data:
+                self.record(message)
+            if not page.data or not page.has_more:
+                return self._run_response(run_id)
+            after = page.data[-1].id
+
+    def fetch_run_sync(self, client, run_id):
+        """Versão síncrona de fetch_run"""
+        after = self.last_message_id
+        while True:
+            page = client.beta.threads.messages.list(**self._list_params(run_id, after))
+            for message in page.data:
+                self.record(message)
+            if not page.data or not page.has_more:
+                return self._run_response(run_id)
+            after = page.data[-1].id
@@ -0,0 +1,93 @@
+"""
+Preparação antecipada dos assistentes usados depois da entrevista.
+
+Assim que o pdi.md existe, o Consultor PDI, o LinkedIn Post Creator e o
+Mestre dos Magos são preparados em paralelo, em segundo plano: obtenção do
+assistente, criação da thread com os documentos e, no caso do LinkedIn, a
+geração do post inicial. A interface consulta a prontidão de cada um e só
+espera por aquele que o usuário abrir antes de ficar pronto.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from src.assistants.linkedin_assistant import LinkedInAssistant
+from src.assistants.mestre_dos_magos_assistant import MestreDosMagosAssistant
+from src.assistants.pdi_assistant import PDIAssistant
+from src.assistants.retrieval import get_document_index
+
+PENDING = 'pending'
+READY = 'ready'
+FAILED = 'failed'
+
+PDI = 'pdi'
+LINKEDIN = 'linkedin'
+MESTRE_DOS_MAGOS = 'mestre_dos_magos'
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("PDI_WARMUP_WORKERS", "6")),
+    thread_name_prefix="assistant-warmup"
+)
+
+
+def _warm_pdi(api_key, session_id, output_dir):
+    assistant = PDIAssistant(api_key, session_id)
+    assistant.initialize_assistant()
+    assistant.upload_pdi_documents(output_dir)
+    get_document_index(output_dir).refresh()
+    return assistant, []
+
+
+def _warm_linkedin(api_key, session_id, output_dir):
+    assistant = LinkedInAssistant(api_key, session_id)
+    assistant.initialize_assistant()
+    post = assistant.upload_pdi_documents(output_dir, generate_post=True)
+    return assistant, [{"role": "assistant", "content": post}]
+
+
+def _warm_mestre_dos_magos(api_key, session_id, output_dir):
+    assistant = MestreDosMagosAssistant(api_key, session_id)
+    assistant.initialize_assistant()
+    assistant.create_thread()
+    return assistant, []
+
+
+WARMUPS = {
+    PDI: _warm_pdi,
+    LINKEDIN: _warm_linkedin,
+    MESTRE_DOS_MAGOS: _warm_mestre_dos_magos,
+}
+
+
+class AssistantWarmup:
+    """Prepara os assistentes de uma sessão em paralelo
+
+    Cada preparação produz `(assistente, mensagens iniciais do chat)`.
+    """
+
+    def __init__(self, openai_api_key, session_id, output_dir, warmups=WARMUPS):
+        self.openai_api_key = openai_api_key
+        self.session_id = session_id
+        self.output_dir = output_dir
+        self.warmups = warmups
+        self.futures = {}
+
+    def start(self):
+        for name, warm in self.warmups.items():
+            if name not in self.futures:
+                self.futures[name] = _executor.submit(warm, self.openai_api_key, self.session_id, self.output_dir)
+        return self
+
+    def status(self, name):
+        future = self.futures.get(name)
+        if future is None or not future.done():
+            return PENDING
+        return FAILED if future.exception() is not None else READY
+
+    def ready(self, name):
+        return self.status(name) == READY
+
+    def statuses(self):
+        return {name: self.status(name) for name in self.warmups}
+
+    def result(self, name, timeout=None):
+        """(assistente, mensagens) preparados; aguarda se ainda estiverem em andamento"""
+        return self.futures[name].result(timeout)
@@ -0,0 +1,273 @@
+"""
+Contabilidade de tokens, latência e custo estimado das chamadas de LLM.
+
+Os registros vêm dos eventos `tokens_used`: os da crew ficam no
+`events.jsonl` de cada workspace (uma entrada por task, com os tokens
+informados pela API ou estimados com tiktoken) e os dos assistentes da
+Assistants API em um log próprio (`run.usage` de cada run). O ledger agrega
+por execução, task, agent, modelo ou sessão e exporta CSV/JSON.
+
+Relatório pela linha de comando:
+
+    python -m src.core.accounting [RUN_ID ...] [--assistants] [--by task|agent|model|run_id|session_id]
+                                  [--csv arquivo.csv] [--json arquivo.json]
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass, fields
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+from src.core.events import EVENTS_FILE, TOKENS_USED, EventBus, JSONLSink, log_files, read_events
+from src.core.workspace import WORKSPACES_DIR, Workspace
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+ASSISTANT_USAGE_LOG = Path(os.getenv("PDI_USAGE_LOG", PROJECT_ROOT / ".cache" / "assistant_usage.jsonl"))
+# O log dos assistentes é rotacionado ao atingir esse tamanho, com até USAGE_LOG_BACKUPS arquivos antigos
+USAGE_LOG_MAX_BYTES = int(float(os.getenv("PDI_USAGE_LOG_MAX_MB", "10")) * 1024 * 1024)
+USAGE_LOG_BACKUPS = int(os.getenv("PDI_USAGE_LOG_BACKUPS", "3"))
+
+# USD por 1 milhão de tokens (entrada, saída); valores de referência da tabela pública da OpenAI
+PRICES = {
+    'gpt-4o-mini': (0.15, 0.60),
+    'gpt-4o-2024-05-13': (5.00, 15.00),
+    'gpt-4o': (2.50, 10.00),
+    'gpt-4-turbo': (10.00, 30.00),
+    'gpt-4': (30.00, 60.00),
+    'gpt-3.5-turbo': (0.50, 1.50),
+    'o1-mini': (1.10, 4.40),
+    'o1': (15.00, 60.00),
+    'o3-mini': (1.10, 4.40),
+}
+
+
+def price_for(model):
+    """Preço (entrada, saída) do modelo, pelo prefixo mais longo conhecido"""
+    if not model:
+        return None
+    name = model.split('/')[-1]
+    matches = [prefix for prefix in PRICES if name.startswith(prefix)]
+    return PRICES[max(matches, key=len)] if matches else None
+
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    price = price_for(model)
+    if price is None:
+        return 0.0
+    return (prompt_tokens * price[0] + completion_tokens * price[1]) / 1_000_000
+
+
+@lru_cache(maxsize=None)
+def _encoding(model):
+    """Codificação do tiktoken para o modelo, ou None se não puder ser carregada"""
+    try:
+        import tiktoken
+        try:
+            return tiktoken.encoding_for_model(model.split('/')[-1])
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None  # tiktoken ausente ou sem acesso para baixar a codificação
+
+
+def count_tokens(text, model="gpt-4o"):
+    """Número de tokens do texto (aproximado quando o tiktoken não está disponível)"""
+    if not text:
+        return 0
+    encoding = _encoding(model or "gpt-4o")
+    if encoding is None:
+        return len(text) // 4
+    return len(encoding.encode(text))
+
+
+@dataclass
+class UsageRecord:
+    """Consumo de uma task da crew ou de um run de assistente"""
+    source: str
+    model: Optional[str]
+    prompt_tokens: int
+    completion_tokens: int
+    latency: float
+    timestamp: float
+    run_id: Optional[str] = None
+    task: Optional[str] = None
+    agent: Optional[str] = None
+    session_id: Optional[str] = None
+    requests: int = 1
+    estimated: bool = False
+
+    @property
+    def total_tokens(self):
+        return self.prompt_tokens + self.completion_tokens
+
+    @property
+    def cost(self):
+        return estimate_cost(self.model, self.prompt_tokens, self.completion_tokens)
+
+    @classmethod
+    def from_event(cls, event, run_id=None):
+        data = event.data
+        return cls(
+            source=data.get('source', 'crew'),
+            model=data.get('model'),
+            prompt_tokens=data.get('prompt_tokens', 0),
+            completion_tokens=data.get('completion_tokens', 0),
+            latency=data.get('latency', 0.0),
+            timestamp=event.timestamp,
+            run_id=run_id or data.get('run_id'),
+            task=event.task,
+            agent=data.get('agent'),
+            session_id=data.get('session_id'),
+            requests=data.get('requests', 1),
+            estimated=data.get('estimated', False)
+        )
+
+
+class UsageLedger:
+    """Conjunto de registros de consumo com agregações e exportação"""
+
+    def __init__(self, records=()):
+        self.records = list(records)
+
+    def add_events(self, events, run_id=None):
+        for event in events:
+            if event.type == TOKENS_USED:
+                self.records.append(UsageRecord.from_event(event, run_id))
+        return self
+
+    @classmethod
+    def for_runs(cls, run_ids=None, root=WORKSPACES_DIR):
+        """Ledger das execuções informadas ou de todos os workspaces existentes"""
+        root = Path(root)
+        if run_ids is None:
+            run_ids = sorted(path.name for path in root.iterdir() if path.is_dir()) if root.is_dir() else []
+        ledger = cls()
+        for run_id in run_ids:
+            ledger.add_events(read_events(Workspace(run_id, root).file(EVENTS_FILE)), run_id)
+        return ledger
+
+    @classmethod
+    def for_assistants(cls, path=ASSISTANT_USAGE_LOG, backups=USAGE_LOG_BACKUPS):
+        """Ledger do log dos assistentes, incluindo os arquivos já rotacionados"""
+        ledger = cls()
+        for file in log_files(path, backups):
+            ledger.add_events(read_events(file))
+        return ledger
+
+    def totals(self, by='task'):
+        """Soma de tokens, latência e custo agrupada por um campo dos registros"""
+        groups = {}
+        for record in self.records:
+            key = getattr(record, by) or '-'
+            group = groups.setdefault(key, {
+                'requests': 0, 'prompt_tokens': 0, 'completion_tokens': 0,
+                'total_tokens': 0, 'latency': 0.0, 'cost': 0.0
+            })
+            group['requests'] += record.requests
+            group['prompt_tokens'] += record.prompt_tokens
+            group['completion_tokens'] += record.completion_tokens
+            group['total_tokens'] += record.total_tokens
+            group['latency'] += record.latency
+            group['cost'] += record.cost
+        return dict(sorted(groups.items(), key=lambda item: item[1]['cost'], reverse=True))
+
+    def rows(self):
+        return [
+            {**asdict(record), 'total_tokens': record.total_tokens, 'cost': round(record.cost, 6)}
+            for record in self.records
+        ]
+
+    def to_csv(self, path):
+        columns = [field.name for field in fields(UsageRecord)] + ['total_tokens', 'cost']
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(self.rows())
+
+    def to_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.rows(), f, ensure_ascii=False, indent=2)
+
+    def report(self, by='task'):
+        """Tabela textual com o consumo agrupado"""
+        lines = [f"{by:<55} {'req':>5} {'entrada':>9} {'saída':>9} {'latência':>9} {'custo US$':>10}"]
+        for key, group in self.totals(by).items():
+            lines.append(
+                f"{str(key).strip()[:55]:<55} {group['requests']:>5} {group['prompt_tokens']:>9} "
+                f"{group['completion_tokens']:>9} {group['latency']:>8.1f}s {group['cost']:>10.4f}"
+            )
+        total_cost = sum(record.cost for record in self.records)
+        lines.append(f"Total: {sum(r.total_tokens for r in self.records)} tokens, US$ {total_cost:.4f}")
+        if any(record.estimated for record in self.records):
+            lines.append("* parte dos tokens foi estimada com tiktoken")
+        return "\n".join(lines)
+
+
+_assistant_usage = EventBus([JSONLSink(ASSISTANT_USAGE_LOG, USAGE_LOG_MAX_BYTES, USAGE_LOG_BACKUPS)])
+
+
+def record_assistant_run(run, assistant, latency, session_id=None):
+    """Registra o `run.usage` de um run da Assistants API"""
+    usage = getattr(run, 'usage', None)
+    if usage is None:
+        return
+    _assistant_usage.emit(
+        TOKENS_USED,
+        None,
+        source='assistant',
+        agent=assistant,
+        model=getattr(run, 'model', None),
+        prompt_tokens=usage.prompt_tokens,
+        completion_tokens=usage.completion_tokens,
+        latency=latency,
+        session_id=session_id
+    )
+
+
+def record_completion(response, agent, latency, session_id=None, source='summarizer'):
+    """Registra o `response.usage` de uma chamada de chat completion feita pelos assistentes"""
+    usage = getattr(response, 'usage', None)
+    if usage is None:
+        return
+    _assistant_usage.emit(
+        TOKENS_USED,
+        None,
+        source=source,
+        agent=agent,
+        model=getattr(response, 'model', None),
+        prompt_tokens=usage.prompt_tokens,
+        completion_tokens=usage.completion_tokens,
+        latency=latency,
+        session_id=session_id
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Relatório de tokens e custo estimado das execuções")
+    parser.add_argument('run_ids', nargs='*', help="Execuções a incluir (padrão: todos os workspaces)")
+    parser.add_argument('--assistants', action='store_true', help="Inclui os runs dos assistentes")
+    parser.add_argument('--by', default='task', choices=['task', 'agent', 'model', 'run_id', 'session_id'])
+    parser.add_argument('--csv', help="Exporta os registros em CSV")
+    parser.add_argument('--json', help="Exporta os registros em JSON")
+    args = parser.parse_args(argv)
+
+    ledger = UsageLedger.for_runs(args.run_ids or None)
+    if args.assistants:
+        ledger.records.extend(UsageLedger.for_assistants().records)
+    if not ledger.records:
+        print("Nenhum consumo registrado.")
+        return 1
+
+    print(ledger.report(args.by))
+    if args.csv:
+        ledger.to_csv(args.csv)
+    if args.json:
+        ledger.to_json(args.json)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
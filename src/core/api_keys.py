@@ -0,0 +1,102 @@
+"""
+Validação das chaves da API da OpenAI.
+
+Em vez de uma chamada de completion, a chave é validada com a listagem de
+modelos, que é rápida e não consome tokens. As requisições compartilham um
+pool de conexões HTTP, o veredito fica em cache por hash da chave (a chave em
+si nunca é guardada) e a validação roda em uma thread, para que a interface
+continue preparando o assistente de entrevista enquanto aguarda a resposta.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import openai
+from openai import DefaultHttpxClient, OpenAI
+
+KEY_CACHE_TTL = float(os.getenv("PDI_KEY_CACHE_TTL", "900"))
+VALIDATION_TIMEOUT = 10.0
+# Vereditos guardados no máximo; os usados há mais tempo saem primeiro
+MAX_CACHED_KEYS = int(os.getenv("PDI_MAX_CACHED_KEYS", "256"))
+
+_lock = threading.Lock()
+_verdicts = OrderedDict()
+_http_client = None
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="key-validation")
+
+
+class KeyValidationError(RuntimeError):
+    """A chave não pôde ser verificada (rede, indisponibilidade da API)"""
+
+
+def key_hash(api_key):
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+
+
+def _shared_http_client():
+    """Pool de conexões reaproveitado por todas as validações"""
+    global _http_client
+    with _lock:
+        if _http_client is None:
+            _http_client = DefaultHttpxClient(timeout=VALIDATION_TIMEOUT)
+        return _http_client
+
+
+def _cached_verdict(digest, ttl):
+    with _lock:
+        cached = _verdicts.get(digest)
+        if cached is None:
+            return None
+        if time.time() - cached[1] >= ttl:
+            del _verdicts[digest]
+            return None
+        _verdicts.move_to_end(digest)
+        return cached[0]
+
+
+def _store_verdict(digest, verdict):
+    """Guarda o veredito, descartando os expirados e, acima do limite, os menos usados"""
+    now = time.time()
+    with _lock:
+        _verdicts[digest] = (verdict, now)
+        _verdicts.move_to_end(digest)
+        for expired in [key for key, (_, stored) in _verdicts.items() if now - stored >= KEY_CACHE_TTL]:
+            del _verdicts[expired]
+        while len(_verdicts) > MAX_CACHED_KEYS:
+            _verdicts.popitem(last=False)
+
+
+def validate_api_key(api_key, ttl=KEY_CACHE_TTL):
+    """True se a API aceita a chave, False se ela é rejeitada
+
+    Falhas que não dizem nada sobre a chave (rede, limites, erros do servidor)
+    levantam KeyValidationError e não são guardadas no cache.
+    """
+    if not api_key or not api_key.strip():
+        return False
+    digest = key_hash(api_key)
+    verdict = _cached_verdict(digest, ttl)
+    if verdict is not None:
+        return verdict
+
+    client = OpenAI(api_key=api_key, http_client=_shared_http_client(), max_retries=1)
+    try:
+        client.models.list()
+        verdict = True
+    except openai.AuthenticationError:
+        verdict = False
+    except (openai.PermissionDeniedError, openai.RateLimitError):
+        verdict = True  # a chave foi autenticada, apenas sem acesso ou no limite
+    except openai.OpenAIError as e:
+        raise KeyValidationError(str(e)) from e
+
+    _store_verdict(digest, verdict)
+    return verdict
+
+
+def submit_key_validation(api_key, ttl=KEY_CACHE_TTL):
+    """Inicia a validação em segundo plano e retorna o Future com o veredito"""
+    return _executor.submit(validate_api_key, api_key, ttl)
+
@@ -0,0 +1,91 @@
+"""
+Event loop compartilhado pelo processo do servidor.
+
+O Streamlit executa cada script de forma síncrona; criar um event loop por
+turno de chat (`asyncio.run`) descartava a cada resposta os pools de conexão
+dos clientes assíncronos. Aqui um único loop roda em uma thread em segundo
+plano durante toda a vida do processo, e o código síncrono envia corrotinas
+para ele com `run_sync` e `iter_sync`. Como os clientes `AsyncOpenAI` e
+`httpx.AsyncClient` são mantidos por loop, todas as sessões passam a
+compartilhar as mesmas conexões, e a E/S de várias sessões se sobrepõe.
+"""
+import asyncio
+import threading
+
+
+class AsyncRuntime:
+    """Event loop de longa duração em uma thread daemon"""
+
+    def __init__(self, name="async-runtime"):
+        self.name = name
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self):
+        """Loop do runtime, iniciado no primeiro uso"""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                ready = threading.Event()
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._serve, args=(self._loop, ready),
+                                                name=self.name, daemon=True)
+                self._thread.start()
+                ready.wait()
+            return self._loop
+
+    @staticmethod
+    def _serve(loop, ready):
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        loop.run_forever()
+
+    def submit(self, coro):
+        """Agenda a corrotina no loop e retorna um concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run_sync(self, coro, timeout=None):
+        """Executa a corrotina no loop e aguarda o resultado na thread atual"""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("run_sync não pode ser chamado de dentro do loop do runtime")
+        return self.submit(coro).result(timeout)
+
+    def iter_sync(self, async_gen):
+        """Consome um gerador assíncrono a partir de código síncrono (ex.: st.write_stream)"""
+        try:
+            while True:
+                try:
+                    yield self.run_sync(async_gen.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            self.run_sync(async_gen.aclose())
+
+    def stop(self):
+        """Encerra o loop (usado ao finalizar o processo)"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+
+_runtime = AsyncRuntime()
+
+
+def get_runtime():
+    return _runtime
+
+
+def run_sync(coro, timeout=None):
+    """Executa a corrotina no event loop compartilhado do processo"""
+    return _runtime.run_sync(coro, timeout)
+
+
+def iter_sync(async_gen):
+    """Itera um gerador assíncrono no event loop compartilhado do processo"""
+    return _runtime.iter_sync(async_gen)
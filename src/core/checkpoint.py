@@ -0,0 +1,99 @@
+"""
+Checkpoints das execuções da crew.
+
+Cada task concluída é registrada em um manifesto JSON por execução. Para
+tasks com output_file o próprio arquivo gerado é o checkpoint (o manifesto
+guarda apenas o caminho e o hash do conteúdo); as demais têm a saída salva no
+manifesto. Com isso uma execução interrompida pode ser retomada executando
+apenas as tasks que faltam.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from src.core.task_cache import output_content, rebuild_task_output
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+CHECKPOINT_DIR = PROJECT_ROOT / "output" / ".checkpoints"
+
+
+def _content_hash(content):
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class CheckpointStore:
+    """Manifesto com as saídas das tasks concluídas de uma execução"""
+
+    def __init__(self, run_id=None, directory=CHECKPOINT_DIR):
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.path = Path(directory) / f"{self.run_id}.json"
+        self._lock = threading.Lock()
+
+    def exists(self):
+        return self.path.exists()
+
+    def load(self):
+        """Lê o manifesto da execução"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write(self, manifest):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def start(self, interview_data):
+        """Cria o manifesto com os dados necessários para retomar a execução"""
+        if self.exists():
+            return
+        self._write({
+            'run_id': self.run_id,
+            'interview_data': interview_data,
+            'created_at': time.time(),
+            'tasks': {}
+        })
+
+    def record(self, task, output):
+        """Registra a conclusão de uma task"""
+        content = output_content(output)
+        entry = {'finished_at': time.time(), 'sha256': _content_hash(content)}
+        if task.output_file:
+            entry['output_file'] = str(Path(task.output_file).resolve())
+        else:
+            entry['content'] = content
+
+        with self._lock:
+            manifest = self.load()
+            manifest['tasks'][task.name] = entry
+            self._write(manifest)
+
+    def restore(self, tasks):
+        """Reconstrói as saídas das tasks já concluídas, indexadas pelo nome
+
+        Tasks cujo arquivo de saída sumiu ou foi alterado são executadas de novo.
+        """
+        if not self.exists():
+            return {}
+
+        entries = self.load()['tasks']
+        restored = {}
+        for task in tasks:
+            entry = entries.get(task.name)
+            if entry is None:
+                continue
+            if 'output_file' in entry:
+                output_path = Path(entry['output_file'])
+                if not output_path.exists():
+                    continue
+                content = output_path.read_text(encoding='utf-8')
+            else:
+                content = entry['content']
+            if _content_hash(content) != entry['sha256']:
+                continue
+            restored[task.name] = rebuild_task_output(task, content)
+        return restored
@@ -0,0 +1,163 @@
+"""
+Eventos de execução da crew.
+
+O ParallelCrew publica no EventBus o início e o fim de cada task (com a
+duração), as chamadas de ferramentas dos agents e os tokens consumidos. Os
+eventos vão para sinks plugáveis: uma fila em memória para consumo no mesmo
+processo e um arquivo JSONL por execução, lido pela interface (que roda em
+outro processo) e útil para a operação identificar as tasks mais lentas.
+"""
+import json
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+TASK_STARTED = 'task_started'
+TASK_FINISHED = 'task_finished'
+TASK_FAILED = 'task_failed'
+TOOL_CALLED = 'tool_called'
+TOKENS_USED = 'tokens_used'
+
+EVENTS_FILE = 'events.jsonl'
+
+
+@dataclass
+class Event:
+    """Um evento da execução, associado a uma task"""
+    type: str
+    task: Optional[str]
+    timestamp: float
+    data: dict = field(default_factory=dict)
+
+
+class QueueSink:
+    """Guarda os eventos em uma fila em memória"""
+
+    def __init__(self):
+        self.queue = queue.Queue()
+
+    def __call__(self, event):
+        self.queue.put_nowait(event)
+
+    def drain(self):
+        """Retorna e remove os eventos acumulados"""
+        events = []
+        while True:
+            try:
+                events.append(self.queue.get_nowait())
+            except queue.Empty:
+                return events
+
+
+class JSONLSink:
+    """Acrescenta cada evento como uma linha JSON no arquivo
+
+    Com `max_bytes`, o arquivo que atinge esse tamanho é renomeado para
+    `<nome>.1` (os anteriores avançam até `<nome>.<backups>`, e o mais antigo
+    é descartado) antes da próxima escrita.
+    """
+
+    def __init__(self, path, max_bytes=None, backups=3):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        line = json.dumps(asdict(event), ensure_ascii=False)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.max_bytes and self.path.exists() and self.path.stat().st_size >= self.max_bytes:
+                self._rotate()
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+    def _rotate(self):
+        files = log_files(self.path, self.backups)
+        for older, newer in zip(files, files[1:]):
+            if newer.exists():
+                newer.replace(older)
+        if self.backups < 1:
+            self.path.unlink()
+
+
+def log_files(path, backups):
+    """Arquivos de um JSONLSink com rotação, do mais antigo ao atual"""
+    path = Path(path)
+    return [path.with_name(f"{path.name}.{index}") for index in range(backups, 0, -1)] + [path]
+
+
+class EventBus:
+    """Distribui os eventos para os sinks inscritos"""
+
+    def __init__(self, sinks=()):
+        self.sinks = list(sinks)
+
+    def subscribe(self, sink):
+        self.sinks.append(sink)
+
+    def emit(self, event_type, task=None, **data):
+        event = Event(event_type, task, time.time(), data)
+        for sink in self.sinks:
+            try:
+                sink(event)
+            except Exception:
+                pass  # um sink com problema não pode interromper a crew
+        return event
+
+
+def read_events(path):
+    """Lê os eventos gravados por um JSONLSink"""
+    path = Path(path)
+    if not path.exists():
+        return []
+    events = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                events.append(Event(**json.loads(line)))
+            except (ValueError, TypeError):
+                continue  # linha ainda sendo escrita
+    return events
+
+
+def summarize_tasks(events):
+    """Estado, duração, ferramentas e tokens de cada task a partir dos eventos"""
+    summary = {}
+    for event in events:
+        if event.task is None:
+            continue
+        entry = summary.setdefault(event.task, {
+            'status': 'pending', 'started_at': None, 'duration': None,
+            'tool_calls': 0, 'total_tokens': 0, 'cached': False
+        })
+        if event.type == TASK_STARTED:
+            entry['status'] = 'running'
+            entry['started_at'] = event.timestamp
+        elif event.type == TASK_FINISHED:
+            entry['status'] = 'finished'
+            entry['cached'] = event.data.get('cached', False)
+            # Tasks restauradas do checkpoint mantêm a duração da execução original
+            if not event.data.get('restored') or entry['duration'] is None:
+                entry['duration'] = event.data.get('duration')
+        elif event.type == TASK_FAILED:
+            entry['status'] = 'failed'
+            entry['duration'] = event.data.get('duration')
+        elif event.type == TOOL_CALLED:
+            entry['tool_calls'] += 1
+        elif event.type == TOKENS_USED:
+            entry['total_tokens'] += event.data.get('prompt_tokens', 0) + event.data.get('completion_tokens', 0)
+    return summary
+
+
+def slowest_tasks(events, top_k=3):
+    """[(task, duração)] das tasks concluídas que mais pesaram no tempo total"""
+    durations = [
+        (name, entry['duration'])
+        for name, entry in summarize_tasks(events).items()
+        if entry['status'] == 'finished' and entry['duration']
+    ]
+    return sorted(durations, key=lambda item: item[1], reverse=True)[:top_k]
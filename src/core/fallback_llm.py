@@ -0,0 +1,124 @@
+"""
+LLM do crewAI com cadeia de fallback e contagem de tokens por thread.
+
+O FallbackLLM tenta os modelos de `fallbacks` em ordem quando o principal
+falha ou estoura o timeout, e registra os tokens de cada chamada, por thread,
+a partir da resposta do litellm. Fica separado de routing.py para que o
+crewAI e o litellm só sejam carregados quando uma rota cria o LLM (no
+processo da crew), e não pelos assistentes no processo da interface.
+"""
+import logging
+import threading
+from dataclasses import dataclass, field, replace
+from typing import Optional
+import litellm
+from crewai import LLM
+from crewai.llm import suppress_warnings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LLMUsage:
+    """Tokens e requisições acumulados pelas chamadas ao LLM e o modelo da última chamada"""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    requests: int = 0
+    model: Optional[str] = field(default=None, compare=False)
+
+    def __sub__(self, other):
+        return LLMUsage(
+            self.prompt_tokens - other.prompt_tokens,
+            self.completion_tokens - other.completion_tokens,
+            self.requests - other.requests,
+            # Sem chamadas no intervalo, o último modelo é de outra task da thread
+            self.model if self.requests > other.requests else None
+        )
+
+    @property
+    def total_tokens(self):
+        return self.prompt_tokens + self.completion_tokens
+
+
+# As tasks rodam em paralelo, cada uma na sua thread, e cada chamada ao LLM é
+# síncrona na thread da task: o uso por thread é atribuível à task
+_thread_usage = threading.local()
+
+
+def thread_usage():
+    """Cópia do uso acumulado pelas chamadas do FallbackLLM feitas nesta thread"""
+    return replace(getattr(_thread_usage, 'usage', LLMUsage()))
+
+
+def _record_usage(response, model):
+    usage = getattr(response, 'usage', None)
+    current = getattr(_thread_usage, 'usage', LLMUsage())
+    _thread_usage.usage = LLMUsage(
+        current.prompt_tokens + (getattr(usage, 'prompt_tokens', 0) or 0),
+        current.completion_tokens + (getattr(usage, 'completion_tokens', 0) or 0),
+        current.requests + 1,
+        model
+    )
+
+
+def _completion(llm, messages, callbacks):
+    """Mesma chamada de LLM.call, mas devolvendo a resposta completa do litellm
+
+    Os parâmetros seguem o LLM.call da versão do crewAI fixada em
+    requirements.txt; tests/test_routing.py compara as duas chamadas.
+    """
+    with suppress_warnings():
+        if callbacks:
+            llm.set_callbacks(callbacks)
+        params = {
+            "model": llm.model,
+            "messages": messages,
+            "timeout": llm.timeout,
+            "temperature": llm.temperature,
+            "top_p": llm.top_p,
+            "n": llm.n,
+            "stop": llm.stop,
+            "max_tokens": llm.max_tokens or llm.max_completion_tokens,
+            "presence_penalty": llm.presence_penalty,
+            "frequency_penalty": llm.frequency_penalty,
+            "logit_bias": llm.logit_bias,
+            "response_format": llm.response_format,
+            "seed": llm.seed,
+            "logprobs": llm.logprobs,
+            "top_logprobs": llm.top_logprobs,
+            "api_base": llm.base_url,
+            "api_version": llm.api_version,
+            "api_key": llm.api_key,
+            "stream": False,
+            **llm.kwargs,
+        }
+        return litellm.completion(**{key: value for key, value in params.items() if value is not None})
+
+
+class FallbackLLM(LLM):
+    """LLM do crewAI que recorre aos modelos de fallback quando a chamada falha"""
+
+    def __init__(self, model, fallbacks=(), **params):
+        super().__init__(model=model, **params)
+        self.fallbacks = [LLM(model=fallback, **params) for fallback in fallbacks]
+
+    def call(self, messages, callbacks=[]):
+        error = None
+        for llm in [self] + self.fallbacks:
+            if error is not None:
+                logger.warning("Chamada ao LLM falhou (%s); tentando %s", error, llm.model)
+            try:
+                response = _completion(llm, messages, callbacks)
+            except Exception as e:
+                # Estouro de contexto é tratado pelo próprio crewAI (resumo das mensagens)
+                if not self.fallbacks or isinstance(e, litellm.ContextWindowExceededError):
+                    raise
+                error = e
+                continue
+            # Uso lido da resposta desta chamada, e não do contador global dos
+            # callbacks do litellm, que é trocado a cada chamada de qualquer agent.
+            # O modelo que respondeu fica junto do uso da thread: o mesmo LLM é
+            # compartilhado pelas cópias do agent em tasks paralelas
+            _record_usage(response, llm.model)
+            return response["choices"][0]["message"]["content"]
+        raise error
@@ -0,0 +1,233 @@
+"""
+Fila de jobs para gerar PDIs fora do script do Streamlit.
+
+Cada job executa uma crew em um processo de um pool local (PDI_JOB_WORKERS
+define quantas gerações rodam ao mesmo tempo). O estado dos jobs fica em
+SQLite e o progresso por task vem do checkpoint do workspace da execução, de
+modo que a interface consulta ambos sem bloquear e reencontra o job após um
+reload da página. A chave da OpenAI é repassada ao processo do job e nunca é
+gravada em disco.
+"""
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from src.core.async_runtime import run_sync
+from src.core.checkpoint import CheckpointStore
+from src.core.workspace import Workspace
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+JOBS_DB = Path(os.getenv("PDI_JOBS_DB", PROJECT_ROOT / ".cache" / "jobs.sqlite"))
+DEFAULT_WORKERS = int(os.getenv("PDI_JOB_WORKERS", "2"))
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+INTERRUPTED = 'interrupted'
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+
+@dataclass
+class Job:
+    """Estado de uma geração de PDI"""
+    id: str
+    run_id: str
+    status: str
+    owner_pid: int
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def done(self):
+        return self.status not in ACTIVE_STATUSES
+
+
+class JobStore:
+    """Tabela de jobs em SQLite, compartilhada entre o servidor e os workers"""
+
+    COLUMNS = ('id', 'run_id', 'status', 'owner_pid', 'created_at', 'started_at', 'finished_at', 'error')
+
+    def __init__(self, path=JOBS_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, run_id TEXT NOT NULL, status TEXT NOT NULL, "
+                "owner_pid INTEGER NOT NULL, created_at REAL NOT NULL, "
+                "started_at REAL, finished_at REAL, error TEXT)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def insert(self, job):
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT INTO jobs ({', '.join(self.COLUMNS)}) VALUES ({', '.join('?' * len(self.COLUMNS))})",
+                tuple(getattr(job, column) for column in self.COLUMNS)
+            )
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT {', '.join(self.COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job(*row) if row else None
+
+    def update(self, job_id, **fields):
+        assignments = ', '.join(f"{column} = ?" for column in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def active(self):
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM jobs WHERE status IN (?, ?)", ACTIVE_STATUSES
+            ).fetchall()
+        return [Job(*row) for row in rows]
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _run_job(job_id, db_path, openai_api_key, max_concurrency=None):
+    """Executa a crew do job em um processo do pool"""
+    # Importado aqui: o crewAI só é necessário no processo que executa o job
+    from src.core.utils import resume_crew
+
+    store = JobStore(db_path)
+    store.update(job_id, status=RUNNING, started_at=time.time())
+    try:
+        job = store.get(job_id)
+        crew_options = {'max_concurrency': max_concurrency} if max_concurrency else {}
+        # O checkpoint criado no envio já contém a entrevista; retomar cobre jobs novos e interrompidos
+        crew = run_sync(resume_crew(job.run_id, openai_api_key, **crew_options))
+        crew.kickoff()
+    except Exception as e:
+        store.update(job_id, status=FAILED, error=str(e), finished_at=time.time())
+        raise
+    store.update(job_id, status=COMPLETED, finished_at=time.time())
+
+
+class JobQueue:
+    """Pool de processos que executa as gerações de PDI em segundo plano"""
+
+    def __init__(self, max_workers=DEFAULT_WORKERS, db_path=JOBS_DB):
+        self.db_path = Path(db_path)
+        self.store = JobStore(self.db_path)
+        self.max_workers = max_workers
+        self.executor = self._create_executor()
+        self._executor_lock = threading.Lock()
+        self._mark_interrupted()
+
+    def _create_executor(self):
+        # spawn evita herdar threads e conexões abertas do servidor do Streamlit
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+
+    def _mark_interrupted(self):
+        """Jobs ativos de um servidor que não está mais rodando nunca vão terminar"""
+        for job in self.store.active():
+            if job.owner_pid != os.getpid() and not _pid_alive(job.owner_pid):
+                self.store.update(
+                    job.id,
+                    status=INTERRUPTED,
+                    error="Execução interrompida pelo reinício do servidor",
+                    finished_at=time.time()
+                )
+
+    def _enqueue(self, job, openai_api_key, max_concurrency=None):
+        args = (_run_job, job.id, str(self.db_path), openai_api_key, max_concurrency)
+        with self._executor_lock:
+            try:
+                future = self.executor.submit(*args)
+            except BrokenProcessPool:
+                # Um worker morreu (OOM, segfault) e inutilizou o pool: cria outro
+                self.executor = self._create_executor()
+                future = self.executor.submit(*args)
+        future.add_done_callback(lambda future: self._on_job_done(job.id, future))
+        return job.id
+
+    def _on_job_done(self, job_id, future):
+        """Marca como falho o job cujo processo terminou sem atualizar o status
+
+        Exceções de dentro da crew já são registradas pelo próprio worker; aqui
+        chegam também as do pool, como BrokenProcessPool quando o worker morre.
+        """
+        if future.cancelled():
+            error = "Job cancelado antes de iniciar"
+        elif future.exception() is not None:
+            error = str(future.exception()) or type(future.exception()).__name__
+        else:
+            return
+        job = self.store.get(job_id)
+        if job is not None and not job.done:
+            self.store.update(job_id, status=FAILED, error=error, finished_at=time.time())
+
+    def submit(self, interview_data, openai_api_key, max_concurrency=None):
+        """Enfileira uma nova geração de PDI e retorna o id do job"""
+        if not openai_api_key:
+            raise ValueError("OpenAI API key is required")
+
+        workspace = Workspace().create()
+        CheckpointStore(workspace.run_id, workspace.path).start(interview_data)
+        job = Job(
+            id=uuid.uuid4().hex[:12],
+            run_id=workspace.run_id,
+            status=QUEUED,
+            owner_pid=os.getpid(),
+            created_at=time.time()
+        )
+        self.store.insert(job)
+        return self._enqueue(job, openai_api_key, max_concurrency)
+
+    def resume(self, job_id, openai_api_key, max_concurrency=None):
+        """Reenfileira um job interrompido ou com falha; as tasks concluídas não são refeitas"""
+        job = self.store.get(job_id)
+        if job is None:
+            raise ValueError(f"Job não encontrado: {job_id}")
+        if not job.done:
+            return job.id
+        self.store.update(job.id, status=QUEUED, owner_pid=os.getpid(), error=None, finished_at=None)
+        return self._enqueue(job, openai_api_key, max_concurrency)
+
+    def get(self, job_id):
+        return self.store.get(job_id)
+
+
+_lock = threading.Lock()
+_queue = None
+
+
+def get_job_queue():
+    """Fila de jobs compartilhada pelas sessões do servidor"""
+    global _queue
+    with _lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
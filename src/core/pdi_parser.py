@@ -0,0 +1,263 @@
+"""
+Conversão determinística do pdi.md para o PDIConfig (pdi.json).
+
+O plano gerado pelo pdi_specialist traz as atividades em tabelas markdown
+organizadas por trimestre. O parser lê essas tabelas (e, na falta delas, os
+itens de lista com links), identifica trimestre, tipo, link e plataforma de
+cada atividade e monta o PDIConfig sem chamar o LLM. Quando o documento não
+tem a estrutura esperada (nenhuma atividade, ou uma tabela de atividades da
+qual nada pôde ser lido), `PDIParseError` sinaliza que a task deve recorrer ao
+LLM.
+"""
+import re
+from datetime import date
+from urllib.parse import urlparse
+from pydantic import ValidationError
+from src.core.text_search import normalize
+from src.models.pdi_models import AtividadeEducacional, PDIConfig, TipoAtividade
+
+MONTHS = [
+    'janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho',
+    'julho', 'agosto', 'setembro', 'outubro', 'novembro', 'dezembro'
+]
+
+PERIOD_COLUMNS = ('trimestre', 'periodo', 'mes', 'meses', 'quando', 'prazo', 'cronograma')
+ACTIVITY_COLUMNS = ('conteudo', 'atividade', 'curso', 'recurso', 'material', 'acao', 'acoes', 'trilha')
+DESCRIPTION_COLUMNS = ('objetivo', 'descricao', 'resultado', 'desafio')
+
+TYPE_KEYWORDS = [
+    (TipoAtividade.MENTORIA, ('mentoria', 'mentor', 'coaching', 'shadowing')),
+    (TipoAtividade.WORKSHOP, ('workshop', 'oficina', 'bootcamp', 'hackathon', 'palestra', 'webinar')),
+    (TipoAtividade.PROJETO, ('projeto', 'desafio pratico', 'case', 'prototipo')),
+    (TipoAtividade.LEITURA, ('livro', 'leitura', 'artigo', 'ebook', 'e-book', 'pdf', 'blog', 'paper')),
+    (TipoAtividade.CURSO, ('curso', 'certificacao', 'trilha', 'treinamento', 'aula', 'video', 'especializacao')),
+]
+
+PLATFORMS = {
+    'coursera': 'Coursera', 'udemy': 'Udemy', 'alura': 'Alura', 'youtube': 'YouTube',
+    'youtu.be': 'YouTube', 'linkedin': 'LinkedIn Learning', 'edx': 'edX', 'dio.me': 'DIO',
+    'hbr.org': 'Harvard Business Review', 'medium': 'Medium', 'amazon': 'Amazon'
+}
+
+_MD_LINK = re.compile(r'\[([^\]]+)\]\((https?://[^)\s]+)\)')
+_URL = re.compile(r'https?://[^\s)|>\]]+')
+_SEPARATOR = re.compile(r'^\|?\s*:?-{2,}:?\s*(\|\s*:?-{2,}:?\s*)*\|?$')
+_LIST_ITEM = re.compile(r'^\s*(?:[-*+]|\d+[.)])\s+(.*)$')
+
+
+class PDIParseError(ValueError):
+    """O pdi.md não tem a estrutura esperada para a conversão sem LLM"""
+
+
+def quarter_from_text(text):
+    """Trimestre (1 a 4) mencionado no texto: 'Trimestre 2', '3º trimestre', 'Q1', 'Meses 4-6', 'março'"""
+    original = text
+    text = normalize(text)
+    match = (
+        re.search(r'trimestre\s*(\d)', text)
+        or re.search(r'(\d)\s*[ºo°]?\s*trimestre', text)
+        or re.search(r'\b[qt]([1-4])\b', text)
+    )
+    if match:
+        quarter = int(match.group(1))
+        return quarter if 1 <= quarter <= 4 else None
+
+    match = re.search(r'\bm[eê]s(?:es)?\s*(\d{1,2})\b', text)
+    if match and 1 <= int(match.group(1)) <= 12:
+        return (int(match.group(1)) - 1) // 3 + 1
+
+    # Com acento, para não confundir "março" com "marco" (de progresso)
+    lowered = original.lower()
+    for index, month in enumerate(MONTHS):
+        if re.search(rf'\b{month}\b', lowered):
+            return index // 3 + 1
+    return None
+
+
+def activity_type(text):
+    text = normalize(text)
+    for tipo, keywords in TYPE_KEYWORDS:
+        if any(re.search(rf'\b{re.escape(keyword)}', text) for keyword in keywords):
+            return tipo
+    return TipoAtividade.OUTRO
+
+
+def platform_for(url):
+    if not url:
+        return None
+    host = urlparse(url).netloc.lower()
+    for key, name in PLATFORMS.items():
+        if key in host:
+            return name
+    return host.removeprefix('www.') or None
+
+
+def clean(text):
+    """Texto da célula sem links, ênfases e tags HTML"""
+    text = _MD_LINK.sub(r'\1', text)
+    text = _URL.sub('', text)
+    text = re.sub(r'<br\s*/?>', '; ', text)
+    text = re.sub(r'[*_`#]+', '', text)
+    return re.sub(r'\s+', ' ', text).strip(' -;:')
+
+
+def _cells(line):
+    return [cell.strip() for cell in line.strip().strip('|').split('|')]
+
+
+def _is_table_row(line):
+    return line.strip().startswith('|') and line.count('|') >= 2
+
+
+def _find_column(header, keywords):
+    normalized = [normalize(clean(cell)) for cell in header]
+    for keyword in keywords:
+        for index, cell in enumerate(normalized):
+            if keyword in cell:
+                return index
+    return None
+
+
+class _Builder:
+    """Acumula as atividades encontradas, com ids únicos"""
+
+    def __init__(self):
+        self.activities = []
+
+    def add(self, titulo, descricao, trimestre, context, link=None):
+        titulo = clean(titulo)
+        if not titulo or trimestre is None:
+            return
+        self.activities.append(AtividadeEducacional(
+            id=f"atividade-{len(self.activities) + 1}",
+            titulo=titulo[:200],
+            descricao=clean(descricao)[:500] or titulo,
+            trimestre=trimestre,
+            tipo=activity_type(f"{titulo} {context}"),
+            link=link,
+            plataforma=platform_for(link)
+        ))
+
+    def add_cell(self, cell, descricao, trimestre, row_text):
+        """Uma atividade por link da célula, ou uma para a célula inteira"""
+        links = _MD_LINK.findall(cell)
+        if len(links) > 1:
+            for text, url in links:
+                self.add(text, descricao, trimestre, row_text, url)
+            return
+        urls = [url for _, url in links] or _URL.findall(row_text)
+        self.add(cell, descricao, trimestre, row_text, urls[0] if urls else None)
+
+
+def _parse_table(header, rows, builder, section_quarter):
+    """Lê as atividades da tabela; levanta PDIParseError se for um cronograma sem atividades legíveis"""
+    activity_col = _find_column(header, ACTIVITY_COLUMNS)
+    period_col = _find_column(header, PERIOD_COLUMNS)
+    if activity_col is None:
+        # Tabela de metas, indicadores etc.; um cronograma por trimestre sem
+        # coluna de atividades, porém, deixaria atividades de fora do pdi.json
+        if period_col is not None and any(
+            period_col < len(cells) and quarter_from_text(cells[period_col]) for cells in rows
+        ):
+            raise PDIParseError(f"Cronograma sem coluna de atividades: {' | '.join(header)}")
+        return
+    description_cols = [
+        index for index in range(len(header))
+        if index not in (activity_col, period_col) and _find_column([header[index]], DESCRIPTION_COLUMNS) is not None
+    ]
+
+    found = len(builder.activities)
+    row_quarter = section_quarter
+    for cells in rows:
+        if activity_col >= len(cells):
+            continue
+        row_text = ' '.join(cells)
+        period = cells[period_col] if period_col is not None and period_col < len(cells) else ''
+        # Células de período vazias repetem o período da linha anterior
+        row_quarter = quarter_from_text(period) or (row_quarter if not period.strip() else None) or section_quarter
+        descricao = '; '.join(cells[index] for index in description_cols if index < len(cells) and cells[index])
+        builder.add_cell(cells[activity_col], descricao, row_quarter, row_text)
+
+    if any(cells[activity_col].strip() for cells in rows if activity_col < len(cells)) and len(builder.activities) == found:
+        raise PDIParseError(f"Nenhuma atividade com trimestre identificado na tabela: {' | '.join(header)}")
+
+
+def _find_colaborador(markdown):
+    patterns = [
+        r'(?im)^\s*[*_]*(?:colaborador(?:a)?|nome)[*_]*\s*:[*_]*\s*([^\n|]+)',
+        r'(?im)^#+\s*(?:PDI|Plano de Desenvolvimento Individual)\s*(?:de|do|da|[-–—:])\s*([^\n]+)'
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, markdown)
+        if match and clean(match.group(1)):
+            return clean(match.group(1))
+    return None
+
+
+def parse_pdi_markdown(markdown, colaborador=None):
+    """Monta o PDIConfig a partir do pdi.md; levanta PDIParseError se não houver atividades"""
+    lines = markdown.splitlines()
+    builder = _Builder()
+    section_quarter = None
+    quarter_level = None
+    list_items = []
+
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        stripped = line.strip()
+        heading = re.match(r'^(#+)\s', stripped)
+        if heading:
+            # O trimestre de um título vale até o próximo título do mesmo nível ou superior
+            level = len(heading.group(1))
+            quarter = quarter_from_text(stripped)
+            if quarter:
+                section_quarter, quarter_level = quarter, level
+            elif quarter_level is not None and level <= quarter_level:
+                section_quarter = quarter_level = None
+        elif stripped.startswith('**'):
+            section_quarter = quarter_from_text(stripped) or section_quarter
+
+        if _is_table_row(line) and index + 1 < len(lines) and _SEPARATOR.match(lines[index + 1].strip()):
+            header = _cells(line)
+            index += 2
+            rows = []
+            while index < len(lines) and _is_table_row(lines[index]):
+                rows.append(_cells(lines[index]))
+                index += 1
+            _parse_table(header, rows, builder, section_quarter)
+            continue
+
+        item = _LIST_ITEM.match(line)
+        if item and _URL.search(item.group(1)):
+            list_items.append((item.group(1), quarter_from_text(item.group(1)) or section_quarter))
+        index += 1
+
+    # Sem tabelas de atividades, usa os itens de lista com links
+    if not builder.activities:
+        for text, quarter in list_items:
+            builder.add_cell(text, text, quarter, text)
+
+    if not builder.activities:
+        raise PDIParseError("Nenhuma atividade com trimestre identificado no PDI")
+
+    year = re.search(r'\b(20\d{2})\b', markdown)
+    try:
+        return PDIConfig(
+            colaborador=colaborador or _find_colaborador(markdown) or "Colaborador",
+            periodo=year.group(1) if year else str(date.today().year),
+            atividades=builder.activities
+        )
+    except ValidationError as e:
+        raise PDIParseError(str(e)) from e
+
+
+def pdi_json_from_context(context_outputs):
+    """Executor local da task gerar_visualizacao_pdi: converte o pdi.md do contexto
+
+    O JSON sai no formato compacto de `output_content`, o mesmo cujo hash o
+    checkpoint registra, para que o pdi.json seja restaurado ao retomar.
+    """
+    if not context_outputs:
+        raise PDIParseError("Task sem o PDI no contexto")
+    return parse_pdi_markdown(context_outputs[-1].raw).model_dump_json()
@@ -0,0 +1,222 @@
+"""
+Replay de uma execução gravada para comparar configurações de roteamento.
+
+A crew é montada e executada de novo (mesmo grafo de tasks, mesmo
+escalonador), mas as chamadas ao LLM vão para um stub local: cada task
+recebe a saída gravada na execução original depois de um atraso calculado
+pelo perfil de latência do modelo que a rota escolheu (tempo até o primeiro
+token por requisição, leitura do prompt e geração dos tokens gravados). Assim
+a latência ponta a ponta de arquivos de rotas diferentes pode ser comparada
+sem chamar a API.
+
+    python -m src.core.replay RUN_ID config/models.yaml outras_rotas.yaml --speed 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from src.core import fallback_llm
+from src.core.accounting import count_tokens, estimate_cost
+from src.core.checkpoint import CheckpointStore
+from src.core.events import EVENTS_FILE, TASK_STARTED, TOKENS_USED, EventBus, read_events
+from src.core.routing import ModelRouter
+from src.core.utils import DEFAULT_AGENTS_CONFIG, DEFAULT_TASKS_CONFIG, create_crew, load_config
+from src.core.workspace import Workspace
+
+
+@dataclass(frozen=True)
+class LatencyProfile:
+    """Latência de um modelo: espera por requisição e vazão de leitura e geração"""
+    first_token: float
+    output_tokens_per_second: float
+    prompt_tokens_per_second: float = 5000.0
+
+    def delay(self, requests, prompt_tokens, completion_tokens):
+        return (requests * self.first_token
+                + prompt_tokens / self.prompt_tokens_per_second
+                + completion_tokens / self.output_tokens_per_second)
+
+
+# Valores típicos observados na API; ajuste para o seu ambiente
+LATENCY_PROFILES = {
+    'gpt-4o': LatencyProfile(first_token=0.6, output_tokens_per_second=70),
+    'gpt-4o-mini': LatencyProfile(first_token=0.4, output_tokens_per_second=110),
+}
+DEFAULT_PROFILE = LatencyProfile(first_token=0.6, output_tokens_per_second=60)
+
+
+@dataclass
+class RecordedTask:
+    output: str
+    requests: int = 1
+    completion_tokens: int = 0
+
+
+@dataclass
+class RecordedRun:
+    """Entrevista, saídas e consumo de cada task de uma execução gravada"""
+    run_id: str
+    interview_data: str
+    tasks: dict = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, run_id):
+        workspace = Workspace(run_id)
+        checkpoint = CheckpointStore(run_id, workspace.path)
+        if not checkpoint.exists():
+            raise ValueError(f"Checkpoint não encontrado para a execução {run_id}")
+        manifest = checkpoint.load()
+
+        tasks = {}
+        for name, entry in manifest['tasks'].items():
+            if 'content' in entry:
+                output = entry['content']
+            else:
+                path = Path(entry['output_file'])
+                output = path.read_text(encoding='utf-8') if path.exists() else ""
+            tasks[name] = RecordedTask(output, completion_tokens=count_tokens(output))
+
+        usage = {}
+        for event in read_events(workspace.file(EVENTS_FILE)):
+            if event.type == TOKENS_USED and event.task in tasks:
+                totals = usage.setdefault(event.task, [0, 0])
+                totals[0] += event.data.get('requests', 1)
+                totals[1] += event.data.get('completion_tokens', 0)
+        for name, (requests, completion_tokens) in usage.items():
+            tasks[name].requests = max(requests, 1)
+            tasks[name].completion_tokens = completion_tokens or tasks[name].completion_tokens
+
+        return cls(run_id, manifest['interview_data'], tasks)
+
+
+class StubResponse(dict):
+    """Resposta no formato lido pelo FallbackLLM: `["choices"]` e `.usage`"""
+
+    def __init__(self, content, prompt_tokens, completion_tokens):
+        super().__init__(choices=[{'message': {'role': 'assistant', 'content': content}}])
+        self.usage = SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                                     total_tokens=prompt_tokens + completion_tokens)
+
+
+class StubCompletion:
+    """Substitui o litellm.completion: devolve a saída gravada da task após o atraso do modelo
+
+    A task de cada chamada vem do evento TASK_STARTED, emitido na mesma
+    thread em que a task executa suas chamadas ao LLM.
+    """
+
+    def __init__(self, recorded, profiles=LATENCY_PROFILES, speed=1.0):
+        self.recorded = recorded
+        self.profiles = profiles
+        self.speed = speed
+        self.calls = []
+        self._current = threading.local()
+        self._lock = threading.Lock()
+
+    def on_event(self, event):
+        if event.type == TASK_STARTED:
+            self._current.task = event.task
+
+    def __call__(self, model, messages, **params):
+        name = getattr(self._current, 'task', None)
+        task = self.recorded.tasks.get(name) or RecordedTask("")
+        prompt_tokens = count_tokens("\n".join(str(message.get('content', '')) for message in messages), model)
+        delay = self.profiles.get(model, DEFAULT_PROFILE).delay(task.requests, prompt_tokens, task.completion_tokens)
+        time.sleep(delay / self.speed)
+        with self._lock:
+            self.calls.append((name, model, prompt_tokens, task.completion_tokens, delay))
+        return StubResponse(f"Thought: I now know the final answer\nFinal Answer: {task.output}",
+                            prompt_tokens, task.completion_tokens)
+
+
+@contextmanager
+def stubbed_completion(stub):
+    original = fallback_llm.litellm.completion
+    fallback_llm.litellm.completion = stub
+    try:
+        yield stub
+    finally:
+        fallback_llm.litellm.completion = original
+
+
+@dataclass
+class ReplayResult:
+    config: str
+    wall_time: float
+    simulated_time: float
+    critical_path: list
+    llm_time: float
+    cost: float
+    models: dict
+
+
+def replay(recorded, config_path, speed=1.0, profiles=LATENCY_PROFILES, max_concurrency=None):
+    """Executa a crew da execução gravada com as rotas de `config_path` e o LLM simulado"""
+    agents_config, tasks_config = load_config(DEFAULT_AGENTS_CONFIG, DEFAULT_TASKS_CONFIG)
+    stub = StubCompletion(recorded, profiles, speed)
+    crew_options = {'max_concurrency': max_concurrency} if max_concurrency else {}
+    api_key = os.environ.get("OPENAI_API_KEY")
+    crew = asyncio.run(create_crew(
+        agents_config, tasks_config, recorded.interview_data, openai_api_key=api_key or "replay",
+        events=EventBus([stub.on_event]), router=ModelRouter.load(config_path),
+        # A retenção apagaria execuções gravadas antigas, inclusive a reproduzida
+        cleanup=False, **crew_options
+    ))
+    try:
+        with stubbed_completion(stub):
+            started = time.perf_counter()
+            crew.kickoff()
+            wall_time = time.perf_counter() - started
+        _, path = crew.scheduler.critical_path()
+    finally:
+        # O checkpoint do replay fica no próprio workspace
+        Workspace(crew.run_id).delete()
+
+    models = {}
+    for _, model, _, _, _ in stub.calls:
+        models[model] = models.get(model, 0) + 1
+    return ReplayResult(
+        config=str(config_path),
+        wall_time=wall_time,
+        simulated_time=wall_time * speed,
+        critical_path=path,
+        llm_time=sum(call[4] for call in stub.calls),
+        cost=sum(estimate_cost(model, prompt, completion) for _, model, prompt, completion, _ in stub.calls),
+        models=models
+    )
+
+
+def report(results):
+    lines = [f"{'Rotas':<32} {'Ponta a ponta':>14} {'Soma LLM':>10} {'Custo':>9}  Modelos"]
+    for result in results:
+        models = ", ".join(f"{model} x{count}" for model, count in sorted(result.models.items()))
+        lines.append(
+            f"{Path(result.config).name:<32} {result.simulated_time:>13.1f}s {result.llm_time:>9.1f}s "
+            f"${result.cost:>8.4f}  {models}"
+        )
+        lines.append(f"  caminho crítico: {' -> '.join(result.critical_path)}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara a latência ponta a ponta de configurações de roteamento")
+    parser.add_argument('run_id', help="Execução gravada (workspace em output/runs)")
+    parser.add_argument('configs', nargs='+', help="Arquivos de rotas (formato de config/models.yaml)")
+    parser.add_argument('--speed', type=float, default=10.0, help="Fator de aceleração dos atrasos simulados")
+    parser.add_argument('--max-concurrency', type=int, help="Limite de tasks em paralelo")
+    args = parser.parse_args(argv)
+
+    recorded = RecordedRun.load(args.run_id)
+    results = [replay(recorded, config, args.speed, max_concurrency=args.max_concurrency) for config in args.configs]
+    print(report(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
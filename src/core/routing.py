@@ -0,0 +1,89 @@
+"""
+Roteamento de modelos por agent, task e assistente (config/models.yaml).
+
+Tasks leves, como ler o catálogo ou converter o PDI em JSON, podem rodar em
+modelos mais baratos e rápidos. Cada rota gera um FallbackLLM, que tenta os
+modelos de `fallbacks` em ordem quando o principal falha ou estoura o timeout
+(src/core/fallback_llm.py, importado só quando o LLM é criado).
+"""
+import os
+import threading
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import List, Optional
+import yaml
+
+CONFIG_DIR = Path(__file__).resolve().parent.parent.parent / 'config'
+MODELS_CONFIG = Path(os.getenv("PDI_MODELS_CONFIG", CONFIG_DIR / 'models.yaml'))
+DEFAULT_MODEL = "gpt-4o"
+
+
+@dataclass
+class ModelRoute:
+    """Modelo e parâmetros de geração de um agent, task ou assistente"""
+    model: str = DEFAULT_MODEL
+    temperature: Optional[float] = None
+    max_tokens: Optional[int] = None
+    timeout: Optional[float] = None
+    fallbacks: List[str] = field(default_factory=list)
+
+    def merged(self, overrides):
+        """Nova rota com os campos de `overrides` sobre os desta"""
+        known = {key: value for key, value in (overrides or {}).items() if key in self.__dataclass_fields__}
+        return replace(self, **known)
+
+    def llm(self):
+        params = {
+            'temperature': self.temperature,
+            'max_tokens': self.max_tokens,
+            'timeout': self.timeout
+        }
+        params = {key: value for key, value in params.items() if value is not None}
+        fallbacks = [model for model in self.fallbacks if model != self.model]
+        # O crewAI e o litellm só são carregados por quem cria o LLM (a crew)
+        from src.core.fallback_llm import FallbackLLM
+        return FallbackLLM(self.model, fallbacks, **params)
+
+
+class ModelRouter:
+    """Resolve as rotas de config/models.yaml"""
+
+    def __init__(self, config=None):
+        config = config or {}
+        self.defaults = ModelRoute().merged(config.get('defaults'))
+        self.agents = config.get('agents') or {}
+        self.tasks = config.get('tasks') or {}
+        self.assistants = config.get('assistants') or {}
+
+    @classmethod
+    def load(cls, path=MODELS_CONFIG):
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(yaml.safe_load(f))
+
+    def agent_route(self, agent_name):
+        return self.defaults.merged(self.agents.get(agent_name))
+
+    def task_route(self, task_name):
+        """Rota específica da task ou None se a task usa a rota do agent"""
+        if task_name not in self.tasks:
+            return None
+        return self.defaults.merged(self.tasks[task_name])
+
+    def assistant_model(self, assistant_name):
+        return self.defaults.merged(self.assistants.get(assistant_name)).model
+
+
+_lock = threading.Lock()
+_router = None
+
+
+def get_router():
+    """Roteador carregado uma vez por processo"""
+    global _router
+    with _lock:
+        if _router is None:
+            _router = ModelRouter.load()
+        return _router
@@ -0,0 +1,286 @@
+"""
+Escalonador das tasks da crew baseado no grafo de dependências.
+
+O grafo é montado a partir da lista `context` de cada task. Tasks sem
+dependências pendentes são executadas em paralelo (até o limite de
+concorrência configurado) e cada task só começa quando todas as tasks do seu
+contexto terminaram.
+"""
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from crewai.utilities.formatter import aggregate_raw_outputs_from_task_outputs
+from src.core.accounting import count_tokens
+from src.core.events import TASK_FAILED, TASK_FINISHED, TASK_STARTED, TOKENS_USED, TOOL_CALLED
+from src.core.fallback_llm import thread_usage
+from src.core.task_cache import rebuild_task_output, task_cache_key, write_output_file
+from src.tools.search_cache import get_search_cache
+
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("PDI_MAX_CONCURRENCY", "4"))
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TaskTiming:
+    """Tempo de parede de uma task"""
+    name: str
+    started_at: float
+    finished_at: float
+
+    @property
+    def duration(self):
+        return self.finished_at - self.started_at
+
+
+def task_name(task):
+    """Nome usado para identificar a task em logs e relatórios"""
+    return task.name or task.description[:40]
+
+
+def build_dependencies(tasks):
+    """Retorna, para cada task, os índices das tasks do seu contexto"""
+    positions = {id(task): index for index, task in enumerate(tasks)}
+    dependencies = {}
+    for index, task in enumerate(tasks):
+        context = task.context if isinstance(task.context, list) else []
+        dependencies[index] = [positions[id(dep)] for dep in context if id(dep) in positions]
+    return dependencies
+
+
+class DAGScheduler:
+    """Executa tasks respeitando as dependências declaradas nos contexts"""
+
+    def __init__(self, tasks, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        self.tasks = tasks
+        self.max_concurrency = max(1, max_concurrency)
+        self.dependencies = build_dependencies(tasks)
+        self.outputs = {}
+        self.timings = {}
+
+    def _ready(self, done, submitted):
+        return [
+            index for index in range(len(self.tasks))
+            if index not in submitted and all(dep in done for dep in self.dependencies[index])
+        ]
+
+    def _run_one(self, index, execute):
+        task = self.tasks[index]
+        context = [self.outputs[dep] for dep in self.dependencies[index]]
+        started_at = time.perf_counter()
+        output = execute(task, context)
+        self.timings[task_name(task)] = TaskTiming(task_name(task), started_at, time.perf_counter())
+        return output
+
+    def run(self, execute, completed=None):
+        """Executa todas as tasks; `execute(task, context_outputs)` roda uma task
+
+        `completed` mapeia índices de tasks já concluídas para suas saídas,
+        que são reaproveitadas sem nova execução.
+        """
+        self.outputs.update(completed or {})
+        done = set(self.outputs)
+        submitted = set(self.outputs)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            while len(done) < len(self.tasks):
+                # Só submete o que cabe no pool: nada fica na fila do executor, então
+                # depois de uma falha nenhuma task nova começa
+                for index in self._ready(done, submitted)[:self.max_concurrency - len(running)]:
+                    submitted.add(index)
+                    running[executor.submit(self._run_one, index, execute)] = index
+
+                if not running:
+                    raise ValueError("Dependências cíclicas entre as tasks da crew")
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index = running.pop(future)
+                    # Propaga a falha; só as tasks já em execução terminam no shutdown
+                    self.outputs[index] = future.result()
+                    done.add(index)
+
+        return [self.outputs[index] for index in range(len(self.tasks))]
+
+    def critical_path(self):
+        """Retorna (duração, nomes) do caminho mais longo do grafo"""
+        best = {}
+        for index in range(len(self.tasks)):
+            timing = self.timings.get(task_name(self.tasks[index]))
+            duration = timing.duration if timing else 0.0
+            previous = max((best[dep] for dep in self.dependencies[index]), default=(0.0, []), key=lambda item: item[0])
+            best[index] = (previous[0] + duration, previous[1] + [task_name(self.tasks[index])])
+        return max(best.values(), default=(0.0, []), key=lambda item: item[0])
+
+
+class ParallelCrew:
+    """Crew executada pelo DAGScheduler em vez do processo sequencial do CrewAI"""
+
+    def __init__(self, crew, max_concurrency=DEFAULT_MAX_CONCURRENCY, cache=None, checkpoint=None, events=None,
+                 router=None, local_executors=None):
+        self.crew = crew
+        self.scheduler = DAGScheduler(crew.tasks, max_concurrency)
+        self.cache = cache
+        self.checkpoint = checkpoint
+        self.events = events
+        self.router = router
+        # Tasks determinísticas: nome -> fn(context_outputs) com o conteúdo da saída,
+        # ou ValueError para recorrer ao LLM
+        self.local_executors = local_executors or {}
+        self.outputs = []
+        # Task.execute_sync troca task.agent pelo agent usado, então o
+        # compartilhamento precisa ser calculado antes da execução
+        agent_use = {}
+        for task in crew.tasks:
+            agent_use[id(task.agent)] = agent_use.get(id(task.agent), 0) + 1
+        self._shared_agent = {id(task): agent_use[id(task.agent)] > 1 for task in crew.tasks}
+
+    @property
+    def tasks(self):
+        return self.crew.tasks
+
+    @property
+    def agents(self):
+        return self.crew.agents
+
+    def _agent_for(self, task):
+        """Tasks do mesmo agent rodam em paralelo, então cada uma recebe sua cópia
+
+        Tasks com rota própria no roteador de modelos usam o LLM dessa rota.
+        """
+        agent = task.agent.copy() if self._shared_agent[id(task)] else task.agent
+        agent.crew = self.crew
+        route = self.router.task_route(task.name) if self.router is not None else None
+        if route is not None:
+            agent.llm = route.llm()
+        return agent
+
+    def _emit(self, event_type, task, **data):
+        if self.events is not None:
+            self.events.emit(event_type, task.name, **data)
+
+    def _on_step(self, task, step):
+        """step_callback do agent: registra as chamadas de ferramentas"""
+        if getattr(step, 'tool', None):
+            self._emit(TOOL_CALLED, task, tool=step.tool, tool_input=str(step.tool_input)[:500])
+
+    def _emit_usage(self, task, agent, usage_before, latency, context, output):
+        """Tokens consumidos pela task; estimados com tiktoken se a API não informar o uso
+
+        O uso vem das respostas das chamadas feitas pelo FallbackLLM na thread
+        da task, e não do `_token_process` do agent, alimentado pelos callbacks
+        globais do litellm e portanto misturado entre tasks paralelas.
+        """
+        usage = thread_usage() - usage_before
+        model = usage.model or getattr(agent.llm, 'model', None)
+        prompt_tokens = usage.prompt_tokens
+        completion_tokens = usage.completion_tokens
+        estimated = usage.total_tokens == 0
+        if estimated:
+            prompt_tokens = count_tokens(task.prompt() + (context or ""), model)
+            completion_tokens = count_tokens(output.raw, model)
+        self._emit(
+            TOKENS_USED,
+            task,
+            agent=agent.role.strip(),
+            model=model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            requests=max(usage.requests, 1),
+            latency=latency,
+            estimated=estimated,
+            run_id=self.run_id
+        )
+
+    def _execute_locally(self, task, context_outputs):
+        """Saída da task calculada sem LLM, ou None se não houver executor ou ele falhar"""
+        executor = self.local_executors.get(task.name)
+        if executor is None:
+            return None
+        try:
+            content = executor(context_outputs)
+        except ValueError as e:
+            logger.warning("Task %s recorre ao LLM: %s", task.name, e)
+            return None
+        output = rebuild_task_output(task, content)
+        write_output_file(task, content)
+        return output
+
+    def _execute_task(self, task, context_outputs):
+        agent = self._agent_for(task)
+        agent.step_callback = lambda step: self._on_step(task, step)
+        self._emit(TASK_STARTED, task, agent=agent.role.strip())
+        started_at = time.time()
+
+        try:
+            output = self._execute_locally(task, context_outputs)
+            local = output is not None
+            if output is None and self.cache is not None:
+                key = task_cache_key(task, agent, context_outputs)
+                output = self.cache.load(key, task)
+            cached = output is not None and not local
+
+            if output is None:
+                usage_before = thread_usage()
+                llm_started_at = time.time()
+                context = aggregate_raw_outputs_from_task_outputs(context_outputs) if context_outputs else None
+                output = task.execute_sync(agent=agent, context=context, tools=task.tools or agent.tools)
+                self._emit_usage(task, agent, usage_before, time.time() - llm_started_at, context, output)
+                if self.cache is not None:
+                    self.cache.save(key, output)
+        except Exception as e:
+            self._emit(TASK_FAILED, task, duration=time.time() - started_at, error=str(e))
+            raise
+
+        if self.checkpoint is not None:
+            self.checkpoint.record(task, output)
+        self._emit(TASK_FINISHED, task, duration=time.time() - started_at, cached=cached, local=local)
+        return output
+
+    @property
+    def run_id(self):
+        return self.checkpoint.run_id if self.checkpoint is not None else None
+
+    def kickoff(self):
+        """Executa a crew e retorna a saída da última task
+
+        Com checkpoint, tasks já concluídas nesta execução são reaproveitadas.
+        """
+        completed = {}
+        if self.checkpoint is not None:
+            restored = self.checkpoint.restore(self.crew.tasks)
+            completed = {
+                index: restored[task.name]
+                for index, task in enumerate(self.crew.tasks)
+                if task.name in restored
+            }
+            for index in completed:
+                self._emit(TASK_FINISHED, self.crew.tasks[index], duration=0.0, cached=True, restored=True)
+        self.outputs = self.scheduler.run(self._execute_task, completed)
+        return self.outputs[-1]
+
+    @property
+    def timings(self):
+        return self.scheduler.timings
+
+    def timing_report(self):
+        """Resumo textual dos tempos por task e do caminho crítico"""
+        lines = [
+            f"{timing.name}: {timing.duration:.1f}s"
+            for timing in sorted(self.timings.values(), key=lambda timing: timing.started_at)
+        ]
+        total, path = self.scheduler.critical_path()
+        lines.append(f"Caminho crítico ({total:.1f}s): {' -> '.join(path)}")
+        if self.cache is not None:
+            stats = self.cache.stats()
+            lines.append(f"Cache de tasks: {stats['hits']} hits, {stats['misses']} misses")
+        search_stats = get_search_cache().stats()
+        if search_stats['hits'] or search_stats['misses']:
+            lines.append(
+                f"Cache de buscas: {search_stats['hits']} hits, {search_stats['misses']} misses, "
+                f"{search_stats['coalesced']} coalescidas ({search_stats['hit_rate']:.0%})"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,35 @@
+"""
+Divisão de documentos markdown em seções pelos títulos.
+"""
+import re
+from dataclasses import dataclass
+
+_HEADING = re.compile(r'^(#{1,6})\s+(.+?)\s*#*\s*$')
+_FENCE = re.compile(r'^\s*(```|~~~)')
+
+
+@dataclass(frozen=True)
+class Section:
+    """Trecho do documento iniciado por um título"""
+    title: str
+    level: int
+    content: str
+
+
+def parse_sections(markdown, max_level=2, default_title="Introdução"):
+    """Divide o markdown nos títulos até `max_level`, ignorando blocos de código"""
+    sections = []
+    title, level, lines = default_title, 0, []  # nível 0: texto antes do primeiro título
+    in_code = False
+    for line in markdown.splitlines():
+        if _FENCE.match(line):
+            in_code = not in_code
+        heading = None if in_code else _HEADING.match(line)
+        if heading and len(heading.group(1)) <= max_level:
+            if ''.join(lines).strip():
+                sections.append(Section(title, level, "\n".join(lines)))
+            title, level, lines = heading.group(2).strip('*_ '), len(heading.group(1)), []
+        lines.append(line)
+    if ''.join(lines).strip() or not sections:
+        sections.append(Section(title, level, "\n".join(lines)))
+    return sections
@@ -0,0 +1,95 @@
+"""
+Cache endereçado por conteúdo das saídas das tasks da crew.
+
+A chave é o hash da configuração do agent, da descrição da task, das saídas
+do contexto e do modelo. Uma task sem mudanças nessas entradas devolve a
+saída armazenada sem chamar o LLM, e uma execução retomada só recalcula o que
+está a jusante do que mudou.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from src.core.sqlite_cache import SQLiteCache
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+CACHE_FILE = Path(os.getenv("PDI_TASK_CACHE", PROJECT_ROOT / ".cache" / "task_outputs.sqlite"))
+
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 500
+
+
+def agent_model(agent):
+    """Nome do modelo usado pelo agent"""
+    return getattr(agent.llm, 'model', None) or str(agent.llm)
+
+
+def task_cache_key(task, agent, context_outputs):
+    """Hash das entradas que determinam a saída da task"""
+    payload = {
+        'agent': {
+            'role': agent.role,
+            'goal': agent.goal,
+            'backstory': agent.backstory
+        },
+        'model': agent_model(agent),
+        'description': task.description,
+        'expected_output': task.expected_output,
+        'output_pydantic': task.output_pydantic.__name__ if task.output_pydantic else None,
+        'context': [output.raw for output in context_outputs]
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def rebuild_task_output(task, content):
+    """Reconstrói o TaskOutput de uma task a partir do conteúdo salvo"""
+    # Import tardio: o checkpoint (e, por ele, a fila de jobs da interface)
+    # importa este módulo sem precisar do crewAI
+    from crewai.tasks.task_output import TaskOutput
+    pydantic_output = task.output_pydantic.model_validate_json(content) if task.output_pydantic else None
+    output = TaskOutput(
+        name=task.name,
+        description=task.description,
+        expected_output=task.expected_output,
+        raw=content,
+        pydantic=pydantic_output,
+        agent=task.agent.role,
+        output_format=task._get_output_format()
+    )
+    task.output = output
+    return output
+
+
+def write_output_file(task, content):
+    """Grava o conteúdo no output_file da task, como o crewAI faria"""
+    if task.output_file:
+        output_path = Path(task.output_file)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(content, encoding='utf-8')
+
+
+def output_content(output):
+    """Conteúdo da saída no mesmo formato gravado no output_file"""
+    return output.pydantic.model_dump_json() if output.pydantic else output.raw
+
+
+class TaskCache(SQLiteCache):
+    """Cache de saídas de tasks persistido em SQLite"""
+
+    def __init__(self, path=CACHE_FILE, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        super().__init__(path, ttl=ttl, max_entries=max_entries)
+
+    def load(self, key, task):
+        """Reconstrói o TaskOutput armazenado e regrava o output_file da task"""
+        content = self.get(key)
+        if content is None:
+            return None
+
+        output = rebuild_task_output(task, content)
+        write_output_file(task, content)
+        return output
+
+    def save(self, key, output):
+        """Armazena a saída no mesmo formato gravado no output_file"""
+        self.set(key, output_content(output))
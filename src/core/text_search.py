@@ -0,0 +1,80 @@
+"""
+Busca textual em memória com ranking BM25.
+"""
+import heapq
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Palavras muito frequentes em português que não ajudam no ranking
+STOPWORDS = {
+    'a', 'o', 'as', 'os', 'de', 'da', 'do', 'das', 'dos', 'e', 'em', 'no', 'na',
+    'nos', 'nas', 'um', 'uma', 'para', 'por', 'com', 'sobre', 'que', 'se', 'ao',
+    'aos', 'como', 'ou', 'the', 'and', 'of', 'to', 'in', 'for'
+}
+
+
+def normalize(text):
+    """Minúsculas e sem acentos, para comparar termos e valores de filtros"""
+    decomposed = unicodedata.normalize('NFKD', str(text).lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text):
+    """Quebra o texto em termos normalizados, descartando stopwords"""
+    return [token for token in _TOKEN_RE.findall(normalize(text)) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """Índice invertido com ranking BM25 sobre documentos identificados por posição"""
+
+    def __init__(self, documents=(), k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(list)
+        self.doc_lengths = []
+        self._total_length = 0
+        for document in documents:
+            self.add(document)
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def add(self, document):
+        """Indexa um documento e retorna seu id"""
+        doc_id = len(self.doc_lengths)
+        terms = Counter(tokenize(document))
+        for term, frequency in terms.items():
+            self.postings[term].append((doc_id, frequency))
+        length = sum(terms.values())
+        self.doc_lengths.append(length)
+        self._total_length += length
+        return doc_id
+
+    def _idf(self, term):
+        n = len(self.postings.get(term, ()))
+        return math.log(1 + (len(self) - n + 0.5) / (n + 0.5))
+
+    def search(self, query, top_k=10, candidates=None):
+        """Retorna [(doc_id, score)] dos documentos mais relevantes
+
+        `candidates` restringe a busca a um conjunto de ids (ex.: filtros).
+        """
+        if not len(self):
+            return []
+        average_length = self._total_length / len(self) or 1.0
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf(term)
+            for doc_id, frequency in postings:
+                if candidates is not None and doc_id not in candidates:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / average_length)
+                scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
@@ -4,9 +4,21 @@ import os
 from pathlib import Path
 from crewai import Agent, Task, Crew, Process
 from src.tools.educational_content_tool import ReadEducationalDBTool
+from src.tools.semantic_search_tool import SemanticCatalogSearchTool
 from src.tools.serper_search_tool import SerperSearchTool
 from src.tools.exa_search_tool import ExaSearchTool
 from src.models.pdi_models import PDIConfig
+from src.core.scheduler import DEFAULT_MAX_CONCURRENCY, ParallelCrew
+from src.core.task_cache import TaskCache
+from src.core.checkpoint import CheckpointStore
+from src.core.workspace import Workspace, cleanup_workspaces
+from src.core.events import EVENTS_FILE, EventBus, JSONLSink
+from src.core.routing import get_router
+from src.core.pdi_parser import pdi_json_from_context
+
+CONFIG_DIR = Path(__file__).resolve().parent.parent.parent / 'config'
+DEFAULT_AGENTS_CONFIG = CONFIG_DIR / 'agents.yaml'
+DEFAULT_TASKS_CONFIG = CONFIG_DIR / 'tasks.yaml'
 
 def load_config(agents_file, tasks_file):
     """Carrega as configurações dos arquivos YAML"""
@@ -18,16 +30,23 @@ def load_config(agents_file, tasks_file):
     
     return agents_config, tasks_config
 
-def create_agents(agents_config):
-    """Cria e retorna os agents individualmente configurados"""
+def create_agents(agents_config, router=None):
+    """Cria e retorna os agents individualmente configurados
+
+    O modelo de cada agent vem da rota configurada em config/models.yaml.
+    """
+    router = router or get_router()
+
     # Initialize tools
     educational_db_tool = ReadEducationalDBTool()
+    semantic_catalog_tool = SemanticCatalogSearchTool()
     serper_tool = SerperSearchTool()
     search_tool = ExaSearchTool()
     
     # Creating Agents
     leitor_de_planilha = Agent(
         config=agents_config['leitor_de_planilha'],
+        llm=router.agent_route('leitor_de_planilha').llm(),
         verbose=True,
         tools=[educational_db_tool],
         cache=True
@@ -35,6 +54,7 @@ def create_agents(agents_config):
 
     analista_de_perfis = Agent(
         config=agents_config['analista_de_perfis'],
+        llm=router.agent_route('analista_de_perfis').llm(),
         verbose=True,
         tools=[],
         cache=True
@@ -42,19 +62,22 @@ def create_agents(agents_config):
 
     analista_conteudo_educacional = Agent(
         config=agents_config['analista_conteudo_educacional'],
+        llm=router.agent_route('analista_conteudo_educacional').llm(),
         verbose=True,
-        tools=[],
+        tools=[semantic_catalog_tool],
         cache=True
     )
 
     pdi_specialist = Agent(
         config=agents_config['pdi_specialist'],
+        llm=router.agent_route('pdi_specialist').llm(),
         verbose=True,
         cache=True
     )
 
     final_writer = Agent(
         config=agents_config['final_writer'],
+        llm=router.agent_route('final_writer').llm(),
         verbose=True,
         tools=[],
         cache=True
@@ -62,6 +85,7 @@ def create_agents(agents_config):
 
     professional_development_researcher = Agent(
         config=agents_config['professional_development_researcher'],
+        llm=router.agent_route('professional_development_researcher').llm(),
         verbose=True,
         tools=[search_tool],
         cache=True
@@ -69,6 +93,7 @@ def create_agents(agents_config):
 
     content_organizer = Agent(
         config=agents_config['content_organizer'],
+        llm=router.agent_route('content_organizer').llm(),
         verbose=True,
         tools=[],
         cache=True
@@ -84,11 +109,20 @@ def create_agents(agents_config):
         'content_organizer': content_organizer
     }
 
-def create_tasks(tasks_config, agents, interview_data=None):
-    """Cria e retorna as tasks individualmente configuradas"""
+def create_tasks(tasks_config, agents, interview_data=None, workspace=None):
+    """Cria e retorna as tasks individualmente configuradas
+
+    Os arquivos de saída são gravados no `workspace` da execução ou, sem ele,
+    no diretório `output`.
+    """
+    def output_file(filename):
+        if workspace is None:
+            return f'output/{filename}'
+        return workspace.output_file(filename)
+
     # Interpola os dados da entrevista nas descrições das tasks
     if interview_data:
-        for task_name in ['analise_subjetiva_colaborador', 'recomendacao_conteudos',
+        for task_name in ['analise_subjetiva_colaborador', 'ler_planilha', 'recomendacao_conteudos',
                          'technical_skills_research', 'behavioral_skills_research',
                          'industry_trends_and_inspiration_research']:
             if task_name in tasks_config:
@@ -99,48 +133,55 @@ def create_tasks(tasks_config, agents, interview_data=None):
 
     # Creating Tasks
     ler_planilha = Task(
+        name='ler_planilha',
         config=tasks_config['ler_planilha'],
         agent=agents['leitor_de_planilha']
     )
 
     analise_subjetiva_colaborador = Task(
+        name='analise_subjetiva_colaborador',
         config=tasks_config['analise_subjetiva_colaborador'],
         agent=agents['analista_de_perfis'],
         context=[],  # Recebe apenas dados da entrevista via interpolação
-        output_file='output/analise_perfil.md',
+        output_file=output_file('analise_perfil.md'),
         async_execution=True
     )
 
     recomendacao_conteudos = Task(
+        name='recomendacao_conteudos',
         config=tasks_config['recomendacao_conteudos'],
         agent=agents['analista_conteudo_educacional'],
         context=[ler_planilha],
-        output_file='output/recomendacoes.md',
+        output_file=output_file('recomendacoes.md'),
         async_execution=True
     )
 
     technical_skills_research = Task(
+        name='technical_skills_research',
         config=tasks_config['technical_skills_research'],
         agent=agents['professional_development_researcher'],
-        output_file='output/technical_skills.md',
+        output_file=output_file('technical_skills.md'),
         async_execution=True
     )
 
     behavioral_skills_research = Task(
+        name='behavioral_skills_research',
         config=tasks_config['behavioral_skills_research'],
         agent=agents['professional_development_researcher'],
-        output_file='output/behavioral_skills.md',
+        output_file=output_file('behavioral_skills.md'),
         async_execution=True
     )
 
     industry_trends_research = Task(
+        name='industry_trends_and_inspiration_research',
         config=tasks_config['industry_trends_and_inspiration_research'],
         agent=agents['professional_development_researcher'],
-        output_file='output/industry_trends.md',
+        output_file=output_file('industry_trends.md'),
         async_execution=True
     )
 
     aggregate_and_structure_research = Task(
+        name='aggregate_and_structure_research',
         config=tasks_config['aggregate_and_structure_research'],
         agent=agents['content_organizer'],
         context=[
@@ -148,25 +189,27 @@ def create_tasks(tasks_config, agents, interview_data=None):
             behavioral_skills_research, 
             industry_trends_research
         ],
-        output_file='output/aggregated_research.md'
+        output_file=output_file('aggregated_research.md')
     )
 
     planejamento_estruturado_de_desenvolvimento_individual = Task(
+        name='planejamento_estruturado_de_desenvolvimento_individual',
         config=tasks_config['planejamento_estruturado_de_desenvolvimento_individual'],
         agent=agents['pdi_specialist'],
         context=[
             analise_subjetiva_colaborador,
             aggregate_and_structure_research
         ],
-        output_file='output/pdi.md'
+        output_file=output_file('pdi.md')
     )
 
     gerar_visualizacao = Task(
+        name='gerar_visualizacao_pdi',
         description=tasks_config['gerar_visualizacao_pdi']['description'],
         expected_output=tasks_config['gerar_visualizacao_pdi']['expected_output'],
         agent=agents['pdi_specialist'],
         output_pydantic=PDIConfig,
-        output_file='output/pdi.json',
+        output_file=output_file('pdi.json'),
         context=[
             planejamento_estruturado_de_desenvolvimento_individual
         ]
@@ -175,6 +218,7 @@ def create_tasks(tasks_config, agents, interview_data=None):
 
 
     generate_final_summary = Task(
+        name='generate_final_summary',
         config=tasks_config['generate_final_summary'],
         agent=agents['final_writer'],
         context=[
@@ -183,7 +227,7 @@ def create_tasks(tasks_config, agents, interview_data=None):
             planejamento_estruturado_de_desenvolvimento_individual,
             aggregate_and_structure_research
         ],
-        output_file='output/final_summary.md'
+        output_file=output_file('final_summary.md')
     )
     
     return [
@@ -199,21 +243,46 @@ def create_tasks(tasks_config, agents, interview_data=None):
         generate_final_summary
     ]
 
-async def create_crew(agents_config, tasks_config, interview_data=None, openai_api_key=None):
-    """Cria e retorna a crew com agents e tasks configurados"""
+async def create_crew(agents_config, tasks_config, interview_data=None, openai_api_key=None,
+                      max_concurrency=DEFAULT_MAX_CONCURRENCY, use_cache=False, run_id=None, events=None,
+                      router=None, cleanup=True):
+    """Cria e retorna a crew com agents e tasks configurados
+
+    As tasks são executadas pelo DAGScheduler: ramos independentes rodam em
+    paralelo, limitados por `max_concurrency`. Com `use_cache=True`, saídas de
+    tasks com as mesmas entradas são reaproveitadas do cache em SQLite.
+
+    Os arquivos da execução ficam em um workspace próprio (`Workspace(crew.run_id)`),
+    junto com o checkpoint que permite retomá-la com `resume_crew`. Workspaces
+    antigos são removidos conforme a política de retenção, exceto com
+    `cleanup=False`.
+
+    Os eventos de execução (início e fim das tasks, ferramentas, tokens) são
+    publicados em `events` e gravados em `events.jsonl` no workspace.
+
+    O pdi.json é montado pelo pdi_parser a partir do pdi.md, sem chamar o LLM;
+    a task gerar_visualizacao_pdi só usa o agent quando o parser falha.
+
+    `router` substitui as rotas de config/models.yaml (ex.: no replay).
+    """
     if not openai_api_key:
         raise ValueError("OpenAI API key is required")
     
     os.environ["OPENAI_API_KEY"] = openai_api_key
     
     # Create agents and tasks
-    agents = create_agents(agents_config)
-    tasks = create_tasks(tasks_config, agents, interview_data)
+    workspace = Workspace(run_id).create()
+    if cleanup:
+        cleanup_workspaces(keep={workspace.run_id})
+
+    router = router or get_router()
+    agents = create_agents(agents_config, router)
+    tasks = create_tasks(tasks_config, agents, interview_data, workspace)
     
     # Get list of agents
     agent_list = list(agents.values())
     
-    # Create and return crew
+    # Create crew
     crew = Crew(
         agents=agent_list,
         tasks=tasks,
@@ -221,4 +290,35 @@ async def create_crew(agents_config, tasks_config, interview_data=None, openai_a
         process=Process.sequential
     )
     
-    return crew
+    cache = TaskCache() if use_cache else None
+    checkpoint = CheckpointStore(workspace.run_id, workspace.path)
+    checkpoint.start(interview_data)
+    events = events or EventBus()
+    events.subscribe(JSONLSink(workspace.file(EVENTS_FILE)))
+    return ParallelCrew(
+        crew,
+        max_concurrency=max_concurrency,
+        cache=cache,
+        checkpoint=checkpoint,
+        events=events,
+        router=router,
+        local_executors={'gerar_visualizacao_pdi': pdi_json_from_context}
+    )
+
+async def resume_crew(run_id, openai_api_key=None, agents_config=None, tasks_config=None, **crew_options):
+    """Recria a crew de uma execução interrompida; o kickoff executa apenas as tasks pendentes"""
+    checkpoint = CheckpointStore(run_id, Workspace(run_id).path)
+    if not checkpoint.exists():
+        raise ValueError(f"Checkpoint não encontrado para a execução {run_id}")
+
+    if agents_config is None or tasks_config is None:
+        agents_config, tasks_config = load_config(DEFAULT_AGENTS_CONFIG, DEFAULT_TASKS_CONFIG)
+
+    return await create_crew(
+        agents_config,
+        tasks_config,
+        checkpoint.load()['interview_data'],
+        openai_api_key=openai_api_key or os.getenv("OPENAI_API_KEY"),
+        run_id=run_id,
+        **crew_options
+    )
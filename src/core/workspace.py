@@ -0,0 +1,101 @@
+"""
+Workspaces isolados por execução da crew.
+
+Cada execução (run_id) grava seus documentos, o pdi.json e o checkpoint em
+`output/runs/<run_id>`, de modo que várias gerações de PDI simultâneas no
+mesmo servidor não sobrescrevem os arquivos umas das outras. Workspaces sem
+uso há mais de PDI_WORKSPACE_TTL_HOURS, ou além dos PDI_MAX_WORKSPACES mais
+recentes, são removidos por `cleanup_workspaces`.
+"""
+import os
+import re
+import shutil
+import time
+import uuid
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+WORKSPACES_DIR = Path(os.getenv("PDI_WORKSPACES_DIR", PROJECT_ROOT / "output" / "runs"))
+DEFAULT_TTL = float(os.getenv("PDI_WORKSPACE_TTL_HOURS", "72")) * 3600
+DEFAULT_MAX_WORKSPACES = int(os.getenv("PDI_MAX_WORKSPACES", "100"))
+
+RUN_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+class Workspace:
+    """Diretório com os arquivos de uma execução"""
+
+    def __init__(self, run_id=None, root=WORKSPACES_DIR):
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        if not RUN_ID_PATTERN.match(self.run_id):
+            raise ValueError(f"run_id inválido: {self.run_id}")
+        self.root = Path(root)
+        self.path = self.root / self.run_id
+
+    def create(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.touch()
+        return self
+
+    def exists(self):
+        return self.path.is_dir()
+
+    def file(self, filename):
+        return self.path / filename
+
+    def output_file(self, filename):
+        """Caminho para o `output_file` das tasks
+
+        O crewAI remove a barra inicial de caminhos absolutos, então o caminho
+        é passado relativo ao diretório atual.
+        """
+        return os.path.relpath(self.file(filename))
+
+    def documents(self, pattern="*.md"):
+        if not self.exists():
+            return []
+        return sorted(self.path.glob(pattern))
+
+    def touch(self):
+        """Marca o workspace como em uso, adiando sua remoção"""
+        if self.exists():
+            os.utime(self.path)
+
+    def last_used(self):
+        """Última escrita ou acesso registrado no workspace"""
+        mtimes = [self.path.stat().st_mtime]
+        mtimes.extend(entry.stat().st_mtime for entry in self.path.iterdir() if entry.is_file())
+        return max(mtimes)
+
+    def delete(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def cleanup_workspaces(root=WORKSPACES_DIR, ttl=DEFAULT_TTL, max_workspaces=DEFAULT_MAX_WORKSPACES, keep=()):
+    """Remove workspaces expirados ou excedentes e retorna os run_ids removidos
+
+    Os run_ids em `keep` nunca são removidos.
+    """
+    root = Path(root)
+    if not root.is_dir():
+        return []
+
+    workspaces = []
+    for path in root.iterdir():
+        if path.is_dir() and RUN_ID_PATTERN.match(path.name):
+            workspace = Workspace(path.name, root)
+            try:
+                workspaces.append((workspace.last_used(), workspace))
+            except FileNotFoundError:
+                continue  # removido por outro processo
+    workspaces.sort(key=lambda item: item[0], reverse=True)
+
+    now = time.time()
+    removed = []
+    for position, (last_used, workspace) in enumerate(workspaces):
+        if workspace.run_id in keep:
+            continue
+        if now - last_used > ttl or position >= max_workspaces:
+            workspace.delete()
+            removed.append(workspace.run_id)
+    return removed
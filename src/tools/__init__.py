@@ -1,3 +1,10 @@
-from .interview_tool import CompleteInterviewTool
-
 __all__ = ['CompleteInterviewTool']
+
+
+def __getattr__(name):
+    # Importada sob demanda: o crewAI não é carregado por quem usa só os
+    # outros módulos do pacote (ex.: o índice do catálogo na interface)
+    if name == 'CompleteInterviewTool':
+        from .interview_tool import CompleteInterviewTool
+        return CompleteInterviewTool
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,86 @@
+"""
+Índice em memória do catálogo de conteúdos educacionais.
+
+O CSV é carregado uma única vez por processo (e recarregado só quando o
+arquivo muda) em colunas, com índices invertidos para os filtros
+`area_do_conhecimento`, `nivel` e `tipo` e um índice BM25 sobre nome e
+descrição. Assim a tool devolve apenas os itens relevantes e o consumo de
+tokens não cresce com o tamanho do catálogo.
+"""
+import threading
+from collections import defaultdict
+from pathlib import Path
+import pandas as pd
+from src.core.text_search import BM25Index, normalize
+
+CONTENT_FILE = Path(__file__).parent.parent.parent / 'data' / 'conteudos_desenvolvimento.csv'
+
+COLUMNS = ['nome_do_conteudo', 'tipo', 'area_do_conhecimento', 'nivel', 'descricao']
+FILTER_COLUMNS = ['area_do_conhecimento', 'nivel', 'tipo']
+
+
+class CatalogIndex:
+    """Catálogo em formato colunar com índices para filtros e busca textual"""
+
+    def __init__(self, df):
+        self.columns = {column: df[column].fillna('').astype(str).tolist() for column in COLUMNS}
+        self.size = len(df)
+
+        self.inverted = {}
+        for column in FILTER_COLUMNS:
+            index = defaultdict(set)
+            for row_id, value in enumerate(self.columns[column]):
+                index[normalize(value)].add(row_id)
+            self.inverted[column] = dict(index)
+
+        self.text_index = BM25Index(
+            f"{name} {description}"
+            for name, description in zip(self.columns['nome_do_conteudo'], self.columns['descricao'])
+        )
+
+    @classmethod
+    def from_csv(cls, path):
+        return cls(pd.read_csv(path))
+
+    def values(self, column):
+        """Valores distintos de uma coluna de filtro"""
+        return sorted({value for value in self.columns[column] if value})
+
+    def row(self, row_id):
+        return {column: values[row_id] for column, values in self.columns.items()}
+
+    def search(self, query=None, top_k=20, **filters):
+        """Retorna (ids das linhas, total de itens que atendem aos filtros)"""
+        candidates = None
+        for column, value in filters.items():
+            if not value:
+                continue
+            matches = self.inverted[column].get(normalize(value), set())
+            candidates = matches if candidates is None else candidates & matches
+
+        total = self.size if candidates is None else len(candidates)
+        if query and query.strip():
+            ranked = self.text_index.search(query, top_k, candidates)
+            if ranked or candidates is None:
+                return [row_id for row_id, _ in ranked], total
+            # Nenhum termo da consulta está no vocabulário: valem só os filtros
+
+        if candidates is None:
+            return list(range(min(top_k, self.size))), total
+        return sorted(candidates)[:top_k], total
+
+
+_lock = threading.Lock()
+_catalogs = {}
+
+
+def get_catalog(path=CONTENT_FILE):
+    """Retorna o índice do catálogo, recarregando apenas quando o CSV muda"""
+    path = Path(path)
+    mtime = path.stat().st_mtime_ns
+    with _lock:
+        cached = _catalogs.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, CatalogIndex.from_csv(path))
+            _catalogs[path] = cached
+        return cached[1]
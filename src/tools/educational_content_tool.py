@@ -1,49 +1,78 @@
-import pandas as pd
 from crewai.tools import BaseTool
-from typing import Type
+from typing import Optional, Type
 from pydantic import BaseModel, Field
-from pathlib import Path
+from src.tools.catalog_index import CONTENT_FILE, get_catalog
 
 class EducationalContentInput(BaseModel):
     """Input schema for ReadEducationalDBTool."""
-    query: str = Field(
-        None, 
-        description="Não é necessário fornecer nenhum parâmetro - a ferramenta já está configurada com o arquivo correto"
+    query: Optional[str] = Field(
+        None,
+        description="Termos de busca sobre o tema desejado (ex.: 'liderança de equipes remotas'). Opcional."
+    )
+    area_do_conhecimento: Optional[str] = Field(
+        None,
+        description="Filtra pela área do conhecimento (ex.: 'lideranca', 'gestao'). Opcional."
+    )
+    nivel: Optional[str] = Field(
+        None,
+        description="Filtra pelo nível (ex.: 'iniciante', 'intermediario', 'avancado'). Opcional."
+    )
+    tipo: Optional[str] = Field(
+        None,
+        description="Filtra pelo tipo de conteúdo (ex.: 'curso', 'pdf', 'video'). Opcional."
+    )
+    top_k: int = Field(
+        20,
+        description="Número máximo de conteúdos retornados"
     )
 
 class ReadEducationalDBTool(BaseTool):
     name: str = "read_educational_db"
     description: str = """
-    Retorna o catálogo completo de conteúdos educacionais disponíveis para recomendação.
-    
-    IMPORTANTE: NÃO é necessário fornecer nenhum parâmetro - a ferramenta já sabe qual arquivo usar.
-    
+    Consulta o catálogo de conteúdos educacionais disponíveis para recomendação.
+
+    Todos os parâmetros são opcionais:
+    - query: termos de busca sobre o tema desejado (busca por relevância no nome e na descrição)
+    - area_do_conhecimento, nivel, tipo: filtros exatos
+    - top_k: número máximo de conteúdos retornados (padrão: 20)
+
+    Sem parâmetros, retorna os primeiros conteúdos do catálogo.
+
     Exemplo de uso:
     ```python
-    # Correto - apenas chame a ferramenta
-    result = tool._run()
-    
-    # Incorreto - não tente fornecer parâmetros
-    result = tool._run(query="alguma coisa")
+    result = tool._run(query="comunicação com stakeholders", nivel="intermediario", top_k=10)
     ```
     """
     args_schema: Type[BaseModel] = EducationalContentInput
 
-    def _run(self, query: str = None) -> str:
+    def _run(self, query: str = None, area_do_conhecimento: str = None, nivel: str = None,
+             tipo: str = None, top_k: int = 20) -> str:
         try:
-            # Define o caminho do arquivo
-            content_file = Path(__file__).parent.parent.parent / 'data' / 'conteudos_desenvolvimento.csv'
-            
             # Verifica se o arquivo existe
-            if not content_file.exists():
+            if not CONTENT_FILE.exists():
                 return "Erro: Arquivo de conteúdos não encontrado."
-            
-            # Lê o arquivo CSV
-            df = pd.read_csv(content_file)
-            
+
+            # Índice carregado uma vez por processo
+            catalog = get_catalog(CONTENT_FILE)
+            row_ids, total = catalog.search(
+                query,
+                top_k=top_k,
+                area_do_conhecimento=area_do_conhecimento,
+                nivel=nivel,
+                tipo=tipo
+            )
+            if not row_ids:
+                return (
+                    "Nenhum conteúdo encontrado para os filtros informados. "
+                    f"Áreas disponíveis: {', '.join(catalog.values('area_do_conhecimento'))}. "
+                    f"Níveis: {', '.join(catalog.values('nivel'))}. "
+                    f"Tipos: {', '.join(catalog.values('tipo'))}."
+                )
+
             # Formata cada linha como um item estruturado
-            content_list = []
-            for _, row in df.iterrows():
+            content_list = [f"Exibindo {len(row_ids)} de {total} conteúdos.\n---"]
+            for row_id in row_ids:
+                row = catalog.row(row_id)
                 content = (
                     f"Nome: {row['nome_do_conteudo']}\n"
                     f"Tipo: {row['tipo']}\n"
@@ -53,8 +82,8 @@ class ReadEducationalDBTool(BaseTool):
                     "---"
                 )
                 content_list.append(content)
-            
+
             return "\n".join(content_list)
-            
+
         except Exception as e:
             return "Erro ao ler a base de dados de conteúdos. Por favor, verifique se o arquivo CSV existe e está acessível."
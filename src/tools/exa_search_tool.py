@@ -1,8 +1,15 @@
 import os
+from functools import lru_cache
 from exa_py import Exa
 from typing import Type
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
+from src.tools.search_cache import SearchCache, get_search_cache
+
+@lru_cache(maxsize=None)
+def _get_exa(api_key: str) -> Exa:
+    """Exa client shared across calls for the same API key."""
+    return Exa(api_key)
 
 class ExaSearchInput(BaseModel):
     """Input schema for ExaSearchTool."""
@@ -27,9 +34,8 @@ class ExaSearchTool(BaseTool):
         if not api_key:
             raise ValueError("EXA_API_KEY environment variable not set")
 
-        try:
-            exa = Exa(api_key)
-            response = exa.search_and_contents(
+        def search():
+            response = _get_exa(api_key).search_and_contents(
                 query,
                 type="neural",
                 use_autoprompt=True,
@@ -55,5 +61,10 @@ class ExaSearchTool(BaseTool):
 
             return "\n".join(formatted_results)
 
+        try:
+            # Only successful searches are cached; errors are retried on the next call
+            key = SearchCache.make_key("exa", query, num_results=num_results)
+            return get_search_cache().get_or_compute(key, search)
+
         except Exception as e:
             return f"Error performing search: {str(e)}"
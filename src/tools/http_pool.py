@@ -0,0 +1,91 @@
+"""
+Clientes HTTP compartilhados pelas tools de pesquisa.
+
+Mantém uma única `requests.Session` (pool de conexões keep-alive com retry
+em 429/5xx) para o caminho síncrono e um `httpx.AsyncClient` por event loop
+para o caminho assíncrono, ambos reaproveitados entre instâncias das tools.
+As buscas síncronas em paralelo usam um pool de threads também compartilhado,
+com no máximo uma thread por conexão do pool.
+"""
+import asyncio
+import os
+import random
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = float(os.getenv("PDI_HTTP_TIMEOUT", "15"))
+DEFAULT_MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+POOL_SIZE = 20
+
+_session_lock = threading.Lock()
+_sessions = {}
+_async_clients = weakref.WeakKeyDictionary()
+_executor = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="search")
+
+
+def get_session(max_retries=DEFAULT_MAX_RETRIES):
+    """Session compartilhada com pool de conexões e retry com backoff"""
+    with _session_lock:
+        if max_retries not in _sessions:
+            retry = Retry(
+                total=max_retries,
+                backoff_factor=BACKOFF_FACTOR,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=None,  # inclui POST, usado pelas APIs de busca
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[max_retries] = session
+        return _sessions[max_retries]
+
+
+def map_concurrently(func, items):
+    """Aplica `func` aos itens no pool de threads compartilhado, mantendo a ordem"""
+    return list(_executor.map(func, items))
+
+
+def get_async_client():
+    """AsyncClient compartilhado pelas tools no event loop atual"""
+    loop = asyncio.get_running_loop()
+    if loop not in _async_clients:
+        _async_clients[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE)
+        )
+    return _async_clients[loop]
+
+
+def _retry_delay(attempt, response=None):
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return random.uniform(0, BACKOFF_FACTOR * (2 ** attempt))
+
+
+async def post_json_async(url, headers, payload, timeout=DEFAULT_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES):
+    """POST assíncrono com retry e backoff em erros de rede, 429 e 5xx"""
+    client = get_async_client()
+    for attempt in range(max_retries + 1):
+        try:
+            response = await client.post(url, headers=headers, json=payload, timeout=timeout)
+        except httpx.TransportError:
+            if attempt == max_retries:
+                raise
+            await asyncio.sleep(_retry_delay(attempt))
+            continue
+
+        if response.status_code in RETRY_STATUSES and attempt < max_retries:
+            await asyncio.sleep(_retry_delay(attempt, response))
+            continue
+        response.raise_for_status()
+        return response.json()
@@ -0,0 +1,123 @@
+"""
+Cache persistente de resultados das tools de pesquisa (Exa e Serper).
+
+As chaves usam a consulta normalizada, de modo que consultas quase idênticas
+dos agents de pesquisa compartilham o mesmo resultado. Os resultados ficam em
+SQLite com TTL e despejo LRU, e consultas idênticas simultâneas disparam uma
+única chamada à API (single-flight).
+"""
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from src.core.sqlite_cache import SQLiteCache
+from src.core.text_search import tokenize
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+CACHE_FILE = Path(os.getenv("PDI_SEARCH_CACHE", PROJECT_ROOT / ".cache" / "search_results.sqlite"))
+
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_ENTRIES = 5000
+
+
+def normalize_query(query):
+    """Termos da consulta sem acentos, stopwords, pontuação ou ordem"""
+    terms = sorted(set(tokenize(query)))
+    # Consultas só com stopwords não podem colidir entre si
+    return " ".join(terms) if terms else " ".join(query.lower().split())
+
+
+class SearchCache(SQLiteCache):
+    """Cache de buscas com single-flight para consultas simultâneas"""
+
+    def __init__(self, path=CACHE_FILE, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        super().__init__(path, ttl=ttl, max_entries=max_entries)
+        self.coalesced = 0
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(provider, query, **params):
+        payload = json.dumps([provider, normalize_query(query), params], sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _join_or_lead(self, key):
+        """Retorna (future, é_líder) da chamada em andamento para a chave"""
+        with self._inflight_lock:
+            if key in self._inflight:
+                self.coalesced += 1
+                return self._inflight[key], False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+
+    def _finish(self, key, future, value=None, error=None):
+        with self._inflight_lock:
+            self._inflight.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(value)
+
+    def get_or_compute(self, key, compute):
+        """Retorna o resultado em cache ou executa `compute()` uma única vez"""
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        future, leader = self._join_or_lead(key)
+        if not leader:
+            return future.result()
+
+        try:
+            value = compute()
+        except Exception as e:
+            self._finish(key, future, error=e)
+            raise
+        self.set(key, value)
+        self._finish(key, future, value)
+        return value
+
+    async def aget_or_compute(self, key, compute):
+        """Versão assíncrona de get_or_compute; `compute()` retorna uma corrotina
+
+        A leitura e a gravação no SQLite (que podem esperar pelo lock do banco)
+        rodam em uma thread, fora do event loop.
+        """
+        cached = await asyncio.to_thread(self.get, key)
+        if cached is not None:
+            return cached
+
+        future, leader = self._join_or_lead(key)
+        if not leader:
+            return await asyncio.wrap_future(future)
+
+        try:
+            value = await compute()
+        except Exception as e:
+            self._finish(key, future, error=e)
+            raise
+        await asyncio.to_thread(self.set, key, value)
+        self._finish(key, future, value)
+        return value
+
+    def stats(self):
+        stats = super().stats()
+        stats['coalesced'] = self.coalesced
+        return stats
+
+
+_lock = threading.Lock()
+_cache = None
+
+
+def get_search_cache():
+    """Cache de buscas compartilhado pelo processo"""
+    global _cache
+    with _lock:
+        if _cache is None:
+            _cache = SearchCache()
+        return _cache
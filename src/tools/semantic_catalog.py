@@ -0,0 +1,193 @@
+"""
+Busca semântica local sobre o catálogo de conteúdos educacionais.
+
+As linhas do CSV são convertidas em vetores por um modelo de embeddings
+offline (sentence-transformers, se instalado e configurado em
+PDI_EMBEDDING_MODEL) ou por um vetorizador de hashing. Os vetores ficam em um
+índice persistente em disco, atualizado incrementalmente: só as linhas cujo
+hash mudou são vetorizadas de novo. A consulta é um produto matricial em numpy;
+em catálogos grandes, uma pré-seleção em dimensão reduzida escolhe os candidatos
+que recebem a similaridade exata.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+import numpy as np
+from src.core.text_search import normalize, tokenize
+from src.tools.catalog_index import CONTENT_FILE, get_catalog
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+INDEX_DIR = Path(os.getenv("PDI_VECTOR_INDEX_DIR", PROJECT_ROOT / ".cache" / "catalog_vectors"))
+EMBEDDING_MODEL = os.getenv("PDI_EMBEDDING_MODEL")
+
+COARSE_MIN_ROWS = 20000  # abaixo disso a busca exata já fica na casa de 1-2ms
+COARSE_DIM = 64
+COARSE_CANDIDATES = 256
+COARSE_SAMPLE = 10000
+
+
+class HashingEmbedder:
+    """Vetorizador de hashing (termos + trigramas de caracteres), sem dependências externas"""
+
+    def __init__(self, dim=256):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text):
+        terms = tokenize(text)
+        yield from terms
+        for term in terms:
+            padded = f" {term} "
+            for i in range(len(padded) - 2):
+                yield padded[i:i + 3]
+
+    def embed(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+                value = int.from_bytes(digest, 'little')
+                # O bit mais alto define o sinal, reduzindo o viés das colisões
+                vectors[row, value % self.dim] += 1.0 if value >> 63 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+class SentenceTransformerEmbedder:
+    """Embeddings de um modelo sentence-transformers disponível localmente"""
+
+    def __init__(self, model_name):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+        self.name = "st-" + re.sub(r'[^\w.-]', '_', model_name)
+
+    def embed(self, texts):
+        return self.model.encode(list(texts), normalize_embeddings=True).astype(np.float32)
+
+
+def get_embedder():
+    """Usa o modelo offline configurado ou, na falta dele, o vetorizador de hashing"""
+    if EMBEDDING_MODEL:
+        try:
+            return SentenceTransformerEmbedder(EMBEDDING_MODEL)
+        except (ImportError, OSError):
+            pass
+    return HashingEmbedder()
+
+
+def row_text(row):
+    return f"{row['nome_do_conteudo']}. {row['descricao']} Área: {row['area_do_conhecimento']}. Nível: {row['nivel']}. Tipo: {row['tipo']}."
+
+
+def row_hash(row):
+    return hashlib.sha1(normalize(row_text(row)).encode('utf-8')).hexdigest()
+
+
+class VectorSearch:
+    """Top-k por produto interno sobre uma matriz de vetores normalizados
+
+    Com muitas linhas, a varredura completa é limitada pela banda de memória.
+    Nesse caso os vetores também são projetados nas `COARSE_DIM` direções
+    principais de uma amostra; a projeção escolhe os candidatos e só eles
+    recebem o produto exato.
+    """
+
+    def __init__(self, vectors, coarse_min_rows=COARSE_MIN_ROWS, coarse_dim=COARSE_DIM):
+        self.vectors = vectors
+        self.basis = None
+        self.coarse = None
+        if len(vectors) >= coarse_min_rows and vectors.shape[1] > coarse_dim:
+            rng = np.random.default_rng(0)
+            sample = vectors[rng.choice(len(vectors), min(len(vectors), COARSE_SAMPLE), replace=False)]
+            _, _, vt = np.linalg.svd(sample, full_matrices=False)
+            self.basis = np.ascontiguousarray(vt[:coarse_dim].T)
+            self.coarse = np.ascontiguousarray(vectors @ self.basis)
+
+    def search(self, query_vector, top_k=10):
+        """Retorna [(linha, similaridade)] em ordem decrescente"""
+        if not len(self.vectors):
+            return []
+        top_k = min(top_k, len(self.vectors))
+        candidates = None
+        if self.coarse is None:
+            scores = self.vectors @ query_vector
+        else:
+            size = min(len(self.vectors), max(COARSE_CANDIDATES, top_k * 16))
+            coarse_scores = self.coarse @ (query_vector @ self.basis)
+            candidates = np.argpartition(-coarse_scores, size - 1)[:size]
+            scores = self.vectors[candidates] @ query_vector
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best])]
+        rows = best if candidates is None else candidates[best]
+        return [(int(row_id), float(score)) for row_id, score in zip(rows, scores[best])]
+
+
+class SemanticCatalogIndex:
+    """Matriz de embeddings das linhas do catálogo, persistida em disco"""
+
+    def __init__(self, catalog, embedder, index_dir=INDEX_DIR):
+        self.catalog = catalog
+        self.embedder = embedder
+        self.index_dir = Path(index_dir) / embedder.name
+        self.vectors = self._build()
+        self.searcher = VectorSearch(self.vectors)
+
+    def _load_stored(self):
+        vectors_file = self.index_dir / 'vectors.npy'
+        hashes_file = self.index_dir / 'hashes.json'
+        if not vectors_file.exists() or not hashes_file.exists():
+            return {}
+        with open(hashes_file, 'r', encoding='utf-8') as f:
+            hashes = json.load(f)
+        vectors = np.load(vectors_file)
+        return dict(zip(hashes, vectors))
+
+    def _save(self, hashes, vectors):
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        np.save(self.index_dir / 'vectors.npy', vectors)
+        with open(self.index_dir / 'hashes.json', 'w', encoding='utf-8') as f:
+            json.dump(hashes, f)
+
+    def _build(self):
+        rows = [self.catalog.row(row_id) for row_id in range(self.catalog.size)]
+        hashes = [row_hash(row) for row in rows]
+        stored = self._load_stored()
+
+        # Vetoriza apenas as linhas novas ou alteradas
+        missing = [i for i, digest in enumerate(hashes) if digest not in stored]
+        if missing:
+            new_vectors = self.embedder.embed([row_text(rows[i]) for i in missing])
+            for i, vector in zip(missing, new_vectors):
+                stored[hashes[i]] = vector
+
+        if not hashes:
+            return np.zeros((0, 1), dtype=np.float32)
+        vectors = np.vstack([stored[digest] for digest in hashes]).astype(np.float32)
+        if missing or len(stored) != len(set(hashes)):
+            self._save(hashes, vectors)
+        return vectors
+
+    def search(self, query, top_k=10):
+        """Retorna [(row_id, similaridade)] ordenado pela similaridade de cosseno"""
+        if not len(self.vectors) or not query.strip():
+            return []
+        return self.searcher.search(self.embedder.embed([query])[0], top_k)
+
+
+_lock = threading.Lock()
+_indexes = {}
+
+
+def get_semantic_index(path=CONTENT_FILE):
+    """Índice semântico do catálogo, reconstruído de forma incremental quando o CSV muda"""
+    catalog = get_catalog(path)
+    with _lock:
+        index = _indexes.get(Path(path))
+        if index is None or index.catalog is not catalog:
+            index = SemanticCatalogIndex(catalog, get_embedder())
+            _indexes[Path(path)] = index
+        return index
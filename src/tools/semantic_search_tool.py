@@ -0,0 +1,50 @@
+from crewai.tools import BaseTool
+from typing import Type
+from pydantic import BaseModel, Field
+from src.tools.catalog_index import CONTENT_FILE
+from src.tools.semantic_catalog import get_semantic_index
+
+class SemanticCatalogSearchInput(BaseModel):
+    """Input schema for SemanticCatalogSearchTool."""
+    query: str = Field(..., description="Descrição da necessidade de desenvolvimento ou do tema procurado")
+    top_k: int = Field(default=10, description="Número de conteúdos retornados")
+
+class SemanticCatalogSearchTool(BaseTool):
+    name: str = "semantic_search_educational_db"
+    description: str = """
+    Busca no catálogo interno os conteúdos educacionais mais próximos, por significado,
+    de uma necessidade de desenvolvimento descrita em linguagem natural.
+
+    Args:
+        query: Descrição da necessidade ou tema (ex.: "dar feedback difícil para o time")
+        top_k: Optional. Número de conteúdos retornados (default: 10)
+    """
+    args_schema: Type[BaseModel] = SemanticCatalogSearchInput
+
+    def _run(self, query: str, top_k: int = 10) -> str:
+        """Executa a busca por similaridade no índice local do catálogo."""
+        if not CONTENT_FILE.exists():
+            return "Erro: Arquivo de conteúdos não encontrado."
+
+        try:
+            index = get_semantic_index(CONTENT_FILE)
+            results = index.search(query, top_k)
+            if not results:
+                return "Nenhum conteúdo encontrado."
+
+            formatted_results = []
+            for row_id, score in results:
+                row = index.catalog.row(row_id)
+                formatted_results.append(
+                    f"Nome: {row['nome_do_conteudo']}\n"
+                    f"Tipo: {row['tipo']}\n"
+                    f"Área: {row['area_do_conhecimento']}\n"
+                    f"Nível: {row['nivel']}\n"
+                    f"Descrição: {row['descricao']}\n"
+                    f"Similaridade: {score:.2f}\n"
+                    "---"
+                )
+            return "\n".join(formatted_results)
+
+        except Exception as e:
+            return f"Erro ao consultar o índice semântico do catálogo: {str(e)}"
@@ -1,9 +1,14 @@
 import os
-import json
+import asyncio
+import httpx
 import requests
-from typing import Type
+from typing import List, Type
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
+from src.tools.http_pool import DEFAULT_MAX_RETRIES, DEFAULT_TIMEOUT, get_session, map_concurrently, post_json_async
+from src.tools.search_cache import SearchCache, get_search_cache
+
+SERPER_URL = "https://google.serper.dev/search"
 
 class SerperSearchInput(BaseModel):
     """Input schema for SerperSearchTool."""
@@ -13,22 +18,24 @@ class SerperSearchInput(BaseModel):
 class SerperSearchTool(BaseTool):
     name: str = "Search the internet"
     description: str = """
-    Search the internet for information about a specific topic. 
+    Search the internet for information about a specific topic.
     Returns formatted results with titles, links, and descriptions.
-    
+
     Args:
         query: The search query to execute
         num_results: Optional. Number of results to return (default: 10)
     """
     args_schema: Type[BaseModel] = SerperSearchInput
+    timeout: float = DEFAULT_TIMEOUT
+    max_retries: int = DEFAULT_MAX_RETRIES
 
-    def _run(self, query: str, num_results: int = 10) -> str:
-        """Execute a web search using the Serper API."""
+    def _request(self, query: str, num_results: int):
+        """Build the URL, headers and payload for a Serper search."""
         api_key = os.getenv("SERPER_API_KEY")
         if not api_key:
             raise ValueError("SERPER_API_KEY environment variable not set")
 
-        url = "https://google.serper.dev/search"
+        url = os.getenv("SERPER_URL", SERPER_URL)
         headers = {
             'X-API-KEY': api_key,
             'Content-Type': 'application/json'
@@ -37,26 +44,56 @@ class SerperSearchTool(BaseTool):
             'q': query,
             'num': num_results
         }
+        return url, headers, payload
 
-        try:
-            response = requests.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            results = response.json()
+    @staticmethod
+    def _format_results(results: dict) -> str:
+        """Format the Serper response as readable text."""
+        formatted_results = []
+        if 'organic' in results:
+            for item in results['organic']:
+                title = item.get('title', 'No title')
+                link = item.get('link', 'No link')
+                snippet = item.get('snippet', 'No description')
+                formatted_results.append(f"Title: {title}\nLink: {link}\nDescription: {snippet}\n")
 
-            # Format the results
-            formatted_results = []
-            if 'organic' in results:
-                for item in results['organic']:
-                    title = item.get('title', 'No title')
-                    link = item.get('link', 'No link')
-                    snippet = item.get('snippet', 'No description')
-                    formatted_results.append(f"Title: {title}\nLink: {link}\nDescription: {snippet}\n")
+        return "\n---\n".join(formatted_results) if formatted_results else "No results found."
 
-            return "\n---\n".join(formatted_results) if formatted_results else "No results found."
+    def _run(self, query: str, num_results: int = 10) -> str:
+        """Execute a web search using the Serper API through the shared connection pool."""
+        url, headers, payload = self._request(query, num_results)
+
+        def search():
+            response = get_session(self.max_retries).post(url, headers=headers, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            return self._format_results(response.json())
+
+        try:
+            key = SearchCache.make_key("serper", query, num_results=num_results)
+            return get_search_cache().get_or_compute(key, search)
 
         except requests.exceptions.RequestException as e:
             return f"Error performing search: {str(e)}"
 
     async def _arun(self, query: str, num_results: int = 10) -> str:
-        """Run async search with the provided query."""
-        return self._run(query, num_results)
+        """Run the search without blocking the event loop."""
+        url, headers, payload = self._request(query, num_results)
+
+        async def search():
+            results = await post_json_async(url, headers, payload, timeout=self.timeout, max_retries=self.max_retries)
+            return self._format_results(results)
+
+        try:
+            key = SearchCache.make_key("serper", query, num_results=num_results)
+            return await get_search_cache().aget_or_compute(key, search)
+
+        except httpx.HTTPError as e:
+            return f"Error performing search: {str(e)}"
+
+    async def asearch_many(self, queries: List[str], num_results: int = 10) -> List[str]:
+        """Run several searches concurrently and return the results in query order."""
+        return await asyncio.gather(*(self._arun(query, num_results) for query in queries))
+
+    def search_many(self, queries: List[str], num_results: int = 10) -> List[str]:
+        """Synchronous fan-out of several searches over the shared connection and thread pools."""
+        return map_concurrently(lambda query: self._run(query, num_results), queries)
@@ -22,14 +22,22 @@ if src_path not in sys.path:
 
 import pathlib
 import streamlit as st
-import streamlit.components.v1 as components
-import asyncio
+import yaml
+import time
+import uuid
 from src.assistants.pdi_assistant import PDIAssistant
 from src.assistants.interview_assistant import InterviewAssistant
 from src.assistants.linkedin_assistant import LinkedInAssistant
 from src.assistants.mestre_dos_magos_assistant import MestreDosMagosAssistant
-from src.core.utils import create_crew, load_config
-from langchain_openai import ChatOpenAI 
+from src.assistants.memory import trim_history
+from src.assistants.warmup import LINKEDIN, MESTRE_DOS_MAGOS, PDI, READY, FAILED, AssistantWarmup
+from src.core.jobs import COMPLETED, get_job_queue
+from src.core.events import EVENTS_FILE, read_events, summarize_tasks
+from src.core.workspace import Workspace
+from src.core.async_runtime import iter_sync
+from src.core.api_keys import KeyValidationError, submit_key_validation
+from src.web.pdi_tracker import bundle_available, load_pdi_config, pdi_tracker
+from src.web.documents import list_documents, load_document, render_document
 
 # Configuração da página
 st.set_page_config(
@@ -40,9 +48,17 @@ st.set_page_config(
 
 # Set up base directory and file paths
 CONFIG_DIR = PROJECT_ROOT / "config"
-AGENTS_CONFIG = str(CONFIG_DIR / "agents.yaml")
-TASKS_CONFIG = str(CONFIG_DIR / "tasks.yaml")
-OUTPUT_DIR = str(PROJECT_ROOT / "output")
+TASKS_CONFIG = CONFIG_DIR / "tasks.yaml"
+JOB_POLL_INTERVAL = 2  # segundos entre atualizações do progresso do job
+PDI_TASK = 'planejamento_estruturado_de_desenvolvimento_individual'
+
+# Chaves do session_state preenchidas por cada assistente preparado em segundo plano
+WARMUP_STATE = {
+    PDI: ('pdi_assistant', 'chat_messages'),
+    LINKEDIN: ('linkedin_assistant', 'linkedin_messages'),
+    MESTRE_DOS_MAGOS: ('mestre_dos_magos_assistant', 'mestre_dos_magos_messages')
+}
+WARMUP_LABELS = {PDI: "Consultor", LINKEDIN: "LinkedIn", MESTRE_DOS_MAGOS: "Mestre dos Magos"}
 
 # Initialize session state
 if 'messages' not in st.session_state:
@@ -55,6 +71,12 @@ if 'current_page' not in st.session_state:
     st.session_state.current_page = 'main'
 if 'current_file' not in st.session_state:
     st.session_state.current_file = None
+if 'workspace' not in st.session_state:
+    st.session_state.workspace = None
+if 'job_id' not in st.session_state:
+    st.session_state.job_id = None
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex[:12]  # agrega o consumo dos assistentes da sessão
 if 'openai_api_key' not in st.session_state:
     st.session_state.openai_api_key = None
 if 'pdi_assistant' not in st.session_state:
@@ -71,6 +93,17 @@ if 'mestre_dos_magos_assistant' not in st.session_state:
     st.session_state.mestre_dos_magos_assistant = None
 if 'mestre_dos_magos_messages' not in st.session_state:
     st.session_state.mestre_dos_magos_messages = []
+if 'warmup' not in st.session_state:
+    st.session_state.warmup = None
+
+# Reencontra o job de geração do PDI após um reload da página
+if st.session_state.job_id is None and "job" in st.query_params:
+    job = get_job_queue().get(st.query_params["job"])
+    if job is not None:
+        st.session_state.job_id = job.id
+        st.session_state.crew_run_id = job.run_id
+        st.session_state.workspace = Workspace(job.run_id)
+        st.session_state.interview_complete = True
 
 # Mapeamento de nomes de arquivos para títulos em português
 FILE_ORDER = [
@@ -95,6 +128,14 @@ FILE_TITLES = {
     "recomendacoes.md": "📚 Recomendações de Conteúdo Interno"
 }
 
+def current_output_dir():
+    """Diretório com os documentos da execução desta sessão"""
+    workspace = st.session_state.workspace
+    if workspace is None:
+        return None
+    workspace.touch()
+    return workspace.path
+
 def show_sidebar(generated_files):
     """Mostra a sidebar com os arquivos gerados"""
     with st.sidebar:
@@ -128,6 +169,8 @@ def show_sidebar(generated_files):
             
 
         
+        show_warmup_status()
+
         st.divider()
         
         # Lista de documentos
@@ -143,6 +186,44 @@ def show_sidebar(generated_files):
                     st.session_state.current_page = 'main'
                     st.rerun()
 
+def start_warmup(output_dir):
+    """Prepara os assistentes em segundo plano assim que o pdi.md foi gravado"""
+    if st.session_state.warmup is not None or output_dir is None:
+        return
+    summary = summarize_tasks(read_events(output_dir / EVENTS_FILE))
+    if summary.get(PDI_TASK, {}).get('status') == 'finished':
+        st.session_state.warmup = AssistantWarmup(
+            st.session_state.openai_api_key,
+            st.session_state.session_id,
+            output_dir
+        ).start()
+
+def take_warmed_assistant(name, wait=False):
+    """Move o assistente preparado para o session_state; com `wait`, aguarda a preparação"""
+    assistant_key, messages_key = WARMUP_STATE[name]
+    warmup = st.session_state.warmup
+    if st.session_state[assistant_key] is not None or warmup is None:
+        return
+    if warmup.status(name) == FAILED or (not wait and warmup.status(name) != READY):
+        return  # falhas são refeitas pelo caminho normal de inicialização
+    with st.spinner("Preparando o assistente..."):
+        try:
+            assistant, messages = warmup.result(name)
+        except Exception:
+            return
+    st.session_state[assistant_key] = assistant
+    st.session_state[messages_key] = messages
+
+def show_warmup_status():
+    """Prontidão dos assistentes preparados em segundo plano"""
+    warmup = st.session_state.warmup
+    if warmup is None:
+        return
+    icons = {READY: "✅", FAILED: "⚠️"}
+    statuses = warmup.statuses()
+    if any(status != READY for status in statuses.values()):
+        st.caption(" · ".join(f"{icons.get(status, '⏳')} {WARMUP_LABELS[name]}" for name, status in statuses.items()))
+
 def show_file_content():
     """Mostra o conteúdo do arquivo atual"""
     try:
@@ -154,37 +235,27 @@ def show_file_content():
             st.error(f"Arquivo não encontrado: {file_path}")
             return
             
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            st.markdown(content)
+        render_document(load_document(file_path))
     except Exception as e:
         st.error(f"Erro ao ler o arquivo: {str(e)}")
         st.session_state.current_file = str(PROJECT_ROOT / 'src' / 'assistants' / 'docs' / 'pdi_guide.md')
         st.rerun()
 
-def verify_api_key(api_key):
-    """Verifica se a chave da API OpenAI é válida"""
+def verify_api_key(validation):
+    """Aguarda a validação da chave iniciada com submit_key_validation"""
     try:
-        client = ChatOpenAI(
-            api_key=api_key,
-            model="gpt-4o-mini"
-        )
-        # Faz uma chamada simples para testar a API
-        response = client.invoke("Olá")
-        return True
-    except Exception as e:
-        st.error(f"Chave da API inválida!")
+        valid = validation.result()
+    except KeyValidationError as e:
+        st.error(f"Não foi possível verificar a chave da API agora: {e}")
         return False
-
-def initialize_llm():
-    return ChatOpenAI(
-        model="gpt-4o-2024-08-06"
-    )
+    if not valid:
+        st.error(f"Chave da API inválida!")
+    return valid
 
 def initialize_session_state():
     """Inicializa o estado da sessão para a entrevista"""
     if 'interview_assistant' not in st.session_state or st.session_state.interview_assistant is None:
-        st.session_state.interview_assistant = InterviewAssistant(st.session_state.openai_api_key)
+        st.session_state.interview_assistant = InterviewAssistant(st.session_state.openai_api_key, st.session_state.session_id)
         st.session_state.interview_assistant.initialize_assistant()
         st.session_state.messages = st.session_state.interview_assistant.messages
 
@@ -214,14 +285,9 @@ def show_generic_chat_interface(title, description, assistant, messages_key="cha
         with st.chat_message("user"):
             st.write(prompt)
         
-        # Get assistant response
+        # Get assistant response (token a token via streaming)
         with st.chat_message("assistant"):
-            # Verifica se não está em processo de criação do PDI
-            if not (hasattr(assistant, 'process_interview_completion') and "[INTERVIEW_COMPLETE]" in prompt):
-                with st.spinner("Pensando..."):
-                    response = asyncio.run(assistant.get_response(prompt))
-            else:
-                response = asyncio.run(assistant.get_response(prompt))
+            response = st.write_stream(iter_sync(assistant.stream_response(prompt)))
             
             # Verifica se é uma resposta de conclusão de entrevista
             if hasattr(assistant, 'process_interview_completion'):
@@ -229,7 +295,7 @@ def show_generic_chat_interface(title, description, assistant, messages_key="cha
                     st.rerun()
             
             st.session_state[messages_key].append({"role": "assistant", "content": response})
-            st.write(response)
+            trim_history(st.session_state[messages_key])
 
 def show_interview_interface():
     """Interface do chat para entrevista"""
@@ -258,16 +324,13 @@ def show_chat_interface():
 
 def show_linkedin_interface():
     """Interface do chat para criação de posts do LinkedIn"""
+    take_warmed_assistant(LINKEDIN, wait=True)
     if st.session_state.linkedin_assistant is None:
-        st.session_state.linkedin_assistant = LinkedInAssistant(st.session_state.openai_api_key)
+        st.session_state.linkedin_assistant = LinkedInAssistant(st.session_state.openai_api_key, st.session_state.session_id)
         st.session_state.linkedin_assistant.initialize_assistant()
         try:
-            # Gera o post inicial automaticamente
-            initial_post = st.session_state.linkedin_assistant.upload_pdi_documents(OUTPUT_DIR)
-            if initial_post:
-                st.session_state.linkedin_messages = [
-                    {"role": "assistant", "content": initial_post}
-                ]
+            st.session_state.linkedin_assistant.upload_pdi_documents(current_output_dir(), generate_post=False)
+            st.session_state.linkedin_messages = []
         except ValueError as e:
             st.error(str(e))
             return
@@ -280,6 +343,12 @@ def show_linkedin_interface():
         with st.chat_message(message["role"]):
             st.write(message["content"])
     
+    # Gera o post inicial automaticamente, exibindo o texto via streaming
+    if not st.session_state.linkedin_messages:
+        with st.chat_message("assistant"):
+            initial_post = st.write_stream(iter_sync(st.session_state.linkedin_assistant.stream_initial_post()))
+        st.session_state.linkedin_messages.append({"role": "assistant", "content": initial_post})
+    
     # Chat input
     if prompt := st.chat_input("Digite sua mensagem para ajustar o post"):
         st.session_state.linkedin_messages.append({"role": "user", "content": prompt})
@@ -287,70 +356,83 @@ def show_linkedin_interface():
             st.write(prompt)
         
         with st.chat_message("assistant"):
-            with st.spinner("Pensando..."):
-                response = asyncio.run(st.session_state.linkedin_assistant.get_response(prompt))
+            response = st.write_stream(iter_sync(st.session_state.linkedin_assistant.stream_response(prompt)))
             st.session_state.linkedin_messages.append({"role": "assistant", "content": response})
-            st.write(response)
+            trim_history(st.session_state.linkedin_messages)
+
+@st.cache_data
+def load_task_names():
+    """Nomes das tasks do tasks.yaml, lidos sem carregar o crewAI no processo da interface"""
+    with open(TASKS_CONFIG, 'r', encoding='utf-8') as f:
+        return list(yaml.safe_load(f))
+
+def show_progress_panel(events):
+    """Painel com o estado, a duração e a atividade de cada task do tasks.yaml"""
+    task_names = load_task_names()
+    summary = summarize_tasks(events)
+    finished = [name for name in task_names if summary.get(name, {}).get('status') == 'finished']
+    st.progress(len(finished) / len(task_names), text=f"{len(finished)} de {len(task_names)} etapas concluídas")
+
+    now = time.time()
+    for name in task_names:
+        entry = summary.get(name, {'status': 'pending'})
+        label = name.replace('_', ' ').capitalize()
+        if entry['status'] == 'finished':
+            detail = "reaproveitada" if entry['cached'] else f"{entry['duration']:.0f}s"
+            st.write(f"✅ {label} ({detail})")
+        elif entry['status'] == 'running':
+            tools = f", {entry['tool_calls']} pesquisas" if entry['tool_calls'] else ""
+            st.write(f"🔄 {label} ({now - entry['started_at']:.0f}s{tools})")
+        elif entry['status'] == 'failed':
+            st.write(f"❌ {label}")
+        else:
+            st.write(f"⏳ {label}")
+
+def show_job_progress():
+    """Acompanha a geração do PDI em segundo plano; retorna True quando o job terminou com sucesso"""
+    job_queue = get_job_queue()
+    job = job_queue.get(st.session_state.job_id)
+    if job is None:
+        st.error("Geração do PDI não encontrada.")
+        return False
+    if job.status == COMPLETED:
+        return True
+
+    st.title("🚀 Criando seu PDI personalizado")
+    st.markdown(
+        "Este processo envolve várias etapas de análise e pode levar alguns minutos. "
+        "Você pode recarregar a página: a geração continua em segundo plano."
+    )
+
+    show_progress_panel(read_events(Workspace(job.run_id).file(EVENTS_FILE)))
+
+    if job.done:
+        st.error(f"A geração do PDI foi interrompida: {job.error}")
+        if st.button("🔄 Retomar geração"):
+            job_queue.resume(job.id, st.session_state.openai_api_key)
+            st.rerun()
+        return False
+
+    time.sleep(JOB_POLL_INTERVAL)
+    st.rerun()
 
 def show_pdi_tracker():
     """Mostra a interface de visualização do PDI"""
     st.title("📊 Visualização do PDI")
     
     # Verifica se o arquivo JSON existe
-    pdi_json_path = Path(OUTPUT_DIR) / 'pdi.json'
-    if not pdi_json_path.exists():
+    output_dir = current_output_dir()
+    pdi_json_path = output_dir / 'pdi.json' if output_dir else None
+    if pdi_json_path is None or not pdi_json_path.exists():
         st.info("Nenhum PDI disponível para visualização. Complete a entrevista primeiro.")
         return
         
+    if not bundle_available():
+        st.error("Componente de visualização não encontrado. Execute 'npm run build' no diretório frontend.")
+        return
+
     try:
-        # Lê o arquivo JSON
-        with open(pdi_json_path, 'r', encoding='utf-8') as f:
-            pdi_data = f.read()
-        
-        # Caminho para o componente React compilado
-        component_path = Path(PROJECT_ROOT) / "frontend" / "dist" / "pdi-tracker.js"
-        if not component_path.exists():
-            st.error("Componente de visualização não encontrado. Execute 'npm run build' no diretório frontend.")
-            return
-            
-        # Lê o conteúdo do arquivo JS
-        with open(component_path, 'r', encoding='utf-8') as f:
-            js_content = f.read()
-            
-        # Renderiza o componente React
-        components.html(
-            f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="utf-8">
-                <title>PDI Tracker</title>
-                <style>
-                    body {{
-                        margin: 0;
-                        padding: 16px;
-                        font-family: system-ui, -apple-system, sans-serif;
-                    }}
-                </style>
-            </head>
-            <body>
-                <div id="pdi-tracker-root"></div>
-                <script>{js_content}</script>
-                <script>
-                    const pdiConfig = {pdi_data};
-                    window.renderPDITracker(
-                        document.getElementById('pdi-tracker-root'),
-                        pdiConfig,
-                        600
-                    );
-                </script>
-            </body>
-            </html>
-            """,
-            height=600,
-            scrolling=True
-        )
-            
+        pdi_tracker(load_pdi_config(pdi_json_path), key="pdi_tracker")
     except Exception as e:
         st.error(f"Erro ao carregar a visualização do PDI: {str(e)}")
 
@@ -363,13 +445,19 @@ def show_main_page():
     if not st.session_state.openai_api_key:
         api_key = st.text_input("🔑 OpenAI API Key", type="password")
         if api_key:
-            # Verifica se a chave é válida antes de prosseguir
-            if verify_api_key(api_key):
-                st.session_state.openai_api_key = api_key
-                os.environ["OPENAI_API_KEY"] = api_key
+            # A chave é validada em segundo plano enquanto o assistente de entrevista é preparado
+            validation = submit_key_validation(api_key)
+            st.session_state.openai_api_key = api_key
+            try:
                 initialize_session_state()
+            except Exception:
+                st.session_state.interview_assistant = None  # refeito abaixo se a chave for válida
+            if verify_api_key(validation):
+                os.environ["OPENAI_API_KEY"] = api_key
                 st.success("✅ API Key válida!")
                 st.rerun()
+            st.session_state.openai_api_key = None
+            st.session_state.interview_assistant = None
         st.stop()
     
     # Garante que o assistente está inicializado
@@ -378,18 +466,26 @@ def show_main_page():
         st.rerun()
     
     if st.session_state.interview_complete:
-        output_dir = Path(OUTPUT_DIR)
-        generated_files = list(output_dir.glob("*.md"))  # Lista todos os arquivos .md no diretório
+        output_dir = current_output_dir()
+        start_warmup(output_dir)
+        if st.session_state.job_id and not show_job_progress():
+            return
+        
+        for name in WARMUP_STATE:
+            take_warmed_assistant(name)
+        generated_files = list_documents(output_dir) if output_dir else []  # Arquivos .md do workspace da sessão
         
         # Mostrar a sidebar
         show_sidebar(generated_files)
         
         # Inicializa o PDI Assistant se necessário
+        if st.session_state.current_page == 'chat':
+            take_warmed_assistant(PDI, wait=True)
         if st.session_state.current_page == 'chat' and (
             'pdi_assistant' not in st.session_state or 
             st.session_state.pdi_assistant is None
         ):
-            st.session_state.pdi_assistant = PDIAssistant(st.session_state.openai_api_key)
+            st.session_state.pdi_assistant = PDIAssistant(st.session_state.openai_api_key, st.session_state.session_id)
             st.session_state.pdi_assistant.initialize_assistant()
             st.session_state.pdi_assistant.upload_pdi_documents(output_dir)
             st.session_state.pdi_assistant.create_thread()
@@ -419,8 +515,9 @@ def show_main_page():
 
 def show_mestre_dos_magos_interface():
     """Interface do chat para o Mestre dos Magos"""
+    take_warmed_assistant(MESTRE_DOS_MAGOS, wait=True)
     if st.session_state.mestre_dos_magos_assistant is None:
-        st.session_state.mestre_dos_magos_assistant = MestreDosMagosAssistant(st.session_state.openai_api_key)
+        st.session_state.mestre_dos_magos_assistant = MestreDosMagosAssistant(st.session_state.openai_api_key, st.session_state.session_id)
         st.session_state.mestre_dos_magos_assistant.initialize_assistant()
         st.session_state.mestre_dos_magos_assistant.create_thread()
         st.session_state.mestre_dos_magos_messages = []
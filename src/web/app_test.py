@@ -1,9 +1,10 @@
 import streamlit as st
-import streamlit.components.v1 as components
 from pathlib import Path
 import json
-import asyncio
 from src.assistants.linkedin_assistant import LinkedInAssistant
+from src.core.async_runtime import run_sync
+from src.web.pdi_tracker import bundle_available, load_pdi_config, pdi_tracker
+from src.web.documents import load_document, render_document
 
 # Set up page config
 st.set_page_config(
@@ -15,7 +16,6 @@ st.set_page_config(
 # Set up base directory and file paths
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 OUTPUT_DIR = BASE_DIR / "output"
-FRONTEND_DIR = BASE_DIR / "frontend"
 
 # Mapeamento de títulos para arquivos
 FILE_TITLES = {
@@ -62,10 +62,7 @@ def show_file_content():
         st.error(f"Arquivo não encontrado: {file_path}")
         return
         
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-        
-    st.markdown(content)
+    render_document(load_document(file_path))
 
 def show_pdi_tracker():
     """Mostra a interface de visualização do PDI"""
@@ -77,55 +74,12 @@ def show_pdi_tracker():
         st.info("Arquivo pdi.json não encontrado na pasta output.")
         return
         
+    if not bundle_available():
+        st.error("Componente de visualização não encontrado. Execute 'npm run build' no diretório frontend.")
+        return
+
     try:
-        # Lê o arquivo JSON
-        with open(pdi_json_path, 'r', encoding='utf-8') as f:
-            pdi_data = f.read()
-        
-        # Caminho para o componente React compilado
-        component_path = FRONTEND_DIR / "dist" / "pdi-tracker.js"
-        if not component_path.exists():
-            st.error("Componente de visualização não encontrado. Execute 'npm run build' no diretório frontend.")
-            return
-            
-        # Lê o conteúdo do arquivo JS
-        with open(component_path, 'r', encoding='utf-8') as f:
-            js_content = f.read()
-            
-        # Renderiza o componente React
-        components.html(
-            f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="utf-8">
-                <title>PDI Tracker</title>
-                <style>
-                    body {{
-                        margin: 0;
-                        padding: 16px;
-                        font-family: system-ui, -apple-system, sans-serif;
-                    }}
-                </style>
-            </head>
-            <body>
-                <div id="pdi-tracker-root"></div>
-                <script>{js_content}</script>
-                <script>
-                    const pdiConfig = {pdi_data};
-                    window.renderPDITracker(
-                        document.getElementById('pdi-tracker-root'),
-                        pdiConfig,
-                        600
-                    );
-                </script>
-            </body>
-            </html>
-            """,
-            height=600,
-            scrolling=True
-        )
-            
+        pdi_tracker(load_pdi_config(pdi_json_path), key="pdi_tracker")
     except Exception as e:
         st.error(f"Erro ao carregar a visualização do PDI: {str(e)}")
 
@@ -156,7 +110,7 @@ def show_linkedin_interface():
         
         with st.chat_message("assistant"):
             with st.spinner("Pensando..."):
-                response = asyncio.run(st.session_state.linkedin_assistant.get_response(prompt))
+                response = run_sync(st.session_state.linkedin_assistant.get_response(prompt))
             st.session_state.linkedin_messages.append({"role": "assistant", "content": response})
             st.write(response)
 
@@ -0,0 +1,87 @@
+"""
+Documentos markdown exibidos na interface.
+
+Os documentos são lidos e divididos em seções (títulos de nível 1 e 2) uma
+única vez por versão do arquivo: o cache é por processo e usa o mtime e o
+tamanho como chave, então reruns do Streamlit não voltam ao disco. Documentos
+grandes são exibidos uma seção por vez, escolhida pelo sumário.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import List
+import streamlit as st
+from src.core.sections import Section, parse_sections
+
+LAZY_THRESHOLD = 20_000  # caracteres a partir dos quais o documento é exibido por seção
+
+
+@dataclass(frozen=True)
+class Document:
+    path: str
+    title: str
+    sections: List[Section]
+    size: int
+
+    @property
+    def toc(self):
+        """Títulos das seções, indentados pelo nível"""
+        return ["    " * max(section.level - 1, 0) + section.title for section in self.sections]
+
+    @property
+    def content(self):
+        return "\n".join(section.content for section in self.sections)
+
+
+@lru_cache(maxsize=64)
+def _parse_document(path, mtime_ns, size):
+    with open(path, 'r', encoding='utf-8') as f:
+        markdown = f.read()
+    sections = parse_sections(markdown)
+    title = next((section.title for section in sections if section.level == 1), Path(path).stem)
+    return Document(path, title, sections, len(markdown))
+
+
+def load_document(path):
+    """Documento já dividido em seções; relido apenas quando o arquivo muda"""
+    stat = Path(path).stat()
+    return _parse_document(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=32)
+def _list_documents(directory, mtime_ns, pattern):
+    return tuple(sorted(Path(directory).glob(pattern)))
+
+
+def list_documents(directory, pattern="*.md"):
+    """Arquivos do diretório; a listagem só é refeita quando o diretório muda"""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return ()
+    return _list_documents(str(directory), directory.stat().st_mtime_ns, pattern)
+
+
+def render_document(document):
+    """Exibe o documento inteiro ou, se for grande, a seção escolhida no sumário"""
+    if document.size < LAZY_THRESHOLD or len(document.sections) == 1:
+        st.markdown(document.content)
+        return
+
+    toc = document.toc
+    index = st.selectbox(
+        "📑 Sumário",
+        range(len(toc)),
+        format_func=lambda i: toc[i],
+        key=f"toc_{document.path}"
+    )
+    st.markdown(document.sections[index].content)
+
+    previous, _, following = st.columns([1, 4, 1])
+    if index > 0:
+        previous.button("⬅️ Anterior", key=f"prev_{document.path}", on_click=_go_to, args=(document.path, index - 1))
+    if index < len(toc) - 1:
+        following.button("Próxima ➡️", key=f"next_{document.path}", on_click=_go_to, args=(document.path, index + 1))
+
+
+def _go_to(path, index):
+    st.session_state[f"toc_{path}"] = index
@@ -0,0 +1,68 @@
+"""
+Componente Streamlit do PDI Tracker.
+
+O bundle React (`frontend/dist/pdi-tracker.js`) é servido pelo Streamlit como
+arquivo estático de um componente declarado, com `?v=<hash do conteúdo>` para
+que o navegador o mantenha em cache até um novo build. A cada renderização só
+o pdi.json trafega, e ele é lido do disco apenas quando o arquivo muda.
+"""
+import hashlib
+import json
+import threading
+from functools import lru_cache
+from pathlib import Path
+import streamlit.components.v1 as components
+
+FRONTEND_DIR = Path(__file__).resolve().parent.parent.parent / "frontend"
+DIST_DIR = FRONTEND_DIR / "dist"
+BUNDLE_FILE = DIST_DIR / "pdi-tracker.js"
+DEFAULT_HEIGHT = 600
+
+_component = components.declare_component("pdi_tracker", path=str(DIST_DIR))
+
+_lock = threading.Lock()
+_pdi_cache = {}
+
+
+def bundle_available():
+    return BUNDLE_FILE.exists() and (DIST_DIR / "index.html").exists()
+
+
+@lru_cache(maxsize=8)
+def _bundle_hash(path, mtime_ns, size):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+
+def bundle_version():
+    """Hash do conteúdo do bundle, recalculado só quando o arquivo muda"""
+    stat = BUNDLE_FILE.stat()
+    return _bundle_hash(str(BUNDLE_FILE), stat.st_mtime_ns, stat.st_size)
+
+
+def load_pdi_config(path):
+    """Conteúdo do pdi.json, relido apenas quando mtime ou tamanho mudam"""
+    path = Path(path)
+    stat = path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        cached = _pdi_cache.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    with _lock:
+        _pdi_cache[path] = (signature, data)
+    return data
+
+
+def pdi_tracker(pdi_config, height=DEFAULT_HEIGHT, key=None):
+    """Renderiza o tracker; retorna o último progresso informado pelo componente"""
+    return _component(
+        pdi_config=pdi_config,
+        bundle_version=bundle_version(),
+        height=height,
+        key=key,
+        default=None
+    )
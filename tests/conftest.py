@@ -0,0 +1,16 @@
+"""Configuração comum dos testes: raiz do projeto no path e execução offline"""
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Sem telemetria do crewAI e sem baixar a tabela de preços do litellm
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+
+def pytest_configure(config):
+    # Benchmarks com catálogos grandes; `-m "not slow"` os deixa de fora
+    config.addinivalue_line("markers", "slow: benchmark demorado, que reporta tempos medidos")
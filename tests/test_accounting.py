@@ -0,0 +1,37 @@
+"""Rotação do log de consumo dos assistentes e leitura dos arquivos rotacionados"""
+from src.core.accounting import UsageLedger
+from src.core.events import TOKENS_USED, EventBus, JSONLSink
+
+
+def emit_runs(path, count, max_bytes=300, backups=2):
+    usage = EventBus([JSONLSink(path, max_bytes, backups)])
+    for index in range(count):
+        usage.emit(TOKENS_USED, None, source='assistant', agent=f"assistente-{index}", model='gpt-4o-mini',
+                   prompt_tokens=100, completion_tokens=10, latency=1.0)
+
+
+def test_log_is_rotated_when_it_reaches_max_bytes(tmp_path):
+    path = tmp_path / "assistant_usage.jsonl"
+    emit_runs(path, 40)
+
+    assert sorted(file.name for file in tmp_path.iterdir()) == [
+        "assistant_usage.jsonl", "assistant_usage.jsonl.1", "assistant_usage.jsonl.2"]
+    assert all(file.stat().st_size < 600 for file in tmp_path.iterdir())
+
+
+def test_ledger_reads_rotated_files_in_order(tmp_path):
+    path = tmp_path / "assistant_usage.jsonl"
+    emit_runs(path, 6, backups=5)
+
+    agents = [record.agent for record in UsageLedger.for_assistants(path, backups=5).records]
+
+    assert (tmp_path / "assistant_usage.jsonl.1").exists()
+    assert agents == [f"assistente-{index}" for index in range(6)]
+
+
+def test_without_max_bytes_the_log_only_grows(tmp_path):
+    path = tmp_path / "assistant_usage.jsonl"
+    emit_runs(path, 40, max_bytes=None)
+
+    assert [file.name for file in tmp_path.iterdir()] == ["assistant_usage.jsonl"]
+    assert len(UsageLedger.for_assistants(path).records) == 40
@@ -0,0 +1,79 @@
+"""validate_api_key contra um endpoint /v1/models falso (httpx.MockTransport)"""
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("openai")
+from src.core import api_keys  # noqa: E402
+from src.core.api_keys import KeyValidationError, validate_api_key  # noqa: E402
+
+VALID_KEY = "sk-valida"
+
+
+@pytest.fixture
+def models_endpoint(monkeypatch):
+    """Aceita apenas VALID_KEY; chaves 'sk-offline' simulam falha de rede"""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        key = request.headers["Authorization"].removeprefix("Bearer ")
+        if key.startswith("sk-offline"):
+            raise httpx.ConnectError("sem conexão", request=request)
+        if key != VALID_KEY:
+            return httpx.Response(401, json={"error": {"message": "Incorrect API key provided", "type": "invalid_request_error"}})
+        return httpx.Response(200, json={"object": "list", "data": [{"id": "gpt-4o", "object": "model"}]})
+
+    monkeypatch.setattr(api_keys, "_http_client", httpx.Client(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(api_keys, "_verdicts", type(api_keys._verdicts)())
+    return requests
+
+
+def test_valid_key_is_accepted(models_endpoint):
+    assert validate_api_key(VALID_KEY) is True
+    assert models_endpoint[0].url.path == "/v1/models"
+
+
+def test_rejected_key_is_invalid(models_endpoint):
+    assert validate_api_key("sk-invalida") is False
+
+
+def test_verdict_is_cached_by_key_hash(models_endpoint):
+    assert validate_api_key(VALID_KEY) is True
+    assert validate_api_key(VALID_KEY) is True
+
+    assert len(models_endpoint) == 1
+    assert VALID_KEY not in str(dict(api_keys._verdicts))
+
+
+def test_network_error_is_not_cached_as_invalid(models_endpoint):
+    with pytest.raises(KeyValidationError):
+        validate_api_key("sk-offline")
+    assert api_keys.key_hash("sk-offline") not in api_keys._verdicts
+
+    with pytest.raises(KeyValidationError):
+        validate_api_key("sk-offline")
+
+
+def test_expired_verdict_is_validated_again(models_endpoint):
+    validate_api_key(VALID_KEY)
+    assert validate_api_key(VALID_KEY, ttl=0) is True
+
+    assert len(models_endpoint) == 2
+
+
+def test_cache_keeps_the_most_recently_used_keys(models_endpoint, monkeypatch):
+    monkeypatch.setattr(api_keys, "MAX_CACHED_KEYS", 2)
+    for key in ("sk-a", "sk-b"):
+        validate_api_key(key)
+    validate_api_key("sk-a")
+    validate_api_key("sk-c")
+
+    assert list(api_keys._verdicts) == [api_keys.key_hash("sk-a"), api_keys.key_hash("sk-c")]
+
+
+def test_expired_verdicts_are_dropped(models_endpoint, monkeypatch):
+    validate_api_key("sk-antiga")
+    monkeypatch.setattr(api_keys, "KEY_CACHE_TTL", 0)
+    validate_api_key(VALID_KEY)
+
+    assert api_keys.key_hash("sk-antiga") not in api_keys._verdicts
@@ -0,0 +1,94 @@
+"""Filtros e busca textual do índice do catálogo de conteúdos"""
+import random
+import statistics
+import time
+import pandas as pd
+import pytest
+from src.tools.catalog_index import CatalogIndex
+
+
+@pytest.fixture
+def catalog():
+    return CatalogIndex(pd.DataFrame([
+        {'nome_do_conteudo': 'Liderança de equipes remotas', 'tipo': 'curso', 'area_do_conhecimento': 'lideranca',
+         'nivel': 'intermediario', 'descricao': 'Gestão de times distribuídos e rituais de acompanhamento.'},
+        {'nome_do_conteudo': 'Feedback e conversas difíceis', 'tipo': 'video', 'area_do_conhecimento': 'lideranca',
+         'nivel': 'iniciante', 'descricao': 'Como dar feedback construtivo para a equipe.'},
+        {'nome_do_conteudo': 'SQL para análise de dados', 'tipo': 'curso', 'area_do_conhecimento': 'dados',
+         'nivel': 'iniciante', 'descricao': 'Consultas, agregações e junções.'},
+        {'nome_do_conteudo': 'Estatística aplicada', 'tipo': 'pdf', 'area_do_conhecimento': 'dados',
+         'nivel': 'avancado', 'descricao': 'Inferência e testes de hipótese.'},
+    ]))
+
+
+def test_filters_are_combined_and_normalized(catalog):
+    row_ids, total = catalog.search(area_do_conhecimento='Liderança', tipo='CURSO')
+    assert row_ids == [0]
+    assert total == 1
+
+
+def test_query_ranks_rows_by_relevance(catalog):
+    row_ids, total = catalog.search("feedback para a equipe", top_k=2)
+    assert row_ids[0] == 1
+    assert total == 4
+
+
+def test_query_is_restricted_to_filtered_rows(catalog):
+    row_ids, _ = catalog.search("análise de dados", area_do_conhecimento='lideranca')
+    assert set(row_ids) <= {0, 1}
+
+
+def test_query_outside_vocabulary_falls_back_to_filters(catalog):
+    row_ids, total = catalog.search("blockchain quântico", area_do_conhecimento='dados')
+    assert row_ids == [2, 3]
+    assert total == 2
+
+
+def test_query_outside_vocabulary_without_filters_returns_nothing(catalog):
+    row_ids, _ = catalog.search("blockchain quântico")
+    assert row_ids == []
+
+
+def test_unknown_filter_value_returns_nothing(catalog):
+    row_ids, total = catalog.search("sql", nivel='especialista')
+    assert row_ids == []
+    assert total == 0
+
+
+def test_top_k_limits_results(catalog):
+    row_ids, total = catalog.search(top_k=3)
+    assert row_ids == [0, 1, 2]
+    assert total == 4
+
+
+@pytest.fixture(scope="module")
+def large_catalog():
+    """100 mil linhas sintéticas com o vocabulário e os filtros do catálogo real"""
+    rng = random.Random(7)
+    words = ("liderança equipe feedback dados sql estatística comunicação negociação projetos ágil python "
+             "finanças vendas atendimento estratégia inovação gestão tempo produtividade carreira").split()
+    rows = [{'nome_do_conteudo': " ".join(rng.choices(words, k=4)), 'tipo': rng.choice(['curso', 'video', 'pdf']),
+             'area_do_conhecimento': rng.choice(['lideranca', 'dados', 'negocios', 'tecnologia']),
+             'nivel': rng.choice(['iniciante', 'intermediario', 'avancado']),
+             'descricao': " ".join(rng.choices(words, k=20))} for _ in range(100_000)]
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.slow
+def test_large_catalog_build_and_query_time(large_catalog):
+    started = time.perf_counter()
+    catalog = CatalogIndex(large_catalog)
+    build = time.perf_counter() - started
+
+    queries = ["liderança de equipe", "sql e estatística", "negociação em vendas", "gestão do tempo"]
+    latencies = []
+    for query in queries * 5:
+        started = time.perf_counter()
+        row_ids, _ = catalog.search(query, top_k=10, area_do_conhecimento='lideranca', nivel='iniciante')
+        latencies.append(time.perf_counter() - started)
+        assert row_ids
+    query_time = statistics.median(latencies)
+    print(f"\n100k linhas: construção {build:.2f}s, consulta (mediana) {query_time * 1000:.1f}ms")
+
+    assert build < 20
+    assert query_time < 0.1
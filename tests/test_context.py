@@ -0,0 +1,66 @@
+"""Digest com orçamento de tokens de src/assistants/context.py"""
+from src.assistants.context import build_digest, pack_document
+from src.core.accounting import count_tokens
+
+LONG = " ".join(f"palavra{n}" for n in range(60))
+
+DOCUMENT = f"""# Análise de perfil
+
+## Pontos fortes
+
+Comunicação clara com o time.
+
+## Áreas de melhoria
+
+{LONG}
+
+## Próximos passos
+
+Definir metas trimestrais.
+"""
+
+
+def test_everything_fits_in_a_large_budget():
+    packed = pack_document(DOCUMENT, 10_000)
+
+    for text in ("## Pontos fortes", "Comunicação clara", "## Áreas de melhoria", LONG, "Definir metas"):
+        assert text in packed
+
+
+def test_headings_of_sections_left_out_do_not_use_the_budget():
+    # Com o título de todas as seções cobrado de antemão, o último parágrafo não cabia
+    headings = ["# Análise de perfil", "## Pontos fortes", "## Áreas de melhoria", "## Próximos passos"]
+    emitted = ["## Pontos fortes", "Comunicação clara com o time.", "## Próximos passos", "Definir metas trimestrais."]
+    budget = sum(count_tokens(text) for text in emitted)
+    assert budget < sum(count_tokens(text) for text in headings + emitted[1::2])
+
+    packed = pack_document(DOCUMENT, budget)
+
+    assert packed == "\n\n".join(emitted)
+    assert "Áreas de melhoria" not in packed
+
+
+def test_packed_document_stays_within_budget():
+    for budget in (5, 20, 40, 80, 120):
+        packed = pack_document(DOCUMENT, budget)
+        blocks = packed.split("\n\n") if packed else []
+        assert sum(count_tokens(block) for block in blocks) <= budget
+
+
+def test_repeated_paragraphs_are_included_once():
+    documents = {
+        "analise_perfil.md": "## Perfil\n\nLidera o time de dados.",
+        "pdi.md": "## Plano\n\nLidera o time de dados.\n\nCurso de liderança no Trimestre 1.",
+    }
+
+    digest = build_digest(documents, 1000)
+
+    assert digest.count("Lidera o time de dados.") == 1
+    assert "Curso de liderança" in digest
+
+
+def test_paragraphs_left_out_for_budget_may_appear_in_later_documents():
+    seen = set()
+    assert pack_document(f"## Longo\n\n{LONG}", 10, seen) == ""
+
+    assert LONG in pack_document(f"## Repetido\n\n{LONG}", 1000, seen)
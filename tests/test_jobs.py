@@ -0,0 +1,94 @@
+"""Estados dos jobs quando o processo do worker falha"""
+import os
+import time
+import uuid
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+import pytest
+from src.core.jobs import COMPLETED, FAILED, INTERRUPTED, QUEUED, RUNNING, Job, JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(max_workers=1, db_path=tmp_path / "jobs.sqlite")
+    executor = queue.executor
+    yield queue
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def add_job(queue, status=RUNNING, owner_pid=None):
+    job = Job(id=uuid.uuid4().hex[:12], run_id="run", status=status,
+              owner_pid=owner_pid or os.getpid(), created_at=time.time())
+    queue.store.insert(job)
+    return job
+
+
+def finished_future(result=None, error=None):
+    future = Future()
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+    return future
+
+
+def test_crashed_worker_marks_job_failed(queue):
+    job = add_job(queue)
+    queue._on_job_done(job.id, finished_future(error=BrokenProcessPool("worker morreu")))
+    stored = queue.get(job.id)
+    assert stored.status == FAILED
+    assert "worker morreu" in stored.error
+    assert stored.finished_at is not None
+
+
+def test_cancelled_job_is_marked_failed(queue):
+    job = add_job(queue, status=QUEUED)
+    future = Future()
+    future.cancel()
+    queue._on_job_done(job.id, future)
+    assert queue.get(job.id).status == FAILED
+
+
+def test_status_recorded_by_the_worker_is_kept(queue):
+    job = add_job(queue)
+    queue.store.update(job.id, status=FAILED, error="erro da crew")
+    queue._on_job_done(job.id, finished_future(error=RuntimeError("erro da crew")))
+    assert queue.get(job.id).error == "erro da crew"
+
+    done = add_job(queue)
+    queue.store.update(done.id, status=COMPLETED)
+    queue._on_job_done(done.id, finished_future())
+    assert queue.get(done.id).status == COMPLETED
+
+
+def test_broken_pool_is_replaced_on_next_submit(queue):
+    class BrokenExecutor:
+        def submit(self, *args):
+            raise BrokenProcessPool("pool quebrado")
+
+    class RecordingExecutor:
+        def __init__(self):
+            self.submitted = []
+
+        def submit(self, *args):
+            self.submitted.append(args)
+            return Future()
+
+    replacement = RecordingExecutor()
+    queue.executor = BrokenExecutor()
+    queue._create_executor = lambda: replacement
+
+    job = add_job(queue, status=QUEUED)
+    assert queue._enqueue(job, "sk-test") == job.id
+    assert queue.executor is replacement
+    assert replacement.submitted[0][1] == job.id
+
+
+def test_jobs_of_a_dead_server_are_interrupted(tmp_path):
+    db_path = tmp_path / "jobs.sqlite"
+    first = JobQueue(max_workers=1, db_path=db_path)
+    first.executor.shutdown(wait=False)
+    job = add_job(first, owner_pid=2 ** 22 + 12345)
+    second = JobQueue(max_workers=1, db_path=db_path)
+    second.executor.shutdown(wait=False)
+    assert second.get(job.id).status == INTERRUPTED
@@ -0,0 +1,200 @@
+"""Janela e resumo de src/assistants/memory.py (resumidor falso) e turnos que falham no BaseAssistant"""
+import asyncio
+from types import SimpleNamespace
+import pytest
+from openai import OpenAIError
+from src.assistants import base
+from src.core import accounting
+from src.core.accounting import UsageRecord
+from src.core.events import EventBus
+from src.assistants.base import BaseAssistant
+from src.assistants.memory import SUMMARY_MAX_TOKENS, ConversationMemory, OpenAISummarizer
+from src.assistants.run_engine import RunError
+
+
+class FactSummarizer:
+    """Resumo como a lista de fatos das trocas resumidas, limitado aos `limit` mais recentes"""
+
+    def __init__(self, limit=None, failures=0):
+        self.limit = limit
+        self.failures = failures
+        self.calls = []
+
+    def __call__(self, summary, turns):
+        self.calls.append(list(turns))
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("resumo indisponível")
+        facts = (summary.split("; ") if summary else []) + [user for user, _ in turns]
+        return "; ".join(facts[-self.limit:] if self.limit else facts)
+
+
+def converse(memory, turns):
+    for n in range(turns):
+        memory.add_turn(f"fato {n}", f"resposta {n}")
+
+
+def test_no_truncation_while_the_whole_conversation_fits():
+    memory = ConversationMemory(FactSummarizer(), window_turns=3)
+    converse(memory, 5)
+
+    assert not memory.truncated
+    assert memory.run_options() == {}
+    assert memory.instructions() is None
+
+
+def test_window_stays_bounded_and_matches_last_messages():
+    memory = ConversationMemory(FactSummarizer(), window_turns=3)
+
+    for n in range(40):
+        memory.add_turn(f"fato {n}", f"resposta {n}")
+        assert len(memory.turns) < 2 * memory.window_turns
+        if memory.truncated:
+            # Trocas da janela (pergunta e resposta) e a nova pergunta
+            assert memory.run_options()["truncation_strategy"]["last_messages"] == 2 * len(memory.turns) + 1
+
+
+def test_every_fact_is_summarized_once_in_order():
+    summarizer = FactSummarizer()
+    memory = ConversationMemory(summarizer, window_turns=4)
+    converse(memory, 30)
+
+    summarized = [user for call in summarizer.calls for user, _ in call]
+    window = [user for user, _ in memory.turns]
+    assert summarized + window == [f"fato {n}" for n in range(30)]
+    assert memory.summary == "; ".join(summarized)
+    assert memory.summary in memory.instructions()
+
+
+def test_summary_is_redone_once_per_window_not_every_turn():
+    summarizer = FactSummarizer()
+    memory = ConversationMemory(summarizer, window_turns=5)
+    converse(memory, 50)
+
+    assert len(summarizer.calls) == (50 - 5) // 5
+
+
+def test_bounded_summarizer_keeps_summary_bounded():
+    memory = ConversationMemory(FactSummarizer(limit=6), window_turns=2)
+    converse(memory, 100)
+
+    assert memory.summary.count("fato") <= 6
+    assert "fato 97" in memory.summary or "fato 97" in [user for user, _ in memory.turns]
+
+
+def test_failed_summary_restores_turns_and_retries():
+    summarizer = FactSummarizer(failures=1)
+    memory = ConversationMemory(summarizer, window_turns=2)
+    converse(memory, 4)
+
+    assert memory.summary == ""
+    assert [user for user, _ in memory.turns] == ["fato 0", "fato 1", "fato 2", "fato 3"]
+    assert not memory.truncated
+
+    memory.add_turn("fato 4", "resposta 4")
+
+    assert memory.summary == "fato 0; fato 1; fato 2"
+    assert [user for user, _ in memory.turns] == ["fato 3", "fato 4"]
+
+
+def test_openai_summarizer_sends_summary_turns_and_token_limit():
+    calls = []
+
+    def create(**params):
+        calls.append(params)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="  novo resumo \n"))])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    summarizer = OpenAISummarizer(client, model="modelo")
+
+    summary = summarizer("Ana lidera o time de dados", [("Quero aprender Python", "Ótimo, comece pelo curso X")])
+
+    assert summary == "novo resumo"
+    params = calls[0]
+    assert params["max_tokens"] == SUMMARY_MAX_TOKENS and params["temperature"] == 0
+    assert str(SUMMARY_MAX_TOKENS) in params["messages"][0]["content"]
+    prompt = params["messages"][1]["content"]
+    assert "Ana lidera o time de dados" in prompt
+    assert "Usuário: Quero aprender Python\nAssistente: Ótimo, comece pelo curso X" in prompt
+
+
+def test_openai_summarizer_records_its_usage(monkeypatch):
+    events = []
+    monkeypatch.setattr(accounting, "_assistant_usage", EventBus([events.append]))
+    response = SimpleNamespace(model="gpt-4o-mini", usage=SimpleNamespace(prompt_tokens=900, completion_tokens=120),
+                               choices=[SimpleNamespace(message=SimpleNamespace(content="resumo"))])
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **params: response)))
+
+    OpenAISummarizer(client, model="gpt-4o-mini", session_id="sessao-1")("", [("Oi", "Olá")])
+
+    record = UsageRecord.from_event(events[0])
+    assert (record.source, record.agent, record.model) == ("summarizer", "Conversation Summary", "gpt-4o-mini")
+    assert (record.prompt_tokens, record.completion_tokens, record.session_id) == (900, 120, "sessao-1")
+
+
+class FakeMessages:
+    def __init__(self, fail_delete=False):
+        self.thread = []
+        self.fail_delete = fail_delete
+
+    async def create(self, thread_id, role, content):
+        message = SimpleNamespace(id=f"msg_{len(self.thread)}", role=role, run_id=None,
+                                  content=[SimpleNamespace(type="text", text=SimpleNamespace(value=content))])
+        self.thread.append(message)
+        return message
+
+    async def list(self, thread_id, order, after, limit, run_id=None):
+        ids = [message.id for message in self.thread]
+        return SimpleNamespace(data=self.thread[ids.index(after) + 1:], has_more=False)
+
+    async def delete(self, message_id, thread_id):
+        if self.fail_delete:
+            raise OpenAIError("indisponível")
+        self.thread = [message for message in self.thread if message.id != message_id]
+
+
+class FakeRuns:
+    def __init__(self, messages):
+        self.messages = messages
+
+    async def create(self, thread_id, assistant_id, **params):
+        # O run deixa uma mensagem incompleta antes de falhar
+        self.messages.thread.append(SimpleNamespace(id="msg_parcial", role="assistant", run_id="run_1", content=[]))
+        return SimpleNamespace(id="run_1", thread_id=thread_id, status="queued")
+
+
+@pytest.fixture
+def assistant(monkeypatch):
+    messages = FakeMessages()
+    client = SimpleNamespace(beta=SimpleNamespace(threads=SimpleNamespace(messages=messages, runs=FakeRuns(messages))))
+
+    async def failed_run(client, run):
+        raise RunError(SimpleNamespace(id=run.id, status="failed", last_error=None))
+
+    monkeypatch.setattr(base, "get_async_client", lambda api_key: client)
+    monkeypatch.setattr(base, "wait_for_run", failed_run)
+    assistant = BaseAssistant("sk-teste")
+    assistant.memory = ConversationMemory(FactSummarizer(), window_turns=2)
+    assistant.assistant = SimpleNamespace(id="asst_1", name="Teste")
+    assistant.thread = SimpleNamespace(id="thread_1")
+    return assistant, messages
+
+
+def test_failed_run_is_removed_from_thread_and_memory(assistant):
+    assistant, messages = assistant
+
+    response = asyncio.run(assistant.get_response("Qual é o meu plano?"))
+
+    assert response.startswith(assistant.fallback_response)
+    assert messages.thread == []
+    assert assistant.memory.total_turns == 0
+    assert list(assistant.transcript.messages) == []
+
+
+def test_failed_run_counts_as_a_turn_when_thread_cannot_be_cleaned(assistant):
+    assistant, messages = assistant
+    messages.fail_delete = True
+
+    asyncio.run(assistant.get_response("Qual é o meu plano?"))
+
+    assert assistant.memory.total_turns == 1
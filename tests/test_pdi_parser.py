@@ -0,0 +1,125 @@
+"""Conversão do pdi.md para o PDIConfig a partir de documentos de exemplo em tests/fixtures/pdi"""
+import json
+from pathlib import Path
+from types import SimpleNamespace
+import pytest
+from src.core.checkpoint import CheckpointStore
+from src.core.pdi_parser import PDIParseError, parse_pdi_markdown, pdi_json_from_context, quarter_from_text
+from src.core.task_cache import rebuild_task_output, write_output_file
+from src.models.pdi_models import PDIConfig, TipoAtividade
+
+FIXTURES = Path(__file__).parent / "fixtures" / "pdi"
+
+
+def fixture(name):
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def by_title(config):
+    return {activity.titulo: activity for activity in config.atividades}
+
+
+@pytest.mark.parametrize("text, quarter", [
+    ("Trimestre 2", 2),
+    ("3º Trimestre", 3),
+    ("Q4", 4),
+    ("Meses 4-6", 2),
+    ("Março", 1),
+    ("marco do projeto", None),
+    ("Trimestre 7", None),
+])
+def test_quarter_from_text(text, quarter):
+    assert quarter_from_text(text) == quarter
+
+
+def test_quarterly_tables():
+    config = parse_pdi_markdown(fixture("tabelas_por_trimestre.md"))
+    activities = by_title(config)
+
+    assert config.colaborador == "Ana Souza"
+    assert config.periodo == "2025"
+    assert [activity.id for activity in config.atividades] == [f"atividade-{n}" for n in range(1, 8)]
+
+    curso = activities["Curso de Liderança Ágil"]
+    assert (curso.trimestre, curso.tipo, curso.plataforma) == (1, TipoAtividade.CURSO, "Coursera")
+    assert curso.link == "https://www.coursera.org/learn/lideranca"
+    assert curso.descricao == "Base de gestão de pessoas"
+
+    mentoria = activities["Mentoria com a gerente de engenharia"]
+    assert (mentoria.trimestre, mentoria.tipo, mentoria.link) == (1, TipoAtividade.MENTORIA, None)
+
+    assert activities["Livro: Radical Candor"].tipo == TipoAtividade.LEITURA
+    assert activities["Projeto de redesenho do pipeline de dados"].trimestre == 2
+
+
+def test_empty_period_cell_repeats_previous_row():
+    activities = by_title(parse_pdi_markdown(fixture("tabelas_por_trimestre.md")))
+
+    assert activities["Workshop de Comunicação"].trimestre == 3
+    assert activities["Palestra sobre OKRs"].trimestre == 3
+    assert activities["Palestra sobre OKRs"].plataforma == "YouTube"
+    assert activities["Certificação PSM I"].trimestre == 4
+
+
+def test_goal_tables_are_ignored():
+    titles = by_title(parse_pdi_markdown(fixture("tabelas_por_trimestre.md")))
+
+    assert "Liderar a squad de dados" not in titles
+
+
+def test_linked_list_items_without_tables():
+    config = parse_pdi_markdown(fixture("lista_com_links.md"))
+    activities = by_title(config)
+
+    assert config.colaborador == "Bruno Lima"
+    assert config.periodo == "2026"
+    assert activities["Curso de Python para Dados"].trimestre == 1
+    assert activities["Artigo"].plataforma == "Harvard Business Review"
+    bootcamp = activities["Bootcamp de Machine Learning"]
+    assert (bootcamp.trimestre, bootcamp.tipo, bootcamp.plataforma) == (3, TipoAtividade.WORKSHOP, "DIO")
+
+
+@pytest.mark.parametrize("name", [
+    "cronograma_sem_atividades.md",  # cronograma por trimestre sem coluna de atividades
+    "atividades_sem_trimestre.md",   # tabela de atividades da qual nada foi lido
+    "sem_atividades.md",
+])
+def test_unreadable_plans_fail(name):
+    with pytest.raises(PDIParseError):
+        parse_pdi_markdown(fixture(name))
+
+
+def test_context_executor_uses_last_output():
+    context = [SimpleNamespace(raw="pesquisa"), SimpleNamespace(raw=fixture("lista_com_links.md"))]
+
+    data = json.loads(pdi_json_from_context(context))
+
+    assert data["colaborador"] == "Bruno Lima"
+    assert len(data["atividades"]) == 3
+
+
+@pytest.mark.parametrize("context", [[], [SimpleNamespace(raw=fixture("sem_atividades.md"))]])
+def test_context_executor_failure_is_a_value_error(context):
+    # ValueError faz o ParallelCrew recorrer ao LLM
+    with pytest.raises(ValueError):
+        pdi_json_from_context(context)
+
+
+def test_local_output_is_restored_from_checkpoint(tmp_path):
+    # Mesmo caminho do ParallelCrew._execute_locally seguido do registro no checkpoint
+    OutputFormat = pytest.importorskip("crewai.tasks.output_format").OutputFormat
+    task = SimpleNamespace(
+        name="gerar_visualizacao_pdi", description="Converter o PDI", expected_output="PDIConfig",
+        output_file=str(tmp_path / "pdi.json"), output_pydantic=PDIConfig,
+        agent=SimpleNamespace(role="pdi_specialist"), _get_output_format=lambda: OutputFormat.PYDANTIC
+    )
+    content = pdi_json_from_context([SimpleNamespace(raw=fixture("tabelas_por_trimestre.md"))])
+    output = rebuild_task_output(task, content)
+    write_output_file(task, content)
+
+    store = CheckpointStore("retomada", tmp_path)
+    store.start("entrevista")
+    store.record(task, output)
+    restored = store.restore([task])
+
+    assert restored["gerar_visualizacao_pdi"].pydantic == output.pydantic
@@ -0,0 +1,100 @@
+"""Modelo de latência e stub do LLM usados no replay de execuções gravadas"""
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+import pytest
+from src.core import fallback_llm
+from src.core.events import Event, TASK_STARTED
+from src.core.replay import (DEFAULT_PROFILE, LatencyProfile, RecordedRun, RecordedTask, StubCompletion, replay,
+                             stubbed_completion)
+from src.core.routing import CONFIG_DIR
+from src.core.utils import DEFAULT_AGENTS_CONFIG, DEFAULT_TASKS_CONFIG, load_config
+from src.core.workspace import Workspace
+
+
+@pytest.fixture
+def recorded():
+    return RecordedRun("gravada", "entrevista", {
+        "pesquisa": RecordedTask("resultado da pesquisa", requests=2, completion_tokens=700),
+        "resumo": RecordedTask("sumário", requests=1, completion_tokens=110),
+    })
+
+
+def started(task):
+    return Event(TASK_STARTED, task, time.time(), {})
+
+
+def test_delay_adds_first_token_per_request_prompt_and_generation():
+    profile = LatencyProfile(first_token=0.5, output_tokens_per_second=100, prompt_tokens_per_second=1000)
+
+    assert profile.delay(2, 1000, 300) == pytest.approx(2 * 0.5 + 1.0 + 3.0)
+
+
+def test_stub_returns_recorded_output_of_the_thread_task(recorded):
+    profiles = {"rapido": LatencyProfile(first_token=0.0, output_tokens_per_second=1e9)}
+    stub = StubCompletion(recorded, profiles)
+    answers = {}
+
+    def run(task):
+        stub.on_event(started(task))
+        response = stub(model="rapido", messages=[{"role": "user", "content": "olá"}])
+        answers[task] = response["choices"][0]["message"]["content"]
+
+    threads = [threading.Thread(target=run, args=(task,)) for task in ("pesquisa", "resumo")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert answers["pesquisa"].endswith("Final Answer: resultado da pesquisa")
+    assert answers["resumo"].endswith("Final Answer: sumário")
+    assert sorted((name, completion) for name, _, _, completion, _ in stub.calls) == [("pesquisa", 700), ("resumo", 110)]
+
+
+def test_stub_sleeps_model_delay_scaled_by_speed(recorded):
+    profiles = {"lento": LatencyProfile(first_token=1.0, output_tokens_per_second=1e9, prompt_tokens_per_second=1e9)}
+    stub = StubCompletion(recorded, profiles, speed=10)
+    stub.on_event(started("pesquisa"))
+
+    begin = time.perf_counter()
+    response = stub(model="lento", messages=[{"role": "user", "content": "olá"}])
+
+    assert 0.2 <= time.perf_counter() - begin < 1.0
+    assert stub.calls[0][4] == pytest.approx(2.0, abs=0.01)
+    assert response.usage.completion_tokens == 700
+
+
+def test_unknown_model_uses_default_profile(recorded):
+    stub = StubCompletion(recorded, {}, speed=1e6)
+    stub.on_event(started("resumo"))
+    stub(model="outro", messages=[{"role": "user", "content": ""}])
+
+    assert stub.calls[0][4] == pytest.approx(DEFAULT_PROFILE.delay(1, 0, 110), abs=0.01)
+
+
+def test_stubbed_completion_restores_litellm(recorded):
+    original = fallback_llm.litellm.completion
+    with stubbed_completion(StubCompletion(recorded)) as stub:
+        assert fallback_llm.litellm.completion is stub
+    assert fallback_llm.litellm.completion is original
+
+
+def test_replay_keeps_recorded_workspaces(monkeypatch):
+    # Workspace gravado antigo, que a política de retenção apagaria
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-replay")
+    source = Workspace(f"gravada-{uuid.uuid4().hex[:8]}").create()
+    os.utime(source.path, (0, 0))
+    _, tasks_config = load_config(DEFAULT_AGENTS_CONFIG, DEFAULT_TASKS_CONFIG)
+    pdi = (Path(__file__).parent / "fixtures" / "pdi" / "tabelas_por_trimestre.md").read_text(encoding="utf-8")
+    outputs = {name: f"saída de {name}" for name in tasks_config}
+    outputs["planejamento_estruturado_de_desenvolvimento_individual"] = pdi
+    recorded = RecordedRun(source.run_id, "entrevista", {name: RecordedTask(text) for name, text in outputs.items()})
+    try:
+        result = replay(recorded, CONFIG_DIR / "models.yaml", speed=1e4)
+
+        assert source.exists()
+        assert result.critical_path
+    finally:
+        source.delete()
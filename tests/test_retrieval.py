@@ -0,0 +1,95 @@
+"""Trechos, atualização incremental e fusão de rankings do índice de documentos do workspace"""
+import numpy as np
+import pytest
+
+pytest.importorskip("pandas")
+from src.assistants import retrieval  # noqa: E402
+from src.assistants.retrieval import DocumentIndex, chunk_document, get_document_index  # noqa: E402
+
+
+class MarkerEmbedder:
+    """Vetor fixo para cada texto, escolhido pela palavra-marcador que ele contém"""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.embedded = []
+
+    def embed(self, texts):
+        self.embedded.extend(texts)
+        return [np.array(next((vector for marker, vector in self.vectors.items() if marker in text), [0.0, 0.0, 0.0]))
+                for text in texts]
+
+
+def test_chunks_follow_sections_and_token_limit():
+    markdown = ("# Objetivos\n\n" + "\n\n".join(["liderança de equipes " * 10] * 3)
+                + "\n\n# Prazos\n\nPrimeiro trimestre.")
+
+    chunks = chunk_document("pdi.md", markdown, max_tokens=40)
+
+    assert [chunk.section for chunk in chunks] == ["Objetivos", "Objetivos", "Objetivos", "Prazos"]
+    assert chunks[-1].text == "Primeiro trimestre."
+    assert str(chunks[0]).startswith("[pdi.md › Objetivos]\n")
+
+
+def test_refresh_reads_only_new_or_changed_files(tmp_path):
+    (tmp_path / "a.md").write_text("# A\n\nplano de carreira", encoding="utf-8")
+    (tmp_path / "b.md").write_text("# B\n\ncursos de dados", encoding="utf-8")
+    index = DocumentIndex(tmp_path)
+
+    assert index.refresh() == 2
+    assert index.refresh() == 0
+
+    (tmp_path / "b.md").write_text("# B\n\ncursos de estatística avançada", encoding="utf-8")
+    (tmp_path / "c.md").write_text("# C\n\nmentoria semanal", encoding="utf-8")
+    assert index.refresh() == 2
+    assert {chunk.text for chunk in index.chunks} == {"plano de carreira", "cursos de estatística avançada",
+                                                      "mentoria semanal"}
+
+    (tmp_path / "a.md").unlink()
+    assert index.refresh() == 0
+    assert [chunk.text for chunk in index.search("plano de carreira")] != ["plano de carreira"]
+    assert all(chunk.source != "a.md" for chunk in index.chunks)
+
+
+def test_embeddings_of_removed_chunks_are_dropped(tmp_path):
+    (tmp_path / "a.md").write_text("# A\n\nversão um", encoding="utf-8")
+    embedder = MarkerEmbedder({})
+    index = DocumentIndex(tmp_path, embedder)
+    index.refresh()
+
+    (tmp_path / "a.md").write_text("# A\n\nversão dois, mais longa", encoding="utf-8")
+    index.refresh()
+
+    assert set(index._vectors) == {chunk.digest for chunk in index.chunks}
+    assert len(embedder.embedded) == 2
+
+
+def test_rankings_are_fused_by_position(tmp_path):
+    # BM25 ordena a, b, c; os embeddings ordenam b, c, a
+    (tmp_path / "a.md").write_text("# A\n\nmentoria mentoria mentoria alfa", encoding="utf-8")
+    (tmp_path / "b.md").write_text("# B\n\nmentoria mentoria beta", encoding="utf-8")
+    (tmp_path / "c.md").write_text("# C\n\nmentoria gama outros assuntos", encoding="utf-8")
+    embedder = MarkerEmbedder({"alfa": [0.0, 0.0, 1.0], "beta": [1.0, 0.0, 0.0], "gama": [0.8, 0.6, 0.0],
+                               "mentoria?": [1.0, 0.0, 0.0]})
+    index = DocumentIndex(tmp_path, embedder)
+
+    # b: 1/62 + 1/61 > a: 1/61 + 1/63 > c: 1/63 + 1/62
+    assert [chunk.source for chunk in index.search("mentoria?", top_k=3)] == ["b.md", "a.md", "c.md"]
+
+
+def test_shared_indexes_are_bounded_and_dropped_with_their_workspace(tmp_path, monkeypatch):
+    monkeypatch.setattr(retrieval, "_indexes", type(retrieval._indexes)())
+    monkeypatch.setattr(retrieval, "MAX_INDEXES", 2)
+    directories = [tmp_path / name for name in ("um", "dois", "tres")]
+    for directory in directories:
+        directory.mkdir()
+
+    first = get_document_index(directories[0])
+    get_document_index(directories[1])
+    assert get_document_index(directories[0]) is first
+    get_document_index(directories[2])
+    assert list(retrieval._indexes) == [directories[0].resolve(), directories[2].resolve()]
+
+    directories[0].rmdir()
+    get_document_index(directories[2])
+    assert list(retrieval._indexes) == [directories[2].resolve()]
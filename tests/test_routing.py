@@ -0,0 +1,170 @@
+"""Rotas de modelos e uso de tokens por chamada do FallbackLLM (litellm substituído por um falso)"""
+import threading
+from types import SimpleNamespace
+import litellm
+import pytest
+from crewai import LLM
+from src.core import fallback_llm
+from src.core.fallback_llm import FallbackLLM, LLMUsage, thread_usage
+from src.core.routing import ModelRouter
+
+
+class FakeResponse(dict):
+    def __init__(self, content, prompt_tokens, completion_tokens):
+        super().__init__(choices=[{"message": {"content": content}}])
+        self.usage = SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    """litellm.completion falso: tokens por modelo e modelos configurados para falhar"""
+    calls = []
+    failing = {}
+    tokens = {"gpt-4o": (100, 10), "gpt-4o-mini": (7, 3)}
+
+    def completion(**params):
+        calls.append(params)
+        if params["model"] in failing:
+            raise failing[params["model"]]
+        prompt, completion_tokens = tokens[params["model"]]
+        return FakeResponse(f"resposta de {params['model']}", prompt, completion_tokens)
+
+    monkeypatch.setattr(fallback_llm.litellm, "completion", completion)
+    return SimpleNamespace(calls=calls, failing=failing)
+
+
+def run_in_thread(target):
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(value=target()))
+    thread.start()
+    thread.join()
+    return result["value"]
+
+
+def test_call_records_usage_from_the_response(completions):
+    def call():
+        llm = FallbackLLM("gpt-4o", temperature=0)
+        before = thread_usage()
+        assert llm.call([{"role": "user", "content": "oi"}]) == "resposta de gpt-4o"
+        return thread_usage() - before
+
+    assert run_in_thread(call) == LLMUsage(100, 10, 1)
+    assert completions.calls[0]["temperature"] == 0
+
+
+def test_parallel_calls_are_attributed_to_their_own_thread(completions):
+    barrier = threading.Barrier(2)
+    usages = {}
+
+    def task(model, calls):
+        llm = FallbackLLM(model)
+        before = thread_usage()
+        for _ in range(calls):
+            barrier.wait()
+            llm.call([{"role": "user", "content": model}])
+        usages[model] = thread_usage() - before
+
+    threads = [threading.Thread(target=task, args=(model, 3)) for model in ("gpt-4o", "gpt-4o-mini")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert usages["gpt-4o"] == LLMUsage(300, 30, 3)
+    assert usages["gpt-4o-mini"] == LLMUsage(21, 9, 3)
+
+
+def test_shared_llm_reports_the_model_of_each_thread(monkeypatch):
+    # As cópias do agent em tasks paralelas compartilham o mesmo FallbackLLM
+    def completion(**params):
+        if params["model"] == "gpt-4o" and params["messages"][0]["content"] == "falha":
+            raise RuntimeError("timeout")
+        return FakeResponse("ok", 1, 1)
+
+    monkeypatch.setattr(fallback_llm.litellm, "completion", completion)
+    llm = FallbackLLM("gpt-4o", ["gpt-4o-mini"])
+    calls_done = threading.Barrier(2)
+    models = {}
+
+    def task(content):
+        before = thread_usage()
+        llm.call([{"role": "user", "content": content}])
+        # O modelo só é lido depois que as duas tasks chamaram o LLM
+        calls_done.wait()
+        models[content] = (thread_usage() - before).model
+
+    thread = threading.Thread(target=task, args=("falha",))
+    thread.start()
+    task("ok")
+    thread.join()
+
+    assert models == {"ok": "gpt-4o", "falha": "gpt-4o-mini"}
+
+
+def test_usage_without_calls_has_no_model(completions):
+    def call():
+        FallbackLLM("gpt-4o-mini").call([{"role": "user", "content": "oi"}])
+        before = thread_usage()
+        return thread_usage() - before
+
+    assert run_in_thread(call).model is None
+
+
+def test_fallback_model_answers_when_primary_fails(completions):
+    completions.failing["gpt-4o"] = RuntimeError("timeout")
+
+    def call():
+        llm = FallbackLLM("gpt-4o", ["gpt-4o-mini"])
+        before = thread_usage()
+        response = llm.call([{"role": "user", "content": "oi"}])
+        return response, thread_usage() - before
+
+    response, usage = run_in_thread(call)
+    assert response == "resposta de gpt-4o-mini"
+    assert usage == LLMUsage(7, 3, 1)
+    assert usage.model == "gpt-4o-mini"
+
+
+def test_context_length_errors_are_not_retried_on_fallbacks(completions):
+    completions.failing["gpt-4o"] = litellm.ContextWindowExceededError(
+        "This model's maximum context length is 128000 tokens", model="gpt-4o", llm_provider="openai"
+    )
+    llm = FallbackLLM("gpt-4o", ["gpt-4o-mini"])
+    with pytest.raises(litellm.ContextWindowExceededError, match="context length"):
+        llm.call([{"role": "user", "content": "oi"}])
+    assert [call["model"] for call in completions.calls] == ["gpt-4o"]
+
+
+def test_completion_matches_crewai_llm_call(completions):
+    # Falha se uma nova versão do crewAI mudar os parâmetros enviados ao litellm
+    params = dict(temperature=0.2, max_tokens=300, timeout=30, top_p=0.9, seed=7, stop=["Observation:"])
+    messages = [{"role": "user", "content": "oi"}]
+
+    LLM(model="gpt-4o", **params).call(messages)
+    FallbackLLM("gpt-4o", **params).call(messages)
+
+    assert completions.calls[0] == completions.calls[1]
+
+
+def test_last_error_is_raised_when_every_model_fails(completions):
+    completions.failing["gpt-4o"] = RuntimeError("primário")
+    completions.failing["gpt-4o-mini"] = RuntimeError("fallback")
+    with pytest.raises(RuntimeError, match="fallback"):
+        FallbackLLM("gpt-4o", ["gpt-4o-mini"]).call([{"role": "user", "content": "oi"}])
+
+
+def test_routes_merge_defaults_agents_and_tasks():
+    router = ModelRouter({
+        'defaults': {'model': 'gpt-4o', 'fallbacks': ['gpt-4o-mini']},
+        'agents': {'leitor': {'model': 'gpt-4o-mini', 'temperature': 0}},
+        'tasks': {'ler': {'max_tokens': 512}},
+        'assistants': {'Resumo': {'model': 'gpt-4o-mini'}},
+    })
+    agent = router.agent_route('leitor')
+    assert (agent.model, agent.temperature, agent.fallbacks) == ('gpt-4o-mini', 0, ['gpt-4o-mini'])
+    assert agent.llm().fallbacks == []
+    assert router.agent_route('outro').model == 'gpt-4o'
+    assert router.task_route('ler').max_tokens == 512
+    assert router.task_route('outra') is None
+    assert router.assistant_model('Resumo') == 'gpt-4o-mini'
+    assert router.assistant_model('Outro') == 'gpt-4o'
@@ -0,0 +1,186 @@
+"""Polling com backoff e prazo de src/assistants/run_engine.py contra um cliente falso da Assistants API"""
+import asyncio
+import itertools
+import time
+from types import SimpleNamespace
+import pytest
+from src.assistants import run_engine
+from src.assistants.run_engine import (RunError, RunTimeoutError, backoff_delays, wait_for_run,
+                                       wait_for_run_sync)
+
+
+def make_run(status, run_id="run_1"):
+    return SimpleNamespace(id=run_id, thread_id="thread_1", status=status, last_error=None)
+
+
+class FakeRuns:
+    """runs.retrieve devolve os status em sequência; o último se repete"""
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.retrieved = 0
+        self.cancelled = []
+
+    def _next(self):
+        status = self.statuses[min(self.retrieved, len(self.statuses) - 1)]
+        self.retrieved += 1
+        return make_run(status)
+
+    def _cancel(self, run_id):
+        self.cancelled.append(run_id)
+
+
+class AsyncRuns(FakeRuns):
+    async def retrieve(self, thread_id, run_id):
+        return self._next()
+
+    async def cancel(self, thread_id, run_id):
+        self._cancel(run_id)
+
+
+class SyncRuns(FakeRuns):
+    def retrieve(self, thread_id, run_id):
+        return self._next()
+
+    def cancel(self, thread_id, run_id):
+        self._cancel(run_id)
+
+
+def fake_client(runs):
+    return SimpleNamespace(beta=SimpleNamespace(threads=SimpleNamespace(runs=runs)))
+
+
+@pytest.fixture
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(run_engine, "backoff_delays", lambda: itertools.repeat(0.001))
+
+
+def test_backoff_delays_grow_with_jitter_up_to_the_cap():
+    delays = list(itertools.islice(backoff_delays(initial=0.25, maximum=4.0), 8))
+    bounds = [0.25, 0.5, 1.0, 2.0, 4.0, 4.0, 4.0, 4.0]
+    for delay, bound in zip(delays, bounds):
+        assert bound / 2 <= delay <= bound
+
+
+def test_wait_for_run_polls_until_completed(fast_backoff):
+    runs = AsyncRuns(["queued", "in_progress", "completed"])
+    run = asyncio.run(wait_for_run(fake_client(runs), make_run("queued")))
+    assert run.status == "completed"
+    assert runs.retrieved == 3
+    assert runs.cancelled == []
+
+
+def test_wait_for_run_returns_finished_run_without_polling():
+    runs = AsyncRuns(["completed"])
+    run = asyncio.run(wait_for_run(fake_client(runs), make_run("incomplete")))
+    assert run.status == "incomplete"
+    assert runs.retrieved == 0
+
+
+def test_wait_for_run_raises_on_failed_run(fast_backoff):
+    runs = AsyncRuns(["in_progress", "failed"])
+    with pytest.raises(RunError) as error:
+        asyncio.run(wait_for_run(fake_client(runs), make_run("queued")))
+    assert error.value.status == "failed"
+    assert runs.cancelled == []
+
+
+def test_wait_for_run_cancels_run_that_requires_action(fast_backoff):
+    runs = AsyncRuns(["requires_action"])
+    with pytest.raises(RunError):
+        asyncio.run(wait_for_run(fake_client(runs), make_run("queued")))
+    assert runs.cancelled == ["run_1"]
+
+
+def test_wait_for_run_times_out_and_cancels(fast_backoff):
+    runs = AsyncRuns(["in_progress"])
+    with pytest.raises(RunTimeoutError):
+        asyncio.run(wait_for_run(fake_client(runs), make_run("queued"), timeout=0.05))
+    assert runs.cancelled == ["run_1"]
+    assert runs.retrieved > 1
+
+
+class TimedRuns(AsyncRuns):
+    """O run termina `duration` segundos depois de criado, como no servidor"""
+
+    def __init__(self, duration):
+        super().__init__([])
+        self.finishes_at = time.monotonic() + duration
+
+    def _next(self):
+        self.retrieved += 1
+        return make_run("completed" if time.monotonic() >= self.finishes_at else "in_progress")
+
+
+def test_turn_polls_few_times_and_spends_little_cpu():
+    # Um run de 1,5s com o backoff real: 0,25 + 0,5 + 1 ... em vez de um laço sem pausa
+    runs = TimedRuns(1.5)
+    cpu = time.process_time()
+    run = asyncio.run(wait_for_run(fake_client(runs), make_run("queued")))
+    cpu = time.process_time() - cpu
+
+    assert run.status == "completed"
+    assert runs.retrieved <= 7
+    assert cpu < 0.2
+
+
+def test_wait_for_run_sync_polls_until_completed(fast_backoff):
+    runs = SyncRuns(["in_progress", "completed"])
+    run = wait_for_run_sync(fake_client(runs), make_run("queued"))
+    assert run.status == "completed"
+    assert runs.retrieved == 2
+
+
+def test_wait_for_run_sync_times_out_and_cancels(fast_backoff):
+    runs = SyncRuns(["queued"])
+    with pytest.raises(RunTimeoutError):
+        wait_for_run_sync(fake_client(runs), make_run("queued"), timeout=0.05)
+    assert runs.cancelled == ["run_1"]
+
+
+class FakeAsyncOpenAI:
+    def __init__(self, api_key):
+        self.api_key = api_key
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+def test_async_clients_are_bounded_and_evicted_ones_closed(monkeypatch):
+    monkeypatch.setattr(run_engine, "AsyncOpenAI", FakeAsyncOpenAI)
+    monkeypatch.setattr(run_engine, "MAX_ASYNC_CLIENTS", 2)
+
+    async def scenario():
+        first = run_engine.get_async_client("sk-1")
+        second = run_engine.get_async_client("sk-2")
+        assert run_engine.get_async_client("sk-1") is first  # sk-1 passa a ser o mais recente
+        third = run_engine.get_async_client("sk-3")
+        await asyncio.gather(*run_engine._closing_clients)
+        clients = run_engine._async_clients[asyncio.get_running_loop()]
+        return first, second, third, list(clients)
+
+    first, second, third, keys = asyncio.run(scenario())
+
+    assert keys == ["sk-1", "sk-3"]
+    assert second.closed
+    assert not first.closed and not third.closed
+
+
+def test_evicted_client_in_use_is_closed_when_released(monkeypatch):
+    monkeypatch.setattr(run_engine, "AsyncOpenAI", FakeAsyncOpenAI)
+    monkeypatch.setattr(run_engine, "MAX_ASYNC_CLIENTS", 1)
+
+    async def scenario():
+        async with run_engine.hold_client(run_engine.get_async_client("sk-1")) as first:
+            async with run_engine.hold_client(first):
+                run_engine.get_async_client("sk-2")  # sk-1 sai do LRU com um stream em andamento
+                await asyncio.sleep(0)
+            closed_while_held = first.closed
+        return first, closed_while_held
+
+    first, closed_while_held = asyncio.run(scenario())
+
+    assert not closed_while_held
+    assert first.closed
+    assert run_engine._held_clients == {} and run_engine._evicted_clients == set()
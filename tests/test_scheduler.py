@@ -0,0 +1,124 @@
+"""Ordem, limite de concorrência e falhas do DAGScheduler com agents falsos"""
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from src.core.scheduler import DAGScheduler, build_dependencies
+
+
+def make_task(name, *context):
+    return SimpleNamespace(name=name, description=name, context=list(context))
+
+
+class FakeAgents:
+    """execute(task, context) que registra início, fim e concorrência de cada task"""
+
+    def __init__(self, delay=0.02, failing=()):
+        self.delay = delay
+        self.failing = set(failing)
+        self.started = []
+        self.finished = []
+        self.contexts = {}
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, task, context):
+        with self._lock:
+            self.started.append(task.name)
+            self.contexts[task.name] = list(context)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            if task.name in self.failing:
+                raise RuntimeError(f"{task.name} falhou")
+            return f"saida de {task.name}"
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.finished.append(task.name)
+
+
+def diamond():
+    a = make_task("a")
+    b = make_task("b", a)
+    c = make_task("c", a)
+    d = make_task("d", b, c)
+    return [a, b, c, d]
+
+
+def test_build_dependencies_uses_task_positions():
+    tasks = diamond()
+    assert build_dependencies(tasks) == {0: [], 1: [0], 2: [0], 3: [1, 2]}
+
+
+def test_tasks_start_after_their_context_and_outputs_keep_task_order():
+    tasks = diamond()
+    agents = FakeAgents()
+    outputs = DAGScheduler(tasks, max_concurrency=4).run(agents)
+
+    assert outputs == ["saida de a", "saida de b", "saida de c", "saida de d"]
+    assert agents.started[0] == "a"
+    assert agents.started[-1] == "d"
+    assert agents.finished.index("b") < agents.started.index("d")
+    assert agents.finished.index("c") < agents.started.index("d")
+    assert agents.contexts["d"] == ["saida de b", "saida de c"]
+
+
+def test_independent_tasks_run_in_parallel_up_to_the_cap():
+    tasks = [make_task(f"t{i}") for i in range(6)]
+    agents = FakeAgents(delay=0.05)
+    DAGScheduler(tasks, max_concurrency=2).run(agents)
+    assert agents.peak == 2
+    assert sorted(agents.finished) == sorted(task.name for task in tasks)
+
+
+def test_completed_tasks_are_not_executed_again():
+    tasks = diamond()
+    agents = FakeAgents()
+    outputs = DAGScheduler(tasks).run(agents, completed={0: "restaurada", 1: "restaurada b"})
+    assert sorted(agents.started) == ["c", "d"]
+    assert agents.contexts["c"] == ["restaurada"]
+    assert outputs[:2] == ["restaurada", "restaurada b"]
+
+
+def test_failure_propagates_and_dependents_do_not_run():
+    tasks = diamond()
+    agents = FakeAgents(failing={"b"})
+    with pytest.raises(RuntimeError, match="b falhou"):
+        DAGScheduler(tasks, max_concurrency=4).run(agents)
+    assert "d" not in agents.started
+
+
+def test_failure_cancels_tasks_queued_beyond_the_cap():
+    tasks = [make_task(f"t{i}") for i in range(4)]
+    agents = FakeAgents(failing={"t0"})
+    with pytest.raises(RuntimeError):
+        DAGScheduler(tasks, max_concurrency=1).run(agents)
+    assert agents.started == ["t0"]
+
+
+def test_cyclic_dependencies_raise_value_error():
+    a = make_task("a")
+    b = make_task("b", a)
+    a.context.append(b)
+    with pytest.raises(ValueError):
+        DAGScheduler([a, b]).run(FakeAgents())
+
+
+def test_critical_path_follows_the_slowest_branch():
+    a = make_task("a")
+    slow = make_task("slow", a)
+    fast = make_task("fast", a)
+    end = make_task("end", slow, fast)
+
+    def execute(task, context):
+        time.sleep(0.08 if task.name == "slow" else 0.01)
+        return task.name
+
+    scheduler = DAGScheduler([a, slow, fast, end], max_concurrency=4)
+    scheduler.run(execute)
+    duration, path = scheduler.critical_path()
+    assert path == ["a", "slow", "end"]
+    assert duration >= 0.08
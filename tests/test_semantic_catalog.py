@@ -0,0 +1,85 @@
+"""Busca semântica do catálogo: índice persistido e latência em escala"""
+import random
+import time
+import numpy as np
+import pytest
+from src.tools.catalog_index import CONTENT_FILE, get_catalog
+from src.tools.semantic_catalog import HashingEmbedder, SemanticCatalogIndex, VectorSearch
+
+WORDS = (
+    "python sql liderança equipes comunicação apresentação negociação análise dados machine learning "
+    "cloud gestão projetos ágil scrum kanban finanças orçamento marketing digital vendas design produto "
+    "estratégia inovação feedback mentoria coaching excel estatística visualização segurança redes devops "
+    "docker kubernetes java javascript react api testes qualidade"
+).split()
+
+
+class CountingEmbedder(HashingEmbedder):
+    def __init__(self):
+        super().__init__()
+        self.embedded = 0
+
+    def embed(self, texts):
+        self.embedded += len(texts)
+        return super().embed(texts)
+
+
+def test_search_finds_catalog_rows_by_meaning(tmp_path):
+    catalog = get_catalog(CONTENT_FILE)
+    index = SemanticCatalogIndex(catalog, HashingEmbedder(), index_dir=tmp_path)
+    results = index.search("liderança de equipes ágeis", top_k=3)
+    assert len(results) == 3
+    assert "Lideran" in catalog.row(results[0][0])['nome_do_conteudo']
+    assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+
+
+def test_stored_vectors_are_reused(tmp_path):
+    catalog = get_catalog(CONTENT_FILE)
+    first = CountingEmbedder()
+    SemanticCatalogIndex(catalog, first, index_dir=tmp_path)
+    second = CountingEmbedder()
+    index = SemanticCatalogIndex(catalog, second, index_dir=tmp_path)
+    assert first.embedded == catalog.size
+    assert second.embedded == 0
+    assert index.vectors.shape == (catalog.size, second.dim)
+
+
+def test_small_matrices_use_exact_search():
+    vectors = HashingEmbedder().embed(["sql", "liderança", "python"])
+    searcher = VectorSearch(vectors)
+    assert searcher.coarse is None
+    assert searcher.search(vectors[1], top_k=1)[0][0] == 1
+
+
+@pytest.fixture(scope="module")
+def large_catalog():
+    """100 mil vetores de textos sintéticos (misturas de 2 mil textos vetorizados)"""
+    rnd = random.Random(1)
+    embedder = HashingEmbedder()
+    base = embedder.embed([" ".join(rnd.choices(WORDS, k=22)) for _ in range(2000)])
+    rng = np.random.default_rng(0)
+    pairs = rng.integers(0, len(base), (100_000, 2))
+    weights = rng.random((100_000, 1)).astype(np.float32)
+    vectors = base[pairs[:, 0]] * weights + base[pairs[:, 1]] * (1 - weights)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    queries = [" ".join(rnd.sample(WORDS, 3)) for _ in range(50)]
+    return embedder, vectors.astype(np.float32), queries
+
+
+def test_large_catalog_search_is_fast_and_matches_exact_search(large_catalog):
+    embedder, vectors, queries = large_catalog
+    searcher = VectorSearch(vectors)
+    assert searcher.coarse is not None
+
+    latencies, recall = [], []
+    for query_text in queries:
+        # Mede a consulta completa: vetorização do texto e busca
+        started = time.perf_counter()
+        query = embedder.embed([query_text])[0]
+        results = searcher.search(query, top_k=10)
+        latencies.append(time.perf_counter() - started)
+        exact = set(np.argpartition(-(vectors @ query), 9)[:10].tolist())
+        recall.append(len(exact & {row_id for row_id, _ in results}) / 10)
+
+    assert np.median(latencies) < 0.010
+    assert np.mean(recall) >= 0.95
@@ -0,0 +1,139 @@
+"""search_many/asearch_many da SerperSearchTool contra um servidor Serper local"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from src.tools import http_pool, search_cache
+from src.tools.search_cache import SearchCache
+from src.tools.serper_search_tool import SerperSearchTool
+
+LATENCY = 0.2
+
+
+class FakeSerper(BaseHTTPRequestHandler):
+    """Responde cada consulta com atraso; a primeira chamada de consultas 'instável' recebe 429"""
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        query = payload['q']
+        with self.server.lock:
+            self.server.requests.append(query)
+            attempts = self.server.requests.count(query)
+        if query.startswith("instável") and attempts == 1:
+            self._send(429, {"message": "rate limited"}, {"Retry-After": "0"})
+            return
+        with self.server.lock:
+            self.server.active += 1
+            self.server.peak = max(self.server.peak, self.server.active)
+        time.sleep(LATENCY)
+        with self.server.lock:
+            self.server.active -= 1
+        self._send(200, {"organic": [{"title": f"Resultado para {query}", "link": "https://example.com",
+                                      "snippet": "..."}]})
+
+    def _send(self, status, body, headers=None):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def serper(monkeypatch, tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeSerper)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.active = server.peak = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("SERPER_API_KEY", "test-key")
+    monkeypatch.setenv("SERPER_URL", f"http://127.0.0.1:{server.server_port}/search")
+    monkeypatch.setattr(search_cache, "_cache", SearchCache(tmp_path / "search.sqlite"))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_search_many_runs_queries_concurrently_in_order(serper):
+    queries = ["liderança remota", "python para dados", "negociação"]
+    started = time.perf_counter()
+    results = SerperSearchTool().search_many(queries, num_results=3)
+    elapsed = time.perf_counter() - started
+
+    assert [f"Resultado para {query}" in result for query, result in zip(queries, results)] == [True] * 3
+    assert elapsed < LATENCY * len(queries)
+
+
+def test_search_many_threads_are_bounded_by_the_connection_pool(serper):
+    queries = [f"consulta {index}" for index in range(2 * http_pool.POOL_SIZE + 5)]
+    results = SerperSearchTool().search_many(queries, num_results=1)
+
+    assert [f"Resultado para {query}" in result for query, result in zip(queries, results)] == [True] * len(queries)
+    assert serper.peak <= http_pool.POOL_SIZE
+
+
+def test_asearch_many_runs_queries_concurrently_in_order(serper):
+    queries = ["liderança remota", "python para dados", "negociação"]
+    started = time.perf_counter()
+    results = asyncio.run(SerperSearchTool().asearch_many(queries, num_results=3))
+    elapsed = time.perf_counter() - started
+
+    assert [f"Resultado para {query}" in result for query, result in zip(queries, results)] == [True] * 3
+    assert elapsed < LATENCY * len(queries)
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_rate_limited_query_is_retried(serper, mode):
+    tool = SerperSearchTool()
+    if mode == "sync":
+        result = tool.search_many(["instável sync"])[0]
+    else:
+        result = asyncio.run(tool.asearch_many(["instável async"]))[0]
+    assert "Resultado para instável" in result
+    assert len(serper.requests) == 2
+
+
+def test_repeated_and_duplicate_queries_reach_the_api_once(serper):
+    tool = SerperSearchTool()
+    tool.search_many(["gestão de projetos", "gestão de projetos", "projetos de gestão"])
+    tool.search_many(["gestão de projetos"])
+    assert serper.requests.count("gestão de projetos") + serper.requests.count("projetos de gestão") == 1
+
+
+def test_async_cache_lookup_does_not_block_the_event_loop(tmp_path):
+    class SlowCache(SearchCache):
+        def get(self, key):
+            time.sleep(0.3)  # banco ocupado por outra conexão
+            return super().get(key)
+
+    cache = SlowCache(tmp_path / "slow.sqlite")
+    ticks = []
+
+    async def compute():
+        return "resultado"
+
+    async def ticker():
+        for _ in range(20):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.02)
+
+    async def scenario():
+        ticking = asyncio.create_task(ticker())
+        await asyncio.sleep(0.05)
+        result = await cache.aget_or_compute("chave", compute)
+        await ticking
+        return result
+
+    assert asyncio.run(scenario()) == "resultado"
+    # O loop continua atendendo outras corrotinas enquanto o SQLite espera
+    assert max(later - earlier for earlier, later in zip(ticks, ticks[1:])) < 0.15
+    assert cache.get("chave") == "resultado"
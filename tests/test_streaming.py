@@ -0,0 +1,111 @@
+"""Tratamento dos eventos de streaming em stream_run_text com um stream falso da Assistants API"""
+import asyncio
+from types import SimpleNamespace
+import pytest
+from src.assistants.run_engine import RunError, stream_run_text
+
+
+def delta(*texts):
+    blocks = [SimpleNamespace(type='text', text=SimpleNamespace(value=text)) for text in texts]
+    return SimpleNamespace(event='thread.message.delta', data=SimpleNamespace(delta=SimpleNamespace(content=blocks)))
+
+
+def run_event(name, status=None):
+    run = SimpleNamespace(id="run_1", thread_id="thread_1", status=status, last_error=None,
+                          usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5))
+    return SimpleNamespace(event=name, data=run)
+
+
+class FakeStream:
+    def __init__(self, events):
+        self.events = events
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.closed = True
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for event in self.events:
+            yield event
+
+
+class FakeRuns:
+    def __init__(self, events):
+        self.stream = FakeStream(events)
+        self.created = None
+        self.cancelled = []
+
+    async def create(self, **params):
+        self.created = params
+        return self.stream
+
+    async def cancel(self, thread_id, run_id):
+        self.cancelled.append(run_id)
+
+
+def collect(runs, **kwargs):
+    client = SimpleNamespace(beta=SimpleNamespace(threads=SimpleNamespace(runs=runs)))
+
+    async def consume():
+        return [text async for text in stream_run_text(client, "thread_1", "asst_1", **kwargs)]
+    return asyncio.run(consume())
+
+
+def test_yields_text_deltas_in_order_and_reports_completion():
+    completed = []
+    messages = []
+    message = SimpleNamespace(id="msg_1")
+    runs = FakeRuns([
+        run_event('thread.run.created', 'queued'),
+        delta("Olá"),
+        delta(", ", "mundo"),
+        SimpleNamespace(event='thread.message.completed', data=message),
+        run_event('thread.run.completed', 'completed'),
+    ])
+    texts = collect(runs, on_complete=completed.append, on_message=messages.append,
+                    additional_instructions="extra")
+    assert texts == ["Olá", ", ", "mundo"]
+    assert [run.status for run in completed] == ["completed"]
+    assert messages == [message]
+    assert runs.created['stream'] is True
+    assert runs.created['additional_instructions'] == "extra"
+    assert runs.stream.closed
+
+
+def test_skips_empty_and_non_text_blocks():
+    image = SimpleNamespace(type='image_file', text=None)
+    empty = SimpleNamespace(event='thread.message.delta', data=SimpleNamespace(delta=SimpleNamespace(content=None)))
+    runs = FakeRuns([
+        SimpleNamespace(event='thread.message.delta', data=SimpleNamespace(delta=SimpleNamespace(content=[image]))),
+        empty,
+        delta(""),
+        delta("texto"),
+    ])
+    assert collect(runs) == ["texto"]
+
+
+@pytest.mark.parametrize("event", ['thread.run.failed', 'thread.run.expired', 'thread.run.cancelled'])
+def test_failed_run_events_raise_run_error(event):
+    runs = FakeRuns([delta("parcial"), run_event(event, event.rsplit('.', 1)[-1])])
+    with pytest.raises(RunError):
+        collect(runs)
+    assert runs.stream.closed
+
+
+def test_requires_action_cancels_the_run():
+    runs = FakeRuns([run_event('thread.run.requires_action', 'requires_action')])
+    with pytest.raises(RunError):
+        collect(runs)
+    assert runs.cancelled == ["run_1"]
+
+
+def test_stream_error_event_raises_run_error():
+    runs = FakeRuns([SimpleNamespace(event='error', data=SimpleNamespace(message="servidor indisponível"))])
+    with pytest.raises(RunError, match="servidor indisponível"):
+        collect(runs)
@@ -0,0 +1,95 @@
+"""Leitura incremental das mensagens de um run em src/assistants/transcript.py"""
+import asyncio
+from types import SimpleNamespace
+from src.assistants.transcript import MAX_MESSAGES, Transcript
+
+
+def make_message(message_id, role="assistant", text="", run_id=None):
+    content = [SimpleNamespace(type="text", text=SimpleNamespace(value=text))] if text else []
+    return SimpleNamespace(id=message_id, role=role, content=content, run_id=run_id)
+
+
+class FakeMessages:
+    """messages.list com filtro por run, ordem crescente, cursor `after` e paginação"""
+
+    def __init__(self, page_size=2):
+        self.thread = []
+        self.page_size = page_size
+        self.calls = []
+
+    def _list(self, thread_id, run_id, order, limit, after=None):
+        self.calls.append({"run_id": run_id, "after": after})
+        ids = [message.id for message in self.thread]
+        start = ids.index(after) + 1 if after else 0
+        matching = [message for message in self.thread[start:] if message.run_id == run_id]
+        page = matching[:self.page_size]
+        return SimpleNamespace(data=page, has_more=len(matching) > len(page))
+
+    def list(self, **params):
+        return self._list(**params)
+
+
+class AsyncMessages(FakeMessages):
+    async def list(self, **params):
+        return self._list(**params)
+
+
+def fake_client(messages):
+    return SimpleNamespace(beta=SimpleNamespace(threads=SimpleNamespace(messages=messages)))
+
+
+def test_fetch_run_follows_pages_from_the_last_seen_message():
+    messages = FakeMessages()
+    transcript = Transcript("thread_1")
+    question = make_message("msg_1", role="user", text="pergunta")
+    messages.thread = [question] + [make_message(f"msg_{n}", text=f"parte {n}", run_id="run_1") for n in range(2, 5)]
+    transcript.record(question)
+
+    response = transcript.fetch_run_sync(fake_client(messages), "run_1")
+
+    assert response == "parte 2\n\nparte 3\n\nparte 4"
+    assert [call["after"] for call in messages.calls] == ["msg_1", "msg_3"]
+    assert transcript.last_message_id == "msg_4"
+
+
+def test_async_fetch_run_returns_none_without_text():
+    messages = AsyncMessages()
+    messages.thread = [make_message("msg_1", run_id="run_1")]
+    transcript = Transcript("thread_1")
+
+    assert asyncio.run(transcript.fetch_run(fake_client(messages), "run_1")) is None
+
+
+def test_response_only_includes_the_current_run():
+    transcript = Transcript("thread_1")
+    transcript.record(make_message("msg_1", text="antiga", run_id="run_1"))
+    transcript.record(make_message("msg_2", role="user", text="nova pergunta"))
+    transcript.record(make_message("msg_3", text="nova resposta", run_id="run_2"))
+    # Mensagem já recebida pelo streaming não é duplicada
+    transcript.record(make_message("msg_3", text="nova resposta", run_id="run_2"))
+
+    assert transcript._run_response("run_2") == "nova resposta"
+    assert transcript._run_response("run_1") is None
+
+
+def test_transcript_is_bounded():
+    transcript = Transcript("thread_1")
+    for n in range(10 * MAX_MESSAGES):
+        transcript.record(make_message(f"msg_{2 * n}", role="user", text=f"pergunta {n}"))
+        transcript.record(make_message(f"msg_{2 * n + 1}", text=f"resposta {n}", run_id=f"run_{n}"))
+
+    assert len(transcript.messages) == MAX_MESSAGES
+    assert transcript.last_message_id == f"msg_{20 * MAX_MESSAGES - 1}"
+    assert transcript._run_response(f"run_{10 * MAX_MESSAGES - 1}") == f"resposta {10 * MAX_MESSAGES - 1}"
+
+
+def test_discard_moves_the_cursor_back():
+    transcript = Transcript("thread_1")
+    transcript.record(make_message("msg_1", text="resposta", run_id="run_1"))
+    transcript.record(make_message("msg_2", role="user", text="pergunta"))
+    transcript.record(make_message("msg_3", text="parcial", run_id="run_2"))
+
+    transcript.discard(["msg_2", "msg_3"])
+
+    assert transcript.last_message_id == "msg_1"
+    assert transcript._run_response("run_2") is None